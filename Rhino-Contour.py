@@ -1,12 +1,18 @@
 # Assuming you have not changed the general structure of the template no modification is needed in this file.
+import time
+_import_started = time.perf_counter()
 from . import commands
 from .lib import fusionAddInUtils as futil
+_import_seconds = time.perf_counter() - _import_started
 
 
 def run(context):
     try:
         # This will run the start function in each of your commands as defined in commands/__init__.py
+        started = time.perf_counter()
         commands.start()
+        futil.log(f'Add-in started in {(_import_seconds + time.perf_counter() - started) * 1000:.0f} ms '
+                  f'(imports {_import_seconds * 1000:.0f} ms)')
 
     except:
         futil.handle_error('run')
@@ -0,0 +1,81 @@
+# Fusion script: compares curves-per-second of writing contour slices into a
+# sketch one curve at a time (immediate solve) against the batched,
+# compute-deferred SketchWriter used by the Contour command.
+#
+# Run it from Scripts and Add-ins with a design open. Sketches it creates are
+# deleted again; results are shown in a message box and the Text Command window.
+
+import importlib
+import math
+import os
+import sys
+import time
+import traceback
+import adsk.core
+import adsk.fusion
+
+ADDIN_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if os.path.dirname(ADDIN_DIR) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ADDIN_DIR))
+ADDIN_PACKAGE = os.path.basename(ADDIN_DIR)
+
+# Slices written per run and polygon segments per slice
+SLICE_COUNTS = (25, 100, 400)
+SEGMENTS_PER_SLICE = 32
+
+
+def make_slice_wires(count: int) -> list:
+    """Create one closed polygonal wire body per slice, stacked along Z."""
+    tempBRep = adsk.fusion.TemporaryBRepManager.get()
+    wires = []
+    for i in range(count):
+        z = i * 0.1
+        points = [adsk.core.Point3D.create(5 * math.cos(2 * math.pi * k / SEGMENTS_PER_SLICE),
+                                           5 * math.sin(2 * math.pi * k / SEGMENTS_PER_SLICE), z)
+                  for k in range(SEGMENTS_PER_SLICE)]
+        lines = [adsk.core.Line3D.create(points[k], points[(k + 1) % SEGMENTS_PER_SLICE])
+                 for k in range(SEGMENTS_PER_SLICE)]
+        wire, _ = tempBRep.createWireFromCurves(lines)
+        wires.append(wire)
+    return wires
+
+
+def run(context):
+    app = adsk.core.Application.get()
+    ui = app.userInterface
+    try:
+        slicing = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.slicing')
+        sketch_writer = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.sketch_writer')
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        rootComp = design.rootComponent
+        lines = ['Slices | Curves | Immediate (curves/s) | Batched (curves/s) | Speedup']
+
+        for count in SLICE_COUNTS:
+            curves = count * SEGMENTS_PER_SLICE
+
+            # Before: every curve is solved as soon as it is added
+            sketch = rootComp.sketches.add(rootComp.xYConstructionPlane)
+            started = time.perf_counter()
+            for wire in make_slice_wires(count):
+                slicing.add_wire_body_to_sketch(wire, sketch)
+            immediate = time.perf_counter() - started
+            sketch.deleteMe()
+
+            # After: compute deferred, buffered and flushed in bulk
+            sketch = rootComp.sketches.add(rootComp.xYConstructionPlane)
+            started = time.perf_counter()
+            writer = sketch_writer.SketchWriter()
+            writer.open(sketch)
+            writer.add(sketch, make_slice_wires(count))
+            writer.close()
+            batched = time.perf_counter() - started
+            sketch.deleteMe()
+
+            lines.append(f'{count} | {curves} | {curves / immediate:.0f} | {curves / batched:.0f} | {immediate / batched:.1f}x')
+
+        report = '\n'.join(lines)
+        app.log(report)
+        ui.messageBox(report, 'Sketch Write Benchmark')
+    except:
+        ui.messageBox(f'Failed:\n{traceback.format_exc()}')
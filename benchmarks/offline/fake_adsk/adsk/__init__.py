@@ -0,0 +1,3 @@
+# Headless stand-in for the parts of the Fusion 360 API used by the Contour
+# add-in. Bodies are axis-aligned boxes; every API call is counted and charged
+# a configurable simulated latency (see _simulator). Only for benchmarks.
@@ -0,0 +1,67 @@
+"""Call counting and simulated latency shared by the fake adsk modules."""
+
+import collections
+
+# Simulated seconds charged per call. Entries ending in '_per_face' are added
+# once per face of the body involved; 'sketch_solve_per_curve' is charged for
+# every curve already in a sketch each time a curve is added while compute is
+# not deferred (which makes immediate sketch writes quadratic).
+DEFAULT_LATENCY = {
+    'constructionPlanes.add': 0.004,
+    'constructionPlane.deleteMe': 0.002,
+    'sketches.add': 0.006,
+    'sketch.deleteMe': 0.003,
+    'sketch.projectCutEdges': 0.003,
+    'sketch.projectCutEdges_per_face': 0.00002,
+    'sketch.isComputeDeferred': 0.0005,
+    'sketchCurves.add': 0.0002,
+    'sketch_solve_per_curve': 0.00002,
+    'temporaryBRep.planeIntersection': 0.0005,
+    'temporaryBRep.planeIntersection_per_face': 0.000005,
+    'temporaryBRep.copy': 0.0001,
+    'temporaryBRep.transform': 0.0001,
+    'temporaryBRep.createWireFromCurves': 0.0002,
+    'temporaryBRep.createFaceFromPlanarWires': 0.0003,
+    'temporaryBRep.booleanOperation': 0.0005,
+    'baseFeatures.add': 0.005,
+    'bRepBodies.add': 0.002,
+    'splitBodyFeatures.add': 0.01,
+    'splitBodyFeatures.add_per_face': 0.00002,
+    'body.deleteMe': 0.003,
+    'removeFeatures.add': 0.003,
+    'meshBody.displayMesh': 0.001,
+    'meshBody.displayMesh_per_face': 0.0000001,
+    'timeline_feature': 0.001,
+    'timelineGroups.add': 0.005,
+}
+
+latency = dict(DEFAULT_LATENCY)
+calls = collections.Counter()
+simulated_seconds = 0.0
+
+
+def charge(name: str, faces: int = 0, units: float = 1.0):
+    """Counts a call and adds its simulated latency."""
+    global simulated_seconds
+    calls[name] += 1
+    cost = latency.get(name, 0.0) * units
+    if faces:
+        cost += latency.get(f'{name}_per_face', 0.0) * faces
+    simulated_seconds += cost
+
+
+def charge_time(name: str, seconds: float):
+    """Adds simulated time that is not a separate API call (e.g. sketch solves)."""
+    global simulated_seconds
+    simulated_seconds += seconds
+
+
+def reset(overrides: dict = None):
+    """Clears counters and applies latency overrides for the next measurement."""
+    global simulated_seconds
+    calls.clear()
+    simulated_seconds = 0.0
+    latency.clear()
+    latency.update(DEFAULT_LATENCY)
+    if overrides:
+        latency.update(overrides)
@@ -0,0 +1,313 @@
+"""Fake adsk.core: math types, curves and a minimal Application."""
+
+import math
+from . import _simulator
+
+
+class _Placeholder:
+    """Stands in for API types that are only used in annotations."""
+
+    @classmethod
+    def cast(cls, obj):
+        return obj
+
+
+def __getattr__(name):
+    # Event args, command inputs, ... are only referenced in type hints
+    placeholder = type(name, (_Placeholder,), {})
+    globals()[name] = placeholder
+    return placeholder
+
+
+class LogLevels:
+    InfoLogLevel = 0
+    WarningLogLevel = 1
+    ErrorLogLevel = 2
+
+
+class LogTypes:
+    ConsoleLogType = 0
+    FileLogType = 1
+
+
+class DropDownStyles:
+    TextListDropDownStyle = 0
+
+
+class Point3D:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    def asArray(self):
+        return [self.x, self.y, self.z]
+
+    def copy(self):
+        return Point3D(self.x, self.y, self.z)
+
+    def vectorTo(self, other):
+        return Vector3D(other.x - self.x, other.y - self.y, other.z - self.z)
+
+    def distanceTo(self, other):
+        return self.vectorTo(other).length
+
+    def translateBy(self, vector):
+        self.x += vector.x
+        self.y += vector.y
+        self.z += vector.z
+        return True
+
+    def transformBy(self, matrix):
+        self.x, self.y, self.z = matrix.apply(self.x, self.y, self.z)
+        return True
+
+
+class Vector3D:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def asArray(self):
+        return [self.x, self.y, self.z]
+
+    def copy(self):
+        return Vector3D(self.x, self.y, self.z)
+
+    def normalize(self):
+        length = self.length
+        if length == 0:
+            return False
+        self.x, self.y, self.z = self.x / length, self.y / length, self.z / length
+        return True
+
+    def scaleBy(self, scale):
+        self.x, self.y, self.z = self.x * scale, self.y * scale, self.z * scale
+        return True
+
+    def dotProduct(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def crossProduct(self, other):
+        return Vector3D(self.y * other.z - self.z * other.y,
+                        self.z * other.x - self.x * other.z,
+                        self.x * other.y - self.y * other.x)
+
+    def transformBy(self, matrix):
+        self.x, self.y, self.z = matrix.apply_vector(self.x, self.y, self.z)
+        return True
+
+
+class Matrix3D:
+    """Row-major 4x4 affine matrix."""
+
+    def __init__(self, cells=None):
+        self.cells = list(cells) if cells else [1.0 if row == col else 0.0 for row in range(4) for col in range(4)]
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    def copy(self):
+        return Matrix3D(self.cells)
+
+    def asArray(self):
+        return list(self.cells)
+
+    def setWithArray(self, cells):
+        self.cells = list(cells)
+        return True
+
+    def setWithCoordinateSystem(self, origin, xAxis, yAxis, zAxis):
+        self.cells = [xAxis.x, yAxis.x, zAxis.x, origin.x,
+                      xAxis.y, yAxis.y, zAxis.y, origin.y,
+                      xAxis.z, yAxis.z, zAxis.z, origin.z,
+                      0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def getAsCoordinateSystem(self):
+        c = self.cells
+        return (Point3D(c[3], c[7], c[11]), Vector3D(c[0], c[4], c[8]),
+                Vector3D(c[1], c[5], c[9]), Vector3D(c[2], c[6], c[10]))
+
+    def invert(self):
+        # Affine inverse assuming an orthonormal rotation part
+        c = self.cells
+        r = [[c[0], c[1], c[2]], [c[4], c[5], c[6]], [c[8], c[9], c[10]]]
+        t = [c[3], c[7], c[11]]
+        rt = [[r[col][row] for col in range(3)] for row in range(3)]
+        ti = [-sum(rt[row][k] * t[k] for k in range(3)) for row in range(3)]
+        self.cells = [rt[0][0], rt[0][1], rt[0][2], ti[0],
+                      rt[1][0], rt[1][1], rt[1][2], ti[1],
+                      rt[2][0], rt[2][1], rt[2][2], ti[2],
+                      0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def transformBy(self, matrix):
+        a = matrix.cells
+        b = self.cells
+        self.cells = [sum(a[row * 4 + k] * b[k * 4 + col] for k in range(4)) for row in range(4) for col in range(4)]
+        return True
+
+    def apply(self, x, y, z):
+        c = self.cells
+        return (c[0] * x + c[1] * y + c[2] * z + c[3],
+                c[4] * x + c[5] * y + c[6] * z + c[7],
+                c[8] * x + c[9] * y + c[10] * z + c[11])
+
+    def apply_vector(self, x, y, z):
+        c = self.cells
+        return (c[0] * x + c[1] * y + c[2] * z,
+                c[4] * x + c[5] * y + c[6] * z,
+                c[8] * x + c[9] * y + c[10] * z)
+
+
+class Plane:
+    def __init__(self, origin, normal):
+        self.origin = origin
+        self.normal = normal
+
+    @staticmethod
+    def create(origin, normal):
+        return Plane(origin.copy(), normal.copy())
+
+
+class ValueInput:
+    def __init__(self, value):
+        self.realValue = value
+
+    @staticmethod
+    def createByReal(value):
+        return ValueInput(value)
+
+
+class CurveEvaluator3D:
+    def __init__(self, curve):
+        self.curve = curve
+
+    def getParameterExtents(self):
+        return True, 0.0, 1.0
+
+    def getPointAtParameter(self, parameter):
+        return True, self.curve._point_at(parameter)
+
+    def getPointsAtParameters(self, parameters):
+        return True, [self.curve._point_at(parameter) for parameter in parameters]
+
+    def getStrokes(self, fromParameter, toParameter, tolerance):
+        return True, [self.curve._point_at(fromParameter), self.curve._point_at(toParameter)]
+
+    def getLengthAtParameter(self, fromParameter, toParameter):
+        return True, self.curve._length() * abs(toParameter - fromParameter)
+
+
+class Curve3D:
+    @property
+    def evaluator(self):
+        return CurveEvaluator3D(self)
+
+
+class Line3D(Curve3D):
+    def __init__(self, startPoint, endPoint):
+        self.startPoint = startPoint
+        self.endPoint = endPoint
+
+    @staticmethod
+    def create(startPoint, endPoint):
+        return Line3D(startPoint.copy(), endPoint.copy())
+
+    def copy(self):
+        return Line3D(self.startPoint.copy(), self.endPoint.copy())
+
+    def transformBy(self, matrix):
+        self.startPoint.transformBy(matrix)
+        self.endPoint.transformBy(matrix)
+        return True
+
+    def _point_at(self, t):
+        s, e = self.startPoint, self.endPoint
+        return Point3D(s.x + (e.x - s.x) * t, s.y + (e.y - s.y) * t, s.z + (e.z - s.z) * t)
+
+    def _length(self):
+        return self.startPoint.distanceTo(self.endPoint)
+
+
+class Arc3D(Curve3D):
+    pass
+
+
+class Circle3D(Curve3D):
+    pass
+
+
+class Ellipse3D(Curve3D):
+    pass
+
+
+class NurbsCurve3D(Curve3D):
+    pass
+
+
+class ObjectCollection:
+    def __init__(self):
+        self.items = []
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    def add(self, item):
+        self.items.append(item)
+        return True
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    def item(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class Color:
+    @staticmethod
+    def create(red, green, blue, opacity):
+        return (red, green, blue, opacity)
+
+
+class _UserInterface:
+    def messageBox(self, text, title=None, *args):
+        return 0
+
+
+class Application:
+    _instance = None
+
+    def __init__(self):
+        from . import fusion
+        self.userInterface = _UserInterface()
+        self.activeProduct = fusion.Design()
+        self.version = 'offline-benchmark'
+
+    @staticmethod
+    def get():
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    def log(self, message, level=None, logType=None):
+        pass
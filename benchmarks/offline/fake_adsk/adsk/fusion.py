@@ -0,0 +1,689 @@
+"""Fake adsk.fusion: a design of axis-aligned box bodies with planes, sketches and splits."""
+
+import itertools
+import math
+from . import _simulator
+from . import core
+
+_tokens = itertools.count(1)
+
+# Collinear pieces every section edge is split into, like heavily split STEP bodies
+EDGE_FRAGMENTS = 1
+
+
+def __getattr__(name):
+    return core.__getattr__(name)
+
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class BooleanTypes:
+    DifferenceBooleanType = 0
+    IntersectionBooleanType = 1
+    UnionBooleanType = 2
+
+
+def _plane_box_polygon(origin, normal, low, high):
+    """Intersect a plane with an axis-aligned box. Returns the section polygon (convex, ordered)."""
+    corners = [(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+    n = (normal.x, normal.y, normal.z)
+    o = (origin.x, origin.y, origin.z)
+    distances = [sum(n[k] * (corner[k] - o[k]) for k in range(3)) for corner in corners]
+    points = []
+    for a, b in itertools.combinations(range(8), 2):
+        # Box edges join corners that differ in exactly one coordinate
+        if sum(corners[a][k] != corners[b][k] for k in range(3)) != 1:
+            continue
+        da, db = distances[a], distances[b]
+        if (da < 0 < db) or (db < 0 < da):
+            t = da / (da - db)
+            points.append(tuple(corners[a][k] + (corners[b][k] - corners[a][k]) * t for k in range(3)))
+        else:
+            # Corners lying on the plane
+            points.extend(corners[index] for index, d in ((a, da), (b, db)) if d == 0)
+    unique = []
+    for point in points:
+        if all(sum((point[k] - other[k]) ** 2 for k in range(3)) > 1e-18 for other in unique):
+            unique.append(point)
+    if len(unique) < 3:
+        return []
+
+    # Order around the centroid in the plane
+    center = [sum(point[k] for point in unique) / len(unique) for k in range(3)]
+    ref = core.Vector3D(*[unique[0][k] - center[k] for k in range(3)])
+    ref.normalize()
+    other = core.Vector3D(*n).crossProduct(ref)
+
+    def angle(point):
+        v = [point[k] - center[k] for k in range(3)]
+        return math.atan2(sum(v[k] * other.asArray()[k] for k in range(3)), sum(v[k] * ref.asArray()[k] for k in range(3)))
+
+    unique.sort(key=angle)
+    return [core.Point3D(*point) for point in unique]
+
+
+class BoundingBox3D:
+    def __init__(self, low, high):
+        self.minPoint = core.Point3D(*low)
+        self.maxPoint = core.Point3D(*high)
+
+
+class BRepEdge:
+    def __init__(self, geometry):
+        self.geometry = geometry
+
+    @property
+    def evaluator(self):
+        return self.geometry.evaluator
+
+    @property
+    def length(self):
+        return self.geometry._length()
+
+
+class BRepCoEdge:
+    def __init__(self, edge):
+        self.edge = edge
+        self.isOpposedToEdge = False
+
+
+class BRepWire:
+    """One closed loop; section polygons are already ordered, so coedges follow the edges."""
+
+    def __init__(self, edges):
+        self.coEdges = [BRepCoEdge(edge) for edge in edges]
+
+
+class _Collection:
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class BRepBody:
+    """A solid box, a wire body (edges) or a sheet body (planar sheets)."""
+
+    def __init__(self, low=None, high=None, faces=6, edges=None, sheets=None, component=None, name='Body'):
+        self.low = list(low) if low else [0.0, 0.0, 0.0]
+        self.high = list(high) if high else [0.0, 0.0, 0.0]
+        self.face_count = faces
+        self.edge_list = list(edges or [])
+        self.sheets = list(sheets or [])
+        self.parentComponent = component
+        self.name = name
+        self.entityToken = f'body-{next(_tokens)}'
+        self.assemblyContext = None
+        self.nativeObject = None
+        self.isLightBulbOn = True
+        self.isSolid = not edges and not sheets
+
+    @property
+    def boundingBox(self):
+        if self.edge_list:
+            points = [point for edge in self.edge_list for point in (edge.geometry.startPoint, edge.geometry.endPoint)]
+            return BoundingBox3D([min(p.x for p in points), min(p.y for p in points), min(p.z for p in points)],
+                                 [max(p.x for p in points), max(p.y for p in points), max(p.z for p in points)])
+        return BoundingBox3D(self.low, self.high)
+
+    @property
+    def volume(self):
+        return (self.high[0] - self.low[0]) * (self.high[1] - self.low[1]) * (self.high[2] - self.low[2])
+
+    @property
+    def faces(self):
+        return _Collection([None] * self.face_count)
+
+    @property
+    def wires(self):
+        return _Collection([BRepWire(self.edge_list)] if self.edge_list else [])
+
+    @property
+    def edges(self):
+        if self.edge_list:
+            return _Collection(self.edge_list)
+        return _Collection([None] * (self.face_count * 2))
+
+    def createForAssemblyContext(self, occurrence):
+        return self
+
+    def deleteMe(self):
+        _simulator.charge('body.deleteMe', self.face_count)
+        if self.parentComponent and self in self.parentComponent.bRepBodies._items:
+            self.parentComponent.bRepBodies._items.remove(self)
+            _design().timeline.feature_added()
+        return True
+
+
+class TriangleMesh:
+    def __init__(self, coordinates, indices):
+        self.nodeCoordinatesAsDouble = coordinates
+        self.nodeIndices = indices
+        self.nodeCount = len(coordinates) // 3
+        self.triangleCount = len(indices) // 3
+
+
+class MeshBody:
+    """A closed triangle mesh: an ellipsoid filling the box from low to high."""
+
+    def __init__(self, low, high, triangles, component=None, name='Mesh'):
+        self.low = list(low)
+        self.high = list(high)
+        self.parentComponent = component
+        self.name = name
+        self.entityToken = f'mesh-{next(_tokens)}'
+        self.isLightBulbOn = True
+
+        # UV sphere with about the requested number of triangles, scaled to the box
+        bands = max(2, int(math.sqrt(triangles / 2)))
+        center = [(low[k] + high[k]) / 2 for k in range(3)]
+        radius = [(high[k] - low[k]) / 2 for k in range(3)]
+        coordinates = []
+        for ring in range(bands + 1):
+            polar = math.pi * ring / bands
+            for step in range(2 * bands):
+                azimuth = math.pi * step / bands
+                unit = (math.sin(polar) * math.cos(azimuth), math.sin(polar) * math.sin(azimuth), math.cos(polar))
+                coordinates.extend(center[k] + radius[k] * unit[k] for k in range(3))
+        indices = []
+        for ring in range(bands):
+            for step in range(2 * bands):
+                a = ring * 2 * bands + step
+                b = ring * 2 * bands + (step + 1) % (2 * bands)
+                indices.extend((a, a + 2 * bands, b + 2 * bands, a, b + 2 * bands, b))
+        self._mesh = TriangleMesh(coordinates, indices)
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self.low, self.high)
+
+    @property
+    def displayMesh(self):
+        _simulator.charge('meshBody.displayMesh', self._mesh.triangleCount)
+        return self._mesh
+
+    def deleteMe(self):
+        _simulator.charge('body.deleteMe')
+        return True
+
+
+class BRepBodies(_Collection):
+    def __init__(self, component):
+        super().__init__()
+        self.component = component
+
+    def add(self, body, baseFeature=None):
+        _simulator.charge('bRepBodies.add')
+        added = BRepBody(body.low, body.high, body.face_count, body.edge_list, body.sheets, self.component)
+        self._items.append(added)
+        return added
+
+
+class ConstructionPlane:
+    def __init__(self, origin, normal, component, name='Plane'):
+        self.origin = origin
+        self.normal = normal
+        self.parentComponent = component
+        self.name = name
+        self.geometry = core.Plane(origin, normal)
+
+    def deleteMe(self):
+        _simulator.charge('constructionPlane.deleteMe')
+        _design().timeline.removed()
+        return True
+
+
+class ConstructionPlaneInput:
+    def __init__(self):
+        self.basePlane = None
+        self.offset = 0.0
+
+    def setByOffset(self, planarEntity, offset):
+        self.basePlane = planarEntity
+        self.offset = offset.realValue
+        return True
+
+    def setByPlane(self, plane):
+        self.basePlane = ConstructionPlane(plane.origin, plane.normal, None)
+        self.offset = 0.0
+        return True
+
+
+class ConstructionPlanes:
+    def __init__(self, component):
+        self.component = component
+
+    def createInput(self, occurrenceForCreation=None):
+        return ConstructionPlaneInput()
+
+    def add(self, input):
+        _simulator.charge('constructionPlanes.add')
+        _design().timeline.feature_added()
+        base = input.basePlane
+        normal = base.normal.copy()
+        origin = base.origin.copy()
+        shift = normal.copy()
+        shift.scaleBy(input.offset)
+        origin.translateBy(shift)
+        return ConstructionPlane(origin, normal, self.component)
+
+
+class _SketchPoint:
+    def __init__(self, geometry):
+        self.geometry = geometry
+
+
+class _SketchCurve:
+    def __init__(self, start, end):
+        # Sketch points are shared when passed in, created otherwise
+        self.startSketchPoint = start if isinstance(start, _SketchPoint) else _SketchPoint(start or core.Point3D())
+        self.endSketchPoint = end if isinstance(end, _SketchPoint) else _SketchPoint(end or core.Point3D())
+
+
+class _SketchCurveList:
+    def __init__(self, sketch):
+        self.sketch = sketch
+
+    def _add(self, start=None, end=None):
+        self.sketch._curve_added()
+        return _SketchCurve(start, end)
+
+    def addByTwoPoints(self, startPoint, endPoint):
+        return self._add(startPoint, endPoint)
+
+    def addByThreePoints(self, startPoint, point, endPoint):
+        return self._add(startPoint, endPoint)
+
+    def addByCenterRadius(self, centerPoint, radius):
+        return self._add()
+
+    def addByNurbsCurve(self, nurbsCurve):
+        return self._add()
+
+    def add(self, *args):
+        return self._add()
+
+
+class SketchCurves:
+    def __init__(self, sketch):
+        self.sketchLines = _SketchCurveList(sketch)
+        self.sketchArcs = _SketchCurveList(sketch)
+        self.sketchCircles = _SketchCurveList(sketch)
+        self.sketchEllipses = _SketchCurveList(sketch)
+        self.sketchFittedSplines = _SketchCurveList(sketch)
+        self.sketchFixedSplines = _SketchCurveList(sketch)
+
+
+class Sketch:
+    def __init__(self, plane, component):
+        self.referencePlane = plane
+        self.parentComponent = component
+        self.name = 'Sketch'
+        self.curve_count = 0
+        self._deferred = False
+        self.sketchCurves = SketchCurves(self)
+
+        # Sketch space: origin on the plane, z along its normal
+        normal = plane.normal.copy()
+        normal.normalize()
+        helper = core.Vector3D(1, 0, 0) if abs(normal.x) < 0.9 else core.Vector3D(0, 1, 0)
+        xAxis = helper.crossProduct(normal)
+        xAxis.normalize()
+        yAxis = normal.crossProduct(xAxis)
+        self.transform = core.Matrix3D()
+        self.transform.setWithCoordinateSystem(plane.origin, xAxis, yAxis, normal)
+
+    @property
+    def isComputeDeferred(self):
+        return self._deferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value):
+        _simulator.charge('sketch.isComputeDeferred')
+        if self._deferred and not value:
+            # One solve of everything that was added while deferred
+            _simulator.charge_time('sketch solve', _simulator.latency['sketch_solve_per_curve'] * self.curve_count)
+        self._deferred = value
+
+    def _curve_added(self):
+        _simulator.charge('sketchCurves.add')
+        self.curve_count += 1
+        if not self._deferred:
+            _simulator.charge_time('sketch solve', _simulator.latency['sketch_solve_per_curve'] * self.curve_count)
+
+    def modelToSketchSpace(self, point):
+        result = point.copy()
+        inverse = self.transform.copy()
+        inverse.invert()
+        result.transformBy(inverse)
+        return result
+
+    def sketchToModelSpace(self, point):
+        result = point.copy()
+        result.transformBy(self.transform)
+        return result
+
+    def projectCutEdges(self, body):
+        _simulator.charge('sketch.projectCutEdges', body.face_count)
+        polygon = _plane_box_polygon(self.referencePlane.origin, self.referencePlane.normal, body.low, body.high)
+        result = core.ObjectCollection()
+        for _ in polygon:
+            self._curve_added()
+            result.add(object())
+        return result
+
+    def deleteMe(self):
+        _simulator.charge('sketch.deleteMe')
+        _design().timeline.removed()
+        return True
+
+
+class Sketches:
+    def __init__(self, component):
+        self.component = component
+
+    def add(self, planarEntity, occurrenceForCreation=None):
+        _simulator.charge('sketches.add')
+        _design().timeline.feature_added()
+        return Sketch(planarEntity, self.component)
+
+
+class SplitBodyFeature:
+    def __init__(self, bodies):
+        self.bodies = _Collection(bodies)
+
+
+class SplitBodyFeatureInput:
+    def __init__(self, body, tool, extend):
+        self.body = body
+        self.tool = tool
+        self.isSplittingToolExtended = extend
+
+
+class SplitBodyFeatures:
+    def __init__(self, component):
+        self.component = component
+
+    def createInput(self, splitBodies, splittingTool, isSplittingToolExtended):
+        return SplitBodyFeatureInput(splitBodies, splittingTool, isSplittingToolExtended)
+
+    def add(self, input):
+        body = input.body
+        _simulator.charge('splitBodyFeatures.add', body.face_count)
+        tool = input.tool
+        planes = tool.sheets if isinstance(tool, BRepBody) else [(tool.origin, tool.normal)]
+
+        # Boxes stay boxes: only axis-aligned cuts strictly inside the body count
+        cuts = {0: [], 1: [], 2: []}
+        for origin, normal in planes:
+            axis = max(range(3), key=lambda k: abs(normal.asArray()[k]))
+            position = origin.asArray()[axis]
+            if body.low[axis] < position < body.high[axis]:
+                cuts[axis].append(position)
+        if not any(cuts.values()):
+            raise RuntimeError('Split tool does not intersect the body')
+
+        pieces = [(body.low, body.high)]
+        for axis, positions in cuts.items():
+            if not positions:
+                continue
+            next_pieces = []
+            for low, high in pieces:
+                bounds = [low[axis]] + sorted(positions) + [high[axis]]
+                for lower, upper in zip(bounds, bounds[1:]):
+                    piece_low, piece_high = list(low), list(high)
+                    piece_low[axis], piece_high[axis] = lower, upper
+                    next_pieces.append((piece_low, piece_high))
+            pieces = next_pieces
+
+        bodies = self.component.bRepBodies
+        if body in bodies._items:
+            bodies._items.remove(body)
+        result = []
+        for low, high in pieces:
+            piece = BRepBody(low, high, body.face_count, component=self.component, name=body.name)
+            bodies._items.append(piece)
+            result.append(piece)
+        _design().timeline.feature_added()
+        return SplitBodyFeature(result)
+
+
+class BaseFeature:
+    def __init__(self):
+        self.name = 'Base Feature'
+
+    def startEdit(self):
+        return True
+
+    def finishEdit(self):
+        return True
+
+
+class BaseFeatures:
+    def add(self):
+        _simulator.charge('baseFeatures.add')
+        _design().timeline.feature_added()
+        return BaseFeature()
+
+
+class RemoveFeatures:
+    def add(self, itemToRemove):
+        _simulator.charge('removeFeatures.add')
+        component = itemToRemove.parentComponent
+        if component and itemToRemove in component.bRepBodies._items:
+            component.bRepBodies._items.remove(itemToRemove)
+        _design().timeline.feature_added()
+        return object()
+
+
+class Features:
+    def __init__(self, component):
+        self.splitBodyFeatures = SplitBodyFeatures(component)
+        self.baseFeatures = BaseFeatures()
+        self.removeFeatures = RemoveFeatures()
+
+
+class CustomGraphicsGroups:
+    def add(self):
+        return _CustomGraphicsGroup()
+
+
+class _CustomGraphicsGroup:
+    def addLines(self, coordinates, indexList, isLineStrip, lineStripLengths=None):
+        return _CustomGraphicsLines()
+
+    def deleteMe(self):
+        return True
+
+
+class _CustomGraphicsLines:
+    weight = 1
+    color = None
+
+
+class CustomGraphicsCoordinates:
+    @staticmethod
+    def create(coordinates):
+        return list(coordinates)
+
+
+class CustomGraphicsSolidColorEffect:
+    @staticmethod
+    def create(color):
+        return color
+
+
+class Component:
+    def __init__(self, name='Root'):
+        self.name = name
+        self.id = f'component-{next(_tokens)}'
+        self.bRepBodies = BRepBodies(self)
+        self.constructionPlanes = ConstructionPlanes(self)
+        self.sketches = Sketches(self)
+        self.features = Features(self)
+        self.customGraphicsGroups = CustomGraphicsGroups()
+        origin = core.Point3D(0, 0, 0)
+        self.xYConstructionPlane = ConstructionPlane(origin, core.Vector3D(0, 0, 1), self, 'XY')
+        self.xZConstructionPlane = ConstructionPlane(origin, core.Vector3D(0, 1, 0), self, 'XZ')
+        self.yZConstructionPlane = ConstructionPlane(origin, core.Vector3D(1, 0, 0), self, 'YZ')
+
+    def add_box(self, low, high, faces=6, name='Body'):
+        """Benchmark helper: add a box body to the component."""
+        body = BRepBody(low, high, faces, component=self, name=name)
+        self.bRepBodies._items.append(body)
+        return body
+
+    def add_occurrence(self, body, offset, name='Body'):
+        """Benchmark helper: place a body of another component as an occurrence translated by offset.
+
+        Returns the proxy body, whose native object is the body itself.
+        """
+        low = [body.low[k] + offset[k] for k in range(3)]
+        high = [body.high[k] + offset[k] for k in range(3)]
+        proxy = BRepBody(low, high, body.face_count, component=self, name=name)
+        proxy.nativeObject = body
+        proxy.assemblyContext = Occurrence(body.parentComponent, offset)
+        return proxy
+
+    def add_mesh(self, low, high, triangles, name='Mesh'):
+        """Benchmark helper: add a mesh body (an ellipsoid inside the box) to the component."""
+        return MeshBody(low, high, triangles, component=self, name=name)
+
+
+class Occurrence:
+    def __init__(self, component, offset):
+        self.component = component
+        self.fullPathName = f'{component.name}:{next(_tokens)}'
+        self.transform2 = core.Matrix3D()
+        self.transform2.setWithCoordinateSystem(core.Point3D(*offset), core.Vector3D(1, 0, 0),
+                                                core.Vector3D(0, 1, 0), core.Vector3D(0, 0, 1))
+
+
+class TimelineGroup:
+    def __init__(self):
+        self.name = 'Group'
+        self.isCollapsed = False
+
+
+class TimelineGroups:
+    def __init__(self, timeline):
+        self.timeline = timeline
+
+    def add(self, startIndex, endIndex):
+        _simulator.charge('timelineGroups.add')
+        # The benchmark counts top-level entries, so the grouped range becomes one
+        self.timeline.count -= endIndex - startIndex
+        return TimelineGroup()
+
+
+class Timeline:
+    def __init__(self):
+        self.count = 0
+        self._marker = None
+        self.timelineGroups = TimelineGroups(self)
+
+    @property
+    def markerPosition(self):
+        return self.count if self._marker is None else self._marker
+
+    @markerPosition.setter
+    def markerPosition(self, position):
+        self._marker = position
+
+    def deleteAllAfterMarker(self):
+        _simulator.charge('timeline.deleteAllAfterMarker')
+        self.count = self.markerPosition
+        self._marker = None
+        return True
+
+    def feature_added(self):
+        # New features are inserted at the marker, which moves past them
+        self.count += 1
+        if self._marker is not None:
+            self._marker += 1
+        _simulator.charge('timeline_feature')
+
+    def removed(self):
+        self.count -= 1
+
+
+class Design:
+    def __init__(self):
+        self.designType = DesignTypes.ParametricDesignType
+        self.rootComponent = Component()
+        self.activeComponent = self.rootComponent
+        self.timeline = Timeline()
+
+    @staticmethod
+    def cast(obj):
+        return obj if isinstance(obj, Design) else None
+
+
+def _design() -> Design:
+    return core.Application.get().activeProduct
+
+
+class TemporaryBRepManager:
+    _instance = None
+
+    @staticmethod
+    def get():
+        if TemporaryBRepManager._instance is None:
+            TemporaryBRepManager._instance = TemporaryBRepManager()
+        return TemporaryBRepManager._instance
+
+    def planeIntersection(self, body, plane):
+        _simulator.charge('temporaryBRep.planeIntersection', body.face_count)
+        polygon = _plane_box_polygon(plane.origin, plane.normal, body.low, body.high)
+        if not polygon:
+            return None
+        edges = []
+        for k in range(len(polygon)):
+            start, end = polygon[k], polygon[(k + 1) % len(polygon)]
+            line = core.Line3D(start, end)
+            for piece in range(EDGE_FRAGMENTS):
+                edges.append(BRepEdge(core.Line3D(line._point_at(piece / EDGE_FRAGMENTS),
+                                                  line._point_at((piece + 1) / EDGE_FRAGMENTS))))
+        return BRepBody(edges=edges)
+
+    def copy(self, body):
+        _simulator.charge('temporaryBRep.copy')
+        return BRepBody(body.low, body.high, body.face_count, [BRepEdge(edge.geometry.copy()) for edge in body.edge_list],
+                        body.sheets)
+
+    def transform(self, body, transform):
+        _simulator.charge('temporaryBRep.transform')
+        for edge in body.edge_list:
+            edge.geometry.transformBy(transform)
+        return True
+
+    def createWireFromCurves(self, curves, allowSelfIntersections=False):
+        _simulator.charge('temporaryBRep.createWireFromCurves')
+        return BRepBody(edges=[BRepEdge(curve.copy()) for curve in curves]), None
+
+    def createFaceFromPlanarWires(self, wireBodies):
+        _simulator.charge('temporaryBRep.createFaceFromPlanarWires')
+        lines = [edge.geometry for edge in wireBodies[0].edge_list]
+        a, b, c = lines[0].startPoint, lines[1].startPoint, lines[2].startPoint
+        normal = a.vectorTo(b).crossProduct(a.vectorTo(c))
+        normal.normalize()
+        return BRepBody(sheets=[(a.copy(), normal)])
+
+    def booleanOperation(self, targetBody, toolBody, booleanType):
+        _simulator.charge('temporaryBRep.booleanOperation')
+        targetBody.sheets.extend(toolBody.sheets)
+        return True
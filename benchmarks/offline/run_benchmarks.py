@@ -0,0 +1,233 @@
+"""Headless benchmark of the Contour add-in against a simulated adsk package.
+
+Runs create_contour_curves, split_bodies_with_planes, the file export and the section analysis on Linux (or anywhere
+without Fusion) across division counts, body counts and strategies. Every API
+call is counted and charged a configurable simulated latency, so the report
+shows which strategy makes fewer or cheaper calls, independent of machine speed.
+
+Examples:
+    python benchmarks/offline/run_benchmarks.py
+    python benchmarks/offline/run_benchmarks.py --divisions 10 1000 10000 --bodies 1 50 --faces 200000
+    python benchmarks/offline/run_benchmarks.py --latency splitBodyFeatures.add=0.05 --csv results.csv
+    python benchmarks/offline/run_benchmarks.py --strategies contour-temporary-brep export-dxf-layered --mesh-triangles 1000000
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADDIN_DIR = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, os.path.join(HERE, 'fake_adsk'))
+sys.path.insert(0, os.path.dirname(ADDIN_DIR))
+
+import adsk.core
+import adsk.fusion
+from adsk import _simulator
+
+ADDIN_PACKAGE = os.path.basename(ADDIN_DIR)
+entry = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.entry')
+futil = importlib.import_module(f'{ADDIN_PACKAGE}.lib.fusionAddInUtils')
+slicing = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.slicing')
+split = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.split')
+cache = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.cache')
+export = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.export')
+scheduler = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.scheduler')
+spacing = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.spacing')
+disk_cache = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.disk_cache')
+loops = importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.loops')
+
+
+def contour(engine, warm=False, adaptive=False, simplify=False, angled=False, output=entry.OUTPUT_SKETCH_PER_SECTION,
+            streaming=False):
+    def run(bodies, start, end, divisions):
+        if angled:
+            # Tilt the direction off the Z axis, so the planes are not axis-aligned
+            end = adsk.core.Point3D.create(end.x + 0.25 * end.z, end.y, end.z)
+        # Adaptive spacing ignores divisions; its smallest step is the uniform step
+        spacing_options = None
+        if adaptive:
+            step = abs(end.z - start.z) / divisions
+            spacing_options = spacing.AdaptiveSpacing(0.05, step, max(step, 10.0))
+        simplify_tolerance = loops.DEFAULT_TOLERANCE if simplify else None
+        options = (spacing_options, simplify_tolerance, output, streaming)
+        if warm:
+            # Fill the slice cache, then only count the second run
+            entry.create_contour_curves(bodies, start, end, divisions, False, engine, *options)
+            _simulator.reset(dict(_simulator.latency))
+            adsk.core.Application.get().activeProduct.timeline.count = 0
+        entry.create_contour_curves(bodies, start, end, divisions, False, engine, *options)
+    return run
+
+
+def split_with(method):
+    def run(bodies, start, end, divisions):
+        entry.split_bodies_with_planes(bodies, start, end, divisions, method)
+    return run
+
+
+def export_to(file_format, layout):
+    def run(bodies, start, end, divisions):
+        with tempfile.TemporaryDirectory() as folder:
+            scheduler.run_to_completion(entry.export_slice_steps(bodies, start, end, divisions, folder, file_format, layout))
+    return run
+
+
+def analyze():
+    def run(bodies, start, end, divisions):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'sections.csv')
+            scheduler.run_to_completion(entry.analyze_section_steps(bodies, start, end, divisions, path))
+    return run
+
+
+def from_disk_cache(strategy):
+    """Run once to fill a fresh disk cache, then count a second run that starts like a new session."""
+    def run(bodies, start, end, divisions):
+        with tempfile.TemporaryDirectory() as folder:
+            max_bytes = 64 * 1024 * 1024
+            cache.slice_cache.disk = disk_cache.DiskSliceCache(folder, max_bytes)
+            try:
+                strategy(bodies, start, end, divisions)
+                cache.slice_cache.clear()
+                cache.slice_cache.disk = disk_cache.DiskSliceCache(folder, max_bytes)
+                _simulator.reset(dict(_simulator.latency))
+                adsk.core.Application.get().activeProduct.timeline.count = 0
+                strategy(bodies, start, end, divisions)
+            finally:
+                cache.slice_cache.disk.clear()
+                cache.slice_cache.disk = None
+    return run
+
+
+STRATEGIES = {
+    'contour-temporary-brep': contour(slicing.ENGINE_TEMPORARY_BREP),
+    'contour-temporary-brep-warm': contour(slicing.ENGINE_TEMPORARY_BREP, warm=True),
+    'contour-construction-planes': contour(slicing.ENGINE_CONSTRUCTION_PLANES),
+    'contour-adaptive': contour(slicing.ENGINE_TEMPORARY_BREP, adaptive=True),
+    'contour-simplified': contour(slicing.ENGINE_TEMPORARY_BREP, simplify=True),
+    'contour-simplified-disk': from_disk_cache(contour(slicing.ENGINE_TEMPORARY_BREP, simplify=True)),
+    'contour-angled': contour(slicing.ENGINE_TEMPORARY_BREP, angled=True),
+    'contour-single-sketch': contour(slicing.ENGINE_TEMPORARY_BREP, output=entry.OUTPUT_SINGLE_SKETCH),
+    'contour-streaming': contour(slicing.ENGINE_TEMPORARY_BREP, output=entry.OUTPUT_SINGLE_SKETCH, streaming=True),
+    'split-single-feature': split_with(split.SPLIT_METHOD_SINGLE_FEATURE),
+    'split-plane-by-plane': split_with(split.SPLIT_METHOD_BISECTION),
+    'export-dxf-layered': export_to(export.FORMAT_DXF, export.LAYOUT_LAYERED),
+    'export-svg-per-slice': export_to(export.FORMAT_SVG, export.LAYOUT_PER_SLICE),
+    'export-dxf-disk': from_disk_cache(export_to(export.FORMAT_DXF, export.LAYOUT_LAYERED)),
+    'analyze-sections': analyze(),
+}
+
+
+def build_scene(body_count: int, faces: int, layout: str, triangles: int = 0):
+    """Create a fresh design with box bodies along Z in [0, 100].
+
+    'spread' places small bodies one after another along the axis, 'stacked'
+    makes every body span the whole range, 'instances' is 'stacked' with
+    every body an occurrence of the same component. With triangles, every
+    body is a mesh (an ellipsoid inside the box) with about that many
+    triangles.
+    """
+    app = adsk.core.Application.get()
+    app.activeProduct = adsk.fusion.Design()
+    rootComp = app.activeProduct.rootComponent
+    if layout == 'instances':
+        part = adsk.fusion.Component('Part')
+        native = part.add_box((0.0, 0.0, 0.0), (10.0, 10.0, 100.0), faces, 'Part Body')
+        bodies = [rootComp.add_occurrence(native, (i * 12.0, 0.0, 0.0), f'Body {i + 1}') for i in range(body_count)]
+    else:
+        bodies = []
+        for i in range(body_count):
+            if layout == 'stacked':
+                low, high = (i * 12.0, 0.0, 0.0), (i * 12.0 + 10.0, 10.0, 100.0)
+            else:
+                length = 100.0 / body_count
+                low, high = (0.0, 0.0, i * length), (10.0, 10.0, i * length + length * 0.8)
+            if triangles:
+                bodies.append(rootComp.add_mesh(low, high, triangles, f'Mesh {i + 1}'))
+            else:
+                bodies.append(rootComp.add_box(low, high, faces, f'Body {i + 1}'))
+    start = adsk.core.Point3D.create(0, 0, 0)
+    end = adsk.core.Point3D.create(0, 0, 100)
+    return bodies, start, end
+
+
+def measure(strategy: str, body_count: int, divisions: int, faces: int, layout: str, latency: dict, triangles: int = 0) -> dict:
+    bodies, start, end = build_scene(body_count, faces, layout, triangles)
+    cache.slice_cache.clear()
+    _simulator.reset(latency)
+
+    # Keep the add-in's own log output out of the report
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        STRATEGIES[strategy](bodies, start, end, divisions)
+    wall = time.perf_counter() - started
+
+    design = adsk.core.Application.get().activeProduct
+    return {
+        'strategy': strategy,
+        'layout': layout,
+        'bodies': body_count,
+        'divisions': divisions,
+        'api_calls': sum(_simulator.calls.values()),
+        'simulated_s': _simulator.simulated_seconds,
+        'python_s': wall,
+        'timeline': design.timeline.count,
+        'top_calls': ', '.join(f'{name}={count}' for name, count in _simulator.calls.most_common(4)),
+    }
+
+
+def parse_latency(values) -> dict:
+    overrides = {}
+    for value in values or []:
+        name, _, seconds = value.partition('=')
+        overrides[name] = float(seconds)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--strategies', nargs='+', choices=sorted(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--divisions', nargs='+', type=int, default=[2, 10, 100, 1000, 10000])
+    parser.add_argument('--bodies', nargs='+', type=int, default=[1, 10, 100])
+    parser.add_argument('--faces', type=int, default=1000, help='faces per body (scales per-face latencies)')
+    parser.add_argument('--layout', choices=['spread', 'stacked', 'instances'], default='spread')
+    parser.add_argument('--mesh-triangles', type=int, default=0, help='use mesh bodies with about this many triangles each')
+    parser.add_argument('--fragments', type=int, default=1, help='collinear pieces per section edge (split/faceted bodies)')
+    parser.add_argument('--latency', nargs='*', metavar='CALL=SECONDS', help='override simulated latencies')
+    parser.add_argument('--csv', help='also write the results to this CSV file')
+    args = parser.parse_args()
+
+    futil.set_log_level(futil.WARNING_LEVEL)
+    # Only the disk cache strategies use a (temporary) disk cache
+    cache.slice_cache.disk = None
+    adsk.fusion.EDGE_FRAGMENTS = args.fragments
+    latency = parse_latency(args.latency)
+
+    rows = []
+    header = f'{"strategy":<29} {"bodies":>6} {"divs":>6} {"api calls":>10} {"simulated s":>12} {"python s":>9} {"timeline":>8}  top calls'
+    print(header)
+    print('-' * len(header))
+    for strategy in args.strategies:
+        for body_count in args.bodies:
+            for divisions in args.divisions:
+                row = measure(strategy, body_count, divisions, args.faces, args.layout, latency, args.mesh_triangles)
+                rows.append(row)
+                print(f'{row["strategy"]:<29} {row["bodies"]:>6} {row["divisions"]:>6} {row["api_calls"]:>10} '
+                      f'{row["simulated_s"]:>12.2f} {row["python_s"]:>9.2f} {row["timeline"]:>8}  {row["top_calls"]}')
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 # Commands for Split with Planes Add-in
 
-from .contour import entry as splitWithPlanes
+# Only the button metadata is imported here; each command imports its
+# implementation the first time it is created (see contour/command.py)
+from .contour import command as splitWithPlanes
 
 # List of commands to register
 commands = [
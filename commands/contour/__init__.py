@@ -1,2 +1 @@
-from .entry import start, stop
-
+from .command import start, stop
@@ -0,0 +1,179 @@
+import csv
+import os
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+from . import loops
+from .export import MM_PER_CM
+
+# NumPy is not guaranteed inside Fusion; fall back to plain Python without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Stroke tolerance (cm) for measured sections
+ANALYSIS_TOLERANCE = 0.001
+
+CSV_COLUMNS = ('slice', 'position_mm', 'loops', 'area_mm2', 'perimeter_mm',
+               'centroid_x_mm', 'centroid_y_mm', 'centroid_z_mm',
+               'min_u_mm', 'min_v_mm', 'max_u_mm', 'max_v_mm', 'volume_mm3')
+
+
+def _flatten(points: list, axis: slicing.SliceAxis):
+    """(u, v) coordinates of world points in the slice plane, as two sequences."""
+    if numpy is not None:
+        flat = numpy.asarray(points, dtype=float) @ numpy.array([axis.u, axis.v]).T
+        return flat[:, 0], flat[:, 1]
+    flat = [axis.flatten(point) for point in points]
+    return [u for u, _ in flat], [v for _, v in flat]
+
+
+def _moments(u, v, closed: bool) -> tuple:
+    """Signed area, first moments (about the v and u axes) and length of a polyline.
+
+    Shoelace sums over the edges; a closed loop includes the edge back to its
+    first point, an open chain only contributes its length.
+    """
+    if numpy is not None:
+        u1, v1 = numpy.roll(u, -1), numpy.roll(v, -1)
+        lengths = numpy.hypot(u1 - u, v1 - v)
+        length = float(lengths.sum() if closed else lengths[:-1].sum())
+        if not closed:
+            return 0.0, 0.0, 0.0, length
+        cross = u * v1 - u1 * v
+        return float(cross.sum()) / 2, float(((u + u1) * cross).sum()) / 6, float(((v + v1) * cross).sum()) / 6, length
+
+    count = len(u)
+    edges = count if closed else count - 1
+    area = moment_u = moment_v = length = 0.0
+    for k in range(edges):
+        ua, va, ub, vb = u[k], v[k], u[(k + 1) % count], v[(k + 1) % count]
+        length += ((ub - ua) ** 2 + (vb - va) ** 2) ** 0.5
+        if closed:
+            cross = ua * vb - ub * va
+            area += cross
+            moment_u += (ua + ub) * cross
+            moment_v += (va + vb) * cross
+    return area / 2, moment_u / 6, moment_v / 6, length
+
+
+def _contains(u, v, point: tuple) -> bool:
+    """Even-odd test of a point against a closed loop."""
+    pu, pv = point
+    if numpy is not None:
+        u1, v1 = numpy.roll(u, -1), numpy.roll(v, -1)
+        straddles = (v > pv) != (v1 > pv)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            crossings = u + (pv - v) * (u1 - u) / (v1 - v)
+        return bool(numpy.count_nonzero(straddles & (pu < crossings)) % 2)
+    inside = False
+    count = len(u)
+    for k in range(count):
+        ua, va, ub, vb = u[k], v[k], u[(k + 1) % count], v[(k + 1) % count]
+        if (va > pv) != (vb > pv) and pu < ua + (pv - va) * (ub - ua) / (vb - va):
+            inside = not inside
+    return inside
+
+
+def section_properties(section: list, axis: slicing.SliceAxis, position: float) -> dict:
+    """Area, perimeter, centroid and plane bounding box of one section, in cm.
+
+    section -- (points, closed) loops in world space, as from loops.assemble_loops
+               or mesh_slicing.MeshSections.
+    Loops nested inside an odd number of other loops are holes and subtract
+    their area, whichever way they run. Open chains only add to the
+    perimeter. The centroid is a world point; the bounding box is in the
+    (u, v) axes of the slice plane.
+    """
+    flat = [(_flatten(points, axis), closed) for points, closed in section if len(points) >= 2]
+    closed_loops = [(u, v) for (u, v), closed in flat if closed and len(u) >= 3]
+
+    area = moment_u = moment_v = perimeter = 0.0
+    for (u, v), closed in flat:
+        signed_area, loop_u, loop_v, length = _moments(u, v, closed)
+        perimeter += length
+        if not closed or not signed_area:
+            continue
+        # Outer boundaries add, holes subtract, regardless of the loop direction
+        start = (float(u[0]), float(v[0]))
+        depth = sum(1 for other_u, other_v in closed_loops if other_u is not u and _contains(other_u, other_v, start))
+        sign = (1.0 if signed_area > 0 else -1.0) * (-1.0 if depth % 2 else 1.0)
+        area += sign * signed_area
+        moment_u += sign * loop_u
+        moment_v += sign * loop_v
+
+    properties = {'loops': len(closed_loops), 'area': area, 'perimeter': perimeter, 'centroid': None, 'bounds': None}
+    if area > 0:
+        properties['centroid'] = axis.point(position, moment_u / area, moment_v / area)
+    if flat:
+        properties['bounds'] = (min(float(min(u)) for (u, _), _ in flat), min(float(min(v)) for (_, v), _ in flat),
+                                max(float(max(u)) for (u, _), _ in flat), max(float(max(v)) for (_, v), _ in flat))
+    return properties
+
+
+class SectionAnalyzer:
+    """Stream section properties to a CSV table, one row per slice position.
+
+    Every position gets a row, including those that miss all bodies (zero
+    area), so the volume column can integrate the section area along the
+    axis with the trapezoid rule: each row holds the volume from the first
+    position up to its own. Values are in mm, mm2 and mm3.
+    """
+
+    def __init__(self, path: str, axis: slicing.SliceAxis):
+        self.path = path
+        self.axis = axis
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(CSV_COLUMNS)
+        self.volume = 0.0
+        self.previous = None
+        self.rows_written = 0
+        self.max_area = 0.0
+        self.max_area_position = None
+
+    def add_slice(self, index: int, position: float, section: list) -> dict:
+        """Measure one section and write its row. Returns the section properties (cm)."""
+        properties = section_properties(section, self.axis, position)
+        area = properties['area']
+        if self.previous is not None:
+            previous_position, previous_area = self.previous
+            self.volume += (previous_area + area) / 2 * abs(position - previous_position)
+        self.previous = (position, area)
+        if area > self.max_area:
+            self.max_area, self.max_area_position = area, position
+
+        centroid = properties['centroid'] or (None, None, None)
+        bounds = properties['bounds'] or (None, None, None, None)
+        self.writer.writerow([index + 1, _mm(position), properties['loops'], _mm(area, 2), _mm(properties['perimeter'])]
+                             + [_mm(value) for value in centroid] + [_mm(value) for value in bounds]
+                             + [_mm(self.volume, 3)])
+        self.rows_written += 1
+        return properties
+
+    def add_polylines(self, index: int, position: float, polylines: list, section: list = ()) -> dict:
+        """Chain stroked slice edges into loops and add them as one slice, with any mesh section loops."""
+        return self.add_slice(index, position, loops.assemble_loops(polylines, loops.DEFAULT_TOLERANCE) + list(section))
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def abort(self):
+        """Close and delete the table."""
+        try:
+            self.close()
+        except:
+            pass
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            futil.warning('Could not remove %s: %s', self.path, e)
+
+
+def _mm(value, power: int = 1) -> str:
+    """A cm, cm2 or cm3 value in mm units, or an empty cell."""
+    if value is None:
+        return ''
+    return f'{value * MM_PER_CM ** power:.6f}'
@@ -0,0 +1,43 @@
+import bisect
+
+# Distance (cm) under which a plane is considered to touch a body's extent
+TOLERANCE = 1e-6
+
+
+class BodyIntervalIndex:
+    """Interval index over the extents of bodies along the slice axis.
+
+    Built once per run from each body's bounding box so a slice position
+    only has to be tested against the bodies whose extent spans it.
+    """
+
+    def __init__(self, bodies, axis):
+        entries = []
+        for body in bodies:
+            low, high = axis.extent(body)
+            entries.append((low, high, body))
+        entries.sort(key=lambda entry: entry[0])
+
+        self._mins = [entry[0] for entry in entries]
+        self._entries = entries
+        self._max_length = max((high - low for low, high, _ in entries), default=0.0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def query(self, position: float, strict: bool = False) -> list:
+        """Return the bodies whose extent contains the position.
+
+        With strict=True bodies that only touch the position at their
+        boundary are excluded (a split there would not cut anything).
+        """
+        tol = -TOLERANCE if strict else TOLERANCE
+        # Nothing starting before position - max_length can still reach it
+        lo = bisect.bisect_left(self._mins, position - self._max_length - TOLERANCE)
+        hi = bisect.bisect_right(self._mins, position + tol)
+
+        bodies = []
+        for low, high, body in self._entries[lo:hi]:
+            if high >= position - tol and low <= position + tol:
+                bodies.append(body)
+        return bodies
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ... import config
+from . import slicing
+from . import sampling
+from .disk_cache import DiskSliceCache, entry_key, PENDING_MAX_POINTS, STREAMING_PENDING_POINTS
+
+# Rough memory cost of one cached wire body edge (geometry + topology)
+BYTES_PER_EDGE = 2048
+BYTES_PER_ENTRY = 512
+
+
+def body_fingerprint(body) -> tuple:
+    """Cheap geometry fingerprint of a body: bounding box, volume and topology counts."""
+    box = body.boundingBox
+    return (
+        tuple(round(value, 6) for value in box.minPoint.asArray()),
+        tuple(round(value, 6) for value in box.maxPoint.asArray()),
+        round(body.volume, 6),
+        body.faces.count,
+        body.edges.count,
+    )
+
+
+def native_frame(body) -> tuple:
+    """The native body of a selected body and its local-to-world transform (None outside assemblies)."""
+    context = body.assemblyContext
+    if not context:
+        return body, None
+    return body.nativeObject, context.transform2
+
+
+def local_plane(toLocal: list, axis: slicing.SliceAxis, position: float) -> tuple:
+    """A world slice plane in a body's local frame, as a canonical (normal, offset) key.
+
+    toLocal -- Row-major cells of the world-to-local matrix, or None for world bodies.
+    The normal is flipped so its first non-zero component is positive; both
+    sides of a plane give the same intersection.
+    """
+    normal = axis.normal
+    origin = [value * position for value in normal]
+    if toLocal is None:
+        localOrigin, localNormal = origin, normal
+    else:
+        localOrigin = [sum(toLocal[row * 4 + k] * origin[k] for k in range(3)) + toLocal[row * 4 + 3] for row in range(3)]
+        localNormal = [sum(toLocal[row * 4 + k] * normal[k] for k in range(3)) for row in range(3)]
+    length = sum(value * value for value in localNormal) ** 0.5
+    sign = 1.0 if next(value for value in localNormal if abs(value) > 1e-12) > 0 else -1.0
+    localNormal = [sign * value / length for value in localNormal]
+    offset = sum(localNormal[k] * localOrigin[k] for k in range(3))
+    return tuple(round(value, 9) for value in localNormal), round(offset, 9)
+
+
+class SliceCache:
+    """LRU cache of plane/body intersections that survives between runs.
+
+    Entries are keyed on (native body entity token, geometry fingerprint,
+    plane normal, plane offset) with the plane in the native body's local
+    frame, and hold the temporary wire body in that frame, or None when the
+    plane misses the body. Occurrences of the same component therefore share
+    their intersections wherever their local planes coincide, and are only
+    transformed into world space on the way out. Least recently used entries
+    are evicted once the estimated size goes over max_bytes.
+
+    Stroked polylines (see polylines) are also kept in an optional disk cache
+    under the same keys plus the stroke tolerance, so a later session can
+    load them instead of intersecting again.
+
+    In a streaming run (see begin_run) new intersections are not stored:
+    each slice's wire bodies are released as soon as the slice is written,
+    existing entries are still reused, and the disk cache flushes new
+    entries in small batches.
+    """
+
+    def __init__(self, max_bytes: int, disk: DiskSliceCache = None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.fingerprints = {}
+        self.frames = {}
+        self.streaming = False
+
+    def begin_run(self, streaming: bool = False):
+        """Reset counters, fingerprints and frames; geometry may have changed since the last run."""
+        self.hits = 0
+        self.misses = 0
+        self.fingerprints = {}
+        self.frames = {}
+        self.streaming = streaming
+        if self.disk:
+            self.disk.pending_limit = STREAMING_PENDING_POINTS if streaming else PENDING_MAX_POINTS
+
+    def frame(self, body) -> tuple:
+        """(native body, local-to-world matrix, world-to-local cells, local-to-world cells) of a body, once per run."""
+        token = body.entityToken
+        frame = self.frames.get(token)
+        if frame is None:
+            nativeBody, toWorld = native_frame(body)
+            toLocal = toWorldCells = None
+            if toWorld is not None:
+                toWorldCells = toWorld.asArray()
+                toLocal = toWorld.copy()
+                toLocal.invert()
+                toLocal = toLocal.asArray()
+            frame = (nativeBody, toWorld, toLocal, toWorldCells)
+            self.frames[token] = frame
+        return frame
+
+    def key(self, nativeBody, plane_key: tuple) -> tuple:
+        token = nativeBody.entityToken
+        fingerprint = self.fingerprints.get(token)
+        if fingerprint is None:
+            fingerprint = body_fingerprint(nativeBody)
+            self.fingerprints[token] = fingerprint
+        return (token, fingerprint) + plane_key
+
+    def intersect(self, bodies, axis: slicing.SliceAxis, position: float) -> list:
+        """Cached version of slicing.intersect_bodies_with_plane.
+
+        Returns fresh world-space copies of the wire bodies so callers may
+        transform them.
+        """
+        tempBRep = adsk.fusion.TemporaryBRepManager.get()
+        wire_bodies = []
+        planes = {}
+        for body in bodies:
+            nativeBody, toWorld, toLocal, _ = self.frame(body)
+            plane_key = local_plane(toLocal, axis, position)
+            wire_body = self.local_intersection(nativeBody, plane_key, planes)
+            if wire_body:
+                wire_body = tempBRep.copy(wire_body)
+                if toWorld is not None:
+                    tempBRep.transform(wire_body, toWorld)
+                wire_bodies.append(wire_body)
+        return wire_bodies
+
+    def local_intersection(self, nativeBody, plane_key: tuple, planes: dict):
+        """Wire body of a native body and a local plane (None if they do not meet), intersecting on a cache miss.
+
+        planes -- Plane objects by plane key, shared between the bodies of one position.
+        """
+        key = self.key(nativeBody, plane_key)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+        self.misses += 1
+        plane = planes.get(plane_key)
+        if plane is None:
+            normal, offset = plane_key
+            plane = adsk.core.Plane.create(adsk.core.Point3D.create(*[value * offset for value in normal]),
+                                           adsk.core.Vector3D.create(*normal))
+            planes[plane_key] = plane
+        found = slicing.intersect_bodies_with_plane([nativeBody], plane)
+        wire_body = found[0] if found else None
+        if not self.streaming:
+            self.store(key, wire_body)
+        return wire_body
+
+    def polylines(self, bodies, axis: slicing.SliceAxis, position: float, tolerance: float) -> list:
+        """World-space polylines of the stroked intersection edges (one per edge), like slicing.wire_body_to_polylines.
+
+        Edges are stroked in the native body's frame and kept in the disk
+        cache, so an unchanged body is only intersected the first time any
+        session slices it at this plane and tolerance.
+        """
+        polylines = []
+        planes = {}
+        for body in bodies:
+            nativeBody, _, toLocal, toWorldCells = self.frame(body)
+            plane_key = local_plane(toLocal, axis, position)
+            disk_key = entry_key(self.key(nativeBody, plane_key) + (round(tolerance, 9),)) if self.disk else None
+            local = self.disk.get(disk_key) if self.disk else None
+            if local is None:
+                wire_body = self.local_intersection(nativeBody, plane_key, planes)
+                local = slicing.wire_body_to_polylines(wire_body, tolerance) if wire_body else []
+                if self.disk:
+                    self.disk.put(disk_key, local)
+            if toWorldCells is None:
+                polylines.extend(local)
+                continue
+            # All points of the body go through one matrix multiply
+            points = sampling.transform_points(toWorldCells, [point for polyline in local for point in polyline])
+            offset = 0
+            for polyline in local:
+                polylines.append(points[offset:offset + len(polyline)])
+                offset += len(polyline)
+        return polylines
+
+    def unique_bodies(self, bodies) -> int:
+        """Number of distinct native bodies behind the bodies (occurrences of one component count once)."""
+        return len({self.frame(body)[0].entityToken for body in bodies})
+
+    def store(self, key: tuple, wire_body):
+        size = BYTES_PER_ENTRY + (wire_body.edges.count * BYTES_PER_EDGE if wire_body else 0)
+        self.entries[key] = (wire_body, size)
+        self.size += size
+        while self.size > self.max_bytes and self.entries:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def log_stats(self):
+        futil.log(f'Slice cache: {self.hits} hits, {self.misses} misses, '
+                  f'{len(self.entries)} entries, {self.size / (1024 * 1024):.1f} MB')
+
+    def end_run(self):
+        """Write new disk entries and log the cache statistics of the run."""
+        self.log_stats()
+        if self.disk:
+            with futil.phase('slice disk cache save'):
+                self.disk.save()
+            self.disk.log_stats()
+
+
+slice_cache = SliceCache(config.SLICE_CACHE_MAX_MB * 1024 * 1024,
+                         DiskSliceCache(config.SLICE_DISK_CACHE_FOLDER, config.SLICE_DISK_CACHE_MAX_MB * 1024 * 1024)
+                         if config.SLICE_DISK_CACHE_FOLDER else None)
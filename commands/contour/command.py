@@ -0,0 +1,97 @@
+import adsk.core
+import adsk.fusion
+import importlib
+import os
+import sys
+import time
+from ...lib import fusionAddInUtils as futil
+from ... import config
+
+# Command identity
+CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_contour'
+CMD_NAME = 'Contour'
+CMD_Description = 'Create contour curves or split bodies with parallel planes'
+
+IS_PROMOTED = True
+
+# UI location
+WORKSPACE_ID = 'FusionSolidEnvironment'
+PANEL_ID = 'SolidScriptsAddinsPanel'
+COMMAND_BESIDE_ID = 'ScriptsManagerCommand'
+
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '')
+
+# Live contour custom feature (see live.py); defined at startup so saved features recompute
+LIVE_FEATURE_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_liveContour'
+LIVE_FEATURE_NAME = 'Live Contour'
+
+live_definition = None
+
+# Implementation modules, imported on first use
+_modules = {}
+
+
+def load(name: str = 'entry'):
+    """Import an implementation module (geometry engine, caches, NumPy) once, on first use."""
+    module = _modules.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = _modules[name] = importlib.import_module(f'.{name}', __package__)
+        futil.log(f'{CMD_NAME} {name} module loaded in {(time.perf_counter() - started) * 1000:.0f} ms')
+    return module
+
+
+def start():
+    global live_definition
+    try:
+        ui = adsk.core.Application.get().userInterface
+        cmd_def = ui.commandDefinitions.addButtonDefinition(CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER)
+        futil.add_handler(cmd_def.commandCreated, command_created)
+
+        workspace = ui.workspaces.itemById(WORKSPACE_ID)
+        panel = workspace.toolbarPanels.itemById(PANEL_ID)
+        control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, False)
+        control.isPromoted = IS_PROMOTED
+
+        # Without custom features (older Fusion versions) the command still works, just without Live Feature output
+        try:
+            live_definition = adsk.fusion.CustomFeatureDefinition.create(LIVE_FEATURE_ID, LIVE_FEATURE_NAME, ICON_FOLDER)
+            futil.add_handler(live_definition.customFeatureCompute, live_feature_compute)
+        except Exception as e:
+            live_definition = None
+            futil.log(f'{LIVE_FEATURE_NAME} feature not available: {e}')
+
+        futil.log(f'{CMD_NAME} command started successfully')
+    except:
+        futil.handle_error('Failed to start command')
+
+
+def stop():
+    try:
+        # A chunked run still going would keep calling into modules that are being unloaded
+        scheduler = sys.modules.get(f'{__package__}.scheduler')
+        if scheduler and scheduler.ChunkedRun.active:
+            scheduler.ChunkedRun.active.cancel()
+
+        ui = adsk.core.Application.get().userInterface
+        workspace = ui.workspaces.itemById(WORKSPACE_ID)
+        panel = workspace.toolbarPanels.itemById(PANEL_ID)
+        command_control = panel.controls.itemById(CMD_ID)
+        command_definition = ui.commandDefinitions.itemById(CMD_ID)
+
+        if command_control:
+            command_control.deleteMe()
+        if command_definition:
+            command_definition.deleteMe()
+
+        futil.log(f'{CMD_NAME} command stopped successfully')
+    except:
+        futil.handle_error('Failed to stop command')
+
+
+def command_created(args: adsk.core.CommandCreatedEventArgs):
+    load().command_created(args)
+
+
+def live_feature_compute(args: adsk.fusion.CustomFeatureEventArgs):
+    load('live').compute(args)
@@ -0,0 +1,231 @@
+import array
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from ...lib import fusionAddInUtils as futil
+
+# NumPy is not guaranteed inside Fusion; fall back to plain Python without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Bumped whenever the layout of the files changes; older caches are discarded
+FORMAT_VERSION = 1
+
+# Bytes per stored point (x, y, z as float64)
+POINT_BYTES = 24
+
+# Buffered points that trigger a flush in the middle of a run, so long runs do not hold every new entry in
+# memory; streaming runs flush in much smaller batches (a point costs about 140 bytes as Python tuples)
+PENDING_MAX_POINTS = 1 << 18
+STREAMING_PENDING_POINTS = 1 << 14
+
+# After eviction the pack is compacted down to this share of the size cap
+COMPACT_RATIO = 0.75
+
+INDEX_FILE = 'slices.json'
+DATA_FILE = 'slices.bin'
+
+
+def entry_key(key: tuple) -> str:
+    """Short stable file key for a slice cache key (body token, fingerprint, plane, tolerance)."""
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:32]
+
+
+class DiskSliceCache:
+    """Stroked slice polylines on disk, so later sessions skip unchanged intersections.
+
+    All coordinates live in one flat float64 file (x, y, z per point) that is
+    memory-mapped for reading; a JSON index maps each entry key to its first
+    point and the point count of every polyline. Empty entries (the plane
+    misses the body) are stored too. New entries are buffered and appended
+    to the data file once pending_limit points are waiting (flush) and at
+    the end of a run (save), which also writes the index. When the data file grows over max_bytes,
+    the least recently used entries are dropped and the file is rewritten.
+    """
+
+    def __init__(self, folder: str, max_bytes: int):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(folder, INDEX_FILE)
+        self.data_path = os.path.join(folder, DATA_FILE)
+        self.entries = None
+        self.pending = {}
+        self.pending_points = 0
+        self.pending_limit = PENDING_MAX_POINTS
+        self.data = None
+        self.touched = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        """Read the index once; a missing or incompatible cache starts empty."""
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+            if index.get('version') == FORMAT_VERSION and index.get('byteorder') == sys.byteorder:
+                self.entries = index['entries']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            futil.warning('Ignoring unreadable slice cache %s: %s', self.index_path, e)
+
+    def _map(self):
+        """Memory-map the data file for reading (None while it is empty)."""
+        if self.data is None and os.path.exists(self.data_path) and os.path.getsize(self.data_path) > 0:
+            with open(self.data_path, 'rb') as file:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.data
+
+    def _unmap(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def get(self, key: str):
+        """Polylines stored under the key as lists of (x, y, z) tuples, or None if it is not cached."""
+        if key in self.pending:
+            self.hits += 1
+            return self.pending[key]
+        self._load()
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        start, counts = entry[0], entry[1]
+        entry[2] = time.time()
+        self.touched = True
+        total = sum(counts)
+        if total == 0:
+            self.hits += 1
+            return []
+        data = self._map()
+        begin, end = start * POINT_BYTES, (start + total) * POINT_BYTES
+        if data is None or end > len(data):
+            # The data file was cut short (e.g. a crash while writing); recompute the entry
+            del self.entries[key]
+            self.misses += 1
+            return None
+        if numpy is not None:
+            values = numpy.frombuffer(data, dtype=numpy.float64, count=total * 3, offset=begin).reshape(-1, 3)
+            points = list(zip(*values.T.tolist()))
+        else:
+            values = array.array('d')
+            values.frombytes(data[begin:end])
+            points = list(zip(values[0::3], values[1::3], values[2::3]))
+        self.hits += 1
+        polylines = []
+        offset = 0
+        for count in counts:
+            polylines.append(points[offset:offset + count])
+            offset += count
+        return polylines
+
+    def put(self, key: str, polylines: list):
+        """Buffer the polylines of an entry until the next save()."""
+        self.pending[key] = polylines
+        self.pending_points += sum(len(polyline) for polyline in polylines)
+        if self.pending_points >= self.pending_limit:
+            self.flush()
+
+    def flush(self):
+        """Append buffered entries to the data file. The index is only written by save().
+
+        If the run stops before save(), the appended points are not referenced
+        by any entry and are dropped by the next compaction.
+        """
+        if not self.pending:
+            return
+        self._load()
+        self._unmap()
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            now = time.time()
+            with open(self.data_path, 'ab') as file:
+                start = file.tell() // POINT_BYTES
+                for key, polylines in self.pending.items():
+                    values = array.array('d', [value for polyline in polylines for point in polyline for value in point])
+                    values.tofile(file)
+                    counts = [len(polyline) for polyline in polylines]
+                    self.entries[key] = [start, counts, now]
+                    start += len(values) // 3
+            self.touched = True
+        except OSError as e:
+            # Those slices are intersected again next time
+            futil.warning('Could not write slice cache %s: %s', self.folder, e)
+        # Dropped even on a failure rather than retried on every entry
+        self.pending = {}
+        self.pending_points = 0
+
+    def save(self):
+        """Flush buffered entries, evict over the size cap and write the index."""
+        self.flush()
+        if not self.touched:
+            return
+        try:
+            if os.path.exists(self.data_path) and os.path.getsize(self.data_path) > self.max_bytes:
+                self._unmap()
+                self._compact()
+            self._write_index()
+            self.touched = False
+        except OSError as e:
+            futil.warning('Could not write slice cache %s: %s', self.folder, e)
+
+    def _compact(self):
+        """Keep the most recently used entries up to COMPACT_RATIO of the cap and rewrite the data file."""
+        budget = int(self.max_bytes * COMPACT_RATIO) // POINT_BYTES
+        kept = {}
+        used = 0
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1][2], reverse=True):
+            total = sum(entry[1])
+            if used + total > budget:
+                continue
+            kept[key] = entry
+            used += total
+
+        compacted = self.data_path + '.tmp'
+        with open(self.data_path, 'rb') as source, open(compacted, 'wb') as target:
+            start = 0
+            for entry in sorted(kept.values(), key=lambda entry: entry[0]):
+                total = sum(entry[1])
+                source.seek(entry[0] * POINT_BYTES)
+                target.write(source.read(total * POINT_BYTES))
+                entry[0] = start
+                start += total
+        os.replace(compacted, self.data_path)
+        futil.log(f'Slice disk cache: evicted {len(self.entries) - len(kept)} entries')
+        self.entries = kept
+
+    def _write_index(self):
+        temporary = self.index_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump({'version': FORMAT_VERSION, 'byteorder': sys.byteorder, 'entries': self.entries}, file,
+                      separators=(',', ':'))
+        os.replace(temporary, self.index_path)
+
+    def clear(self):
+        """Drop every entry and delete the files."""
+        self._unmap()
+        self.entries = {}
+        self.pending = {}
+        self.pending_points = 0
+        for path in (self.index_path, self.data_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def log_stats(self):
+        self._load()
+        size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        futil.log(f'Slice disk cache: {self.hits} hits, {self.misses} misses, '
+                  f'{len(self.entries) + len(self.pending)} entries, {size / (1024 * 1024):.1f} MB')
+        self.hits = 0
+        self.misses = 0
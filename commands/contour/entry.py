@@ -1,79 +1,62 @@
 import adsk.core
 import adsk.fusion
-import os
+import time
 from ...lib import fusionAddInUtils as futil
 from ... import config
+from . import command
+from . import slicing
+from .body_index import BodyIntervalIndex
+from . import split
+from . import preview
+from .cache import slice_cache
+from . import scheduler
+from . import export
+from . import sampling
+from . import spacing
+from . import loops
+from . import mesh_slicing
+from . import analysis
+from . import workers
+from . import live
+from .sketch_writer import SketchWriter
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-# Command identity
-CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_contour'
-CMD_NAME = 'Contour'
-CMD_Description = 'Create contour curves or split bodies with parallel planes'
-
-IS_PROMOTED = True
-
-# UI location
-WORKSPACE_ID = 'FusionSolidEnvironment'
-PANEL_ID = 'SolidScriptsAddinsPanel'
-COMMAND_BESIDE_ID = 'ScriptsManagerCommand'
-
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '')
-
 # Event handlers reference
 local_handlers = []
 
 # Mode constants
 MODE_CONTOUR_CURVES = 'Contour Curves'
 MODE_SPLIT_BODY = 'Split Body'
+MODE_EXPORT_FILES = 'Export Files'
+MODE_ANALYZE_SECTIONS = 'Analyze Sections'
 
+# Contour output constants
+OUTPUT_SKETCH_PER_SECTION = 'Sketch per Section'
+OUTPUT_SINGLE_SKETCH = 'Single Sketch'
+OUTPUT_LIVE_FEATURE = 'Live Feature'
 
-def start():
-    try:
-        cmd_def = ui.commandDefinitions.addButtonDefinition(CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER)
-        futil.add_handler(cmd_def.commandCreated, command_created)
-
-        workspace = ui.workspaces.itemById(WORKSPACE_ID)
-        panel = workspace.toolbarPanels.itemById(PANEL_ID)
-        control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, False)
-        control.isPromoted = IS_PROMOTED
-        
-        futil.log(f'{CMD_NAME} command started successfully')
-    except:
-        futil.handle_error('Failed to start command')
-
-
-def stop():
-    try:
-        workspace = ui.workspaces.itemById(WORKSPACE_ID)
-        panel = workspace.toolbarPanels.itemById(PANEL_ID)
-        command_control = panel.controls.itemById(CMD_ID)
-        command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-        if command_control:
-            command_control.deleteMe()
-        if command_definition:
-            command_definition.deleteMe()
-        
-        futil.log(f'{CMD_NAME} command stopped successfully')
-    except:
-        futil.handle_error('Failed to stop command')
+# Highest number of divisions; runs with thousands of slices should turn on Stream Slices (see begin_slice_run)
+MAX_DIVISIONS = 20000
 
 
 def command_created(args: adsk.core.CommandCreatedEventArgs):
-    futil.log(f'{CMD_NAME} Command Created Event')
+    futil.log(f'{command.CMD_NAME} Command Created Event')
 
     inputs = args.command.commandInputs
 
-    # Mode selection (Contour Curves or Split Body)
+    # Mode selection (Contour Curves, Split Body, Export Files or Analyze Sections)
     mode_input = inputs.addDropDownCommandInput('mode', 'Mode', adsk.core.DropDownStyles.TextListDropDownStyle)
     mode_input.listItems.add(MODE_CONTOUR_CURVES, True)  # Default
     mode_input.listItems.add(MODE_SPLIT_BODY, False)
+    mode_input.listItems.add(MODE_EXPORT_FILES, False)
+    mode_input.listItems.add(MODE_ANALYZE_SECTIONS, False)
 
     # Body selection (multiple)
     body_select = inputs.addSelectionInput('body_select', 'Bodies', 'Select bodies')
     body_select.addSelectionFilter('SolidBodies')
+    body_select.addSelectionFilter('MeshBodies')
     body_select.setSelectionLimits(1, 0)  # 1 to unlimited
 
     # Start point selection
@@ -90,12 +73,65 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     end_point.addSelectionFilter('ConstructionPoints')
     end_point.setSelectionLimits(1, 1)
 
+    # Slice spacing: uniform by divisions, or adaptive to section changes
+    spacing_input = inputs.addDropDownCommandInput('spacing', 'Slice Spacing', adsk.core.DropDownStyles.TextListDropDownStyle)
+    spacing_input.listItems.add(spacing.SPACING_UNIFORM, True)  # Default
+    spacing_input.listItems.add(spacing.SPACING_ADAPTIVE, False)
+
     # Number of divisions
-    inputs.addIntegerSpinnerCommandInput('divisions', 'Number of Divisions', 2, 100, 1, 5)
+    inputs.addIntegerSpinnerCommandInput('divisions', 'Number of Divisions', 2, MAX_DIVISIONS, 1, 5)
+
+    # Adaptive spacing limits (lengths in cm internally)
+    lengthUnits = app.activeProduct.unitsManager.defaultLengthUnits
+    max_deviation_input = inputs.addValueInput('max_deviation', 'Max Deviation', lengthUnits, adsk.core.ValueInput.createByReal(0.05))
+    min_spacing_input = inputs.addValueInput('min_spacing', 'Min Spacing', lengthUnits, adsk.core.ValueInput.createByReal(0.1))
+    max_spacing_input = inputs.addValueInput('max_spacing', 'Max Spacing', lengthUnits, adsk.core.ValueInput.createByReal(1.0))
+    max_deviation_input.isVisible = False
+    min_spacing_input.isVisible = False
+    max_spacing_input.isVisible = False
 
     # Delete original bodies option (for Contour Curves mode)
     delete_bodies = inputs.addBoolValueInput('delete_bodies', 'Delete Original Bodies', True, '', False)
 
+    # Output simplification (for Contour Curves and Export Files modes)
+    inputs.addBoolValueInput('simplify', 'Simplify Output', True, '', False)
+    simplify_tolerance_input = inputs.addValueInput('simplify_tolerance', 'Simplify Tolerance', lengthUnits,
+                                                    adsk.core.ValueInput.createByReal(loops.DEFAULT_TOLERANCE))
+    simplify_tolerance_input.isVisible = False
+
+    # Slicing engine (for Contour Curves mode)
+    engine_input = inputs.addDropDownCommandInput('engine', 'Slicing Engine', adsk.core.DropDownStyles.TextListDropDownStyle)
+    engine_input.listItems.add(slicing.ENGINE_TEMPORARY_BREP, True)  # Default
+    engine_input.listItems.add(slicing.ENGINE_CONSTRUCTION_PLANES, False)
+
+    # Contour output (for Contour Curves mode)
+    output_input = inputs.addDropDownCommandInput('output', 'Output', adsk.core.DropDownStyles.TextListDropDownStyle)
+    output_input.listItems.add(OUTPUT_SKETCH_PER_SECTION, True)  # Default
+    output_input.listItems.add(OUTPUT_SINGLE_SKETCH, False)
+    output_input.listItems.add(OUTPUT_LIVE_FEATURE, False)
+
+    # Bounded-memory runs for thousands of slices (Contour Curves, Export Files and Analyze Sections modes)
+    stream_input = inputs.addBoolValueInput('stream', 'Stream Slices', True, '', False)
+    stream_input.tooltip = ('Keep memory use flat for thousands of slices: intersections are not kept for the next run. '
+                            'Contour Curves needs Single Sketch output with the Temporary BRep engine.')
+
+    # Split method (for Split Body mode)
+    split_method_input = inputs.addDropDownCommandInput('split_method', 'Split Method', adsk.core.DropDownStyles.TextListDropDownStyle)
+    split_method_input.listItems.add(split.SPLIT_METHOD_SINGLE_FEATURE, True)  # Default
+    split_method_input.listItems.add(split.SPLIT_METHOD_BISECTION, False)
+    split_method_input.isVisible = False
+
+    # Export format and layout (for Export Files mode)
+    export_format_input = inputs.addDropDownCommandInput('export_format', 'File Format', adsk.core.DropDownStyles.TextListDropDownStyle)
+    export_format_input.listItems.add(export.FORMAT_DXF, True)  # Default
+    export_format_input.listItems.add(export.FORMAT_SVG, False)
+    export_format_input.isVisible = False
+
+    export_layout_input = inputs.addDropDownCommandInput('export_layout', 'File Layout', adsk.core.DropDownStyles.TextListDropDownStyle)
+    export_layout_input.listItems.add(export.LAYOUT_LAYERED, True)  # Default
+    export_layout_input.listItems.add(export.LAYOUT_PER_SLICE, False)
+    export_layout_input.isVisible = False
+
     # Connect event handlers
     futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
@@ -105,7 +141,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
 
 def command_execute(args: adsk.core.CommandEventArgs):
-    futil.log(f'{CMD_NAME} Command Execute Event')
+    futil.log(f'{command.CMD_NAME} Command Execute Event')
 
     inputs = args.command.commandInputs
 
@@ -115,7 +151,13 @@ def command_execute(args: adsk.core.CommandEventArgs):
     start_point_input: adsk.core.SelectionCommandInput = inputs.itemById('start_point')
     end_point_input: adsk.core.SelectionCommandInput = inputs.itemById('end_point')
     divisions_input: adsk.core.IntegerSpinnerCommandInput = inputs.itemById('divisions')
+    spacing_input: adsk.core.DropDownCommandInput = inputs.itemById('spacing')
     delete_bodies_input: adsk.core.BoolValueCommandInput = inputs.itemById('delete_bodies')
+    engine_input: adsk.core.DropDownCommandInput = inputs.itemById('engine')
+    output_input: adsk.core.DropDownCommandInput = inputs.itemById('output')
+    split_method_input: adsk.core.DropDownCommandInput = inputs.itemById('split_method')
+    export_format_input: adsk.core.DropDownCommandInput = inputs.itemById('export_format')
+    export_layout_input: adsk.core.DropDownCommandInput = inputs.itemById('export_layout')
 
     # Get mode
     mode = mode_input.selectedItem.name
@@ -126,265 +168,821 @@ def command_execute(args: adsk.core.CommandEventArgs):
         bodies.append(body_select.selection(i).entity)
 
     # Get start and end points
-    start_point = get_point_from_selection(start_point_input.selection(0).entity)
-    end_point = get_point_from_selection(end_point_input.selection(0).entity)
+    start_point = slicing.get_point_from_selection(start_point_input.selection(0).entity)
+    end_point = slicing.get_point_from_selection(end_point_input.selection(0).entity)
 
     # Get number of divisions
     divisions = divisions_input.value
 
+    # Get slice spacing
+    adaptive = get_adaptive_spacing(inputs)
+
+    # Get output simplification (None when off)
+    simplify_tolerance = get_simplify_tolerance(inputs)
+
     # Get delete bodies option
     delete_bodies = delete_bodies_input.value
 
-    # Execute based on mode
-    try:
-        futil.log(f'=== Starting {mode} ===')
-        futil.log(f'Bodies: {len(bodies)}')
-        futil.log(f'Start point: {start_point.asArray()}')
-        futil.log(f'End point: {end_point.asArray()}')
-        futil.log(f'Divisions: {divisions}')
-        futil.log(f'Delete bodies: {delete_bodies}')
-        
-        if mode == MODE_CONTOUR_CURVES:
-            create_contour_curves(bodies, start_point, end_point, divisions, delete_bodies)
-        else:
-            split_bodies_with_planes(bodies, start_point, end_point, divisions)
-        
-        futil.log(f'=== {mode} Completed ===')
-    except Exception as e:
-        error_msg = f'Error: {str(e)}'
-        ui.messageBox(error_msg)
-        futil.log(error_msg, adsk.core.LogLevels.ErrorLogLevel)
-        futil.handle_error(f'{mode} Failed')
-
-
-def get_point_from_selection(entity) -> adsk.core.Point3D:
-    """Extract Point3D from various selection types."""
-    if hasattr(entity, 'geometry'):
-        geom = entity.geometry
-        if isinstance(geom, adsk.core.Point3D):
-            return geom.copy()
-    if hasattr(entity, 'worldGeometry'):
-        return entity.worldGeometry.copy()
-    if isinstance(entity, adsk.fusion.BRepVertex):
-        return entity.geometry.copy()
-    if isinstance(entity, adsk.fusion.SketchPoint):
-        return entity.geometry.copy()
-
-    raise ValueError(f'Cannot extract point from {type(entity)}')
-
-
-def get_axis_info(start_point: adsk.core.Point3D, end_point: adsk.core.Point3D):
-    """Calculate axis alignment and return base plane info."""
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    rootComp = design.rootComponent
+    # Get slicing engine
+    engine = engine_input.selectedItem.name
+
+    # Get contour output
+    output = output_input.selectedItem.name
+
+    # Get streaming option (validated against the output and engine)
+    streaming = inputs.itemById('stream').isVisible and inputs.itemById('stream').value
+
+    # Get split method
+    split_method = split_method_input.selectedItem.name
+
+    # Get export options; files go to a folder chosen now, before anything runs
+    export_format = export_format_input.selectedItem.name
+    export_layout = export_layout_input.selectedItem.name
+    export_folder = None
+    if mode == MODE_EXPORT_FILES:
+        folder_dialog = ui.createFolderDialog()
+        folder_dialog.title = 'Export Contour Slices To'
+        if folder_dialog.showDialog() != adsk.core.DialogResults.DialogOK:
+            return
+        export_folder = folder_dialog.folder
+    analysis_path = None
+    if mode == MODE_ANALYZE_SECTIONS:
+        file_dialog = ui.createFileDialog()
+        file_dialog.title = 'Save Section Analysis As'
+        file_dialog.filter = 'CSV Files (*.csv)'
+        file_dialog.initialFilename = f'{app.activeProduct.rootComponent.name}_sections.csv'
+        if file_dialog.showSave() != adsk.core.DialogResults.DialogOK:
+            return
+        analysis_path = file_dialog.filename
+
+    # Preview graphics are not part of the result
+    preview.clear_graphics()
+
+    # Execute based on mode; the run's log output is buffered and written once with a summary
+    profile_metadata = {
+        'mode': mode,
+        'bodies': len(bodies),
+        'faces': sum(body.faces.count for body in bodies if not mesh_slicing.is_mesh_body(body)),
+        'meshes': sum(1 for body in bodies if mesh_slicing.is_mesh_body(body)),
+        'divisions': divisions,
+        'spacing': spacing_input.selectedItem.name,
+        'simplify_tolerance': simplify_tolerance,
+        'engine': engine,
+        'output': output,
+        'streaming': streaming,
+        'split_method': split_method,
+        'export_format': export_format,
+        'export_layout': export_layout,
+    }
+    # A run still going in the background is cancelled before the new one starts logging
+    if scheduler.ChunkedRun.active:
+        scheduler.ChunkedRun.active.cancel()
     
-    # Calculate direction vector
-    direction = start_point.vectorTo(end_point)
-    total_distance = direction.length
-    direction.normalize()
-    
-    # Determine which axis we're aligned with
-    xAxis = adsk.core.Vector3D.create(1, 0, 0)
-    yAxis = adsk.core.Vector3D.create(0, 1, 0)
-    zAxis = adsk.core.Vector3D.create(0, 0, 1)
-    
-    dotX = abs(direction.dotProduct(xAxis))
-    dotY = abs(direction.dotProduct(yAxis))
-    dotZ = abs(direction.dotProduct(zAxis))
-    
-    # Determine base plane
-    basePlane = None
-    axisName = None
-    
-    if dotX > 0.999:
-        basePlane = rootComp.yZConstructionPlane
-        axisName = 'X'
-        start_coord = start_point.x
-        end_coord = end_point.x
-    elif dotY > 0.999:
-        basePlane = rootComp.xZConstructionPlane
-        axisName = 'Y'
-        start_coord = start_point.y
-        end_coord = end_point.y
-    elif dotZ > 0.999:
-        basePlane = rootComp.xYConstructionPlane
-        axisName = 'Z'
-        start_coord = start_point.z
-        end_coord = end_point.z
+    futil.begin_run(mode)
+    futil.begin_profile(mode, **profile_metadata)
+    if not config.PROFILE_REPORT_FOLDER:
+        # Per-slice timings only end up in the CSV report
+        futil.record_slices(False)
+    
+    def finish_run():
+        futil.log(f'=== {mode} Finished ===')
+        futil.end_profile(config.PROFILE_REPORT_FOLDER)
+        futil.end_run()
+    
+    futil.log(f'=== Starting {mode} ===')
+    futil.log(f'Bodies: {len(bodies)}')
+    futil.log(f'Start point: {start_point.asArray()}')
+    futil.log(f'End point: {end_point.asArray()}')
+    futil.log(f'Divisions: {divisions}')
+    if adaptive:
+        futil.log(f'Adaptive spacing: deviation {adaptive.max_deviation}, spacing {adaptive.min_spacing} to {adaptive.max_spacing}')
+    futil.log(f'Simplify tolerance: {simplify_tolerance}')
+    futil.log(f'Delete bodies: {delete_bodies}')
+    futil.log(f'Engine: {engine}')
+    futil.log(f'Output: {output}')
+    futil.log(f'Streaming: {streaming}')
+    futil.log(f'Split method: {split_method}')
+    futil.log(f'Export: {export_format}, {export_layout} → {export_folder}')
+    futil.log(f'Analysis: {analysis_path}')
+    
+    # What closing each step generator leaves behind in direct designs (parametric designs roll back the timeline)
+    cancel_note = 'Sketches created so far were deleted.'
+    if mode == MODE_CONTOUR_CURVES and output == OUTPUT_LIVE_FEATURE:
+        steps = live_contour_steps(bodies, start_point_input.selection(0).entity, end_point_input.selection(0).entity, divisions,
+                                   simplify_tolerance)
+    elif mode == MODE_CONTOUR_CURVES:
+        steps = contour_curve_steps(bodies, start_point, end_point, divisions, delete_bodies, engine, adaptive, simplify_tolerance,
+                                    output, streaming)
+    elif mode == MODE_EXPORT_FILES:
+        steps = export_slice_steps(bodies, start_point, end_point, divisions, export_folder, export_format, export_layout, adaptive,
+                                   simplify_tolerance, streaming)
+        cancel_note = 'Files written so far were deleted.'
+    elif mode == MODE_ANALYZE_SECTIONS:
+        steps = analyze_section_steps(bodies, start_point, end_point, divisions, analysis_path, adaptive, streaming)
+        cancel_note = 'The partial table was deleted.'
     else:
-        return None, None, None, None, None
+        steps = split_body_steps(bodies, start_point, end_point, divisions, split_method, adaptive)
+        cancel_note = 'Splits completed so far were kept.'
+    
+    # Small runs finish inside this handler; longer ones continue in cancellable chunks
+    scheduler.ChunkedRun(steps, mode, on_finish=finish_run, cancel_note=cancel_note).start()
+
+
+def get_adaptive_spacing(inputs: adsk.core.CommandInputs):
+    """Adaptive spacing from the command inputs, or None for uniform spacing."""
+    spacing_input: adsk.core.DropDownCommandInput = inputs.itemById('spacing')
+    if spacing_input.selectedItem.name != spacing.SPACING_ADAPTIVE:
+        return None
+    return spacing.AdaptiveSpacing(inputs.itemById('max_deviation').value,
+                                   inputs.itemById('min_spacing').value,
+                                   inputs.itemById('max_spacing').value)
+
+
+def get_simplify_tolerance(inputs: adsk.core.CommandInputs):
+    """Simplification tolerance from the command inputs, or None when output is not simplified."""
+    simplify_input: adsk.core.BoolValueCommandInput = inputs.itemById('simplify')
+    if not simplify_input.isVisible or not simplify_input.value:
+        return None
+    return inputs.itemById('simplify_tolerance').value
+
+
+def get_base_plane(axis: slicing.SliceAxis):
+    """Construction plane through the origin normal to the slice axis; slice planes are offsets of it.
+
+    The coordinate axes use the origin planes of the root component. Other
+    directions get a plane of their own, which parametric designs only accept
+    inside a base feature. Returns (plane, helpers to delete with the slice
+    planes).
+    """
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    rootComp = design.rootComponent
+    if axis.name == 'X':
+        return rootComp.yZConstructionPlane, []
+    if axis.name == 'Y':
+        return rootComp.xZConstructionPlane, []
+    if axis.name == 'Z':
+        return rootComp.xYConstructionPlane, []
     
-    return basePlane, axisName, start_coord, end_coord, direction
+    planes = rootComp.constructionPlanes
+    planeInput = planes.createInput()
+    baseFeature = None
+    if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        baseFeature = rootComp.features.baseFeatures.add()
+        baseFeature.name = 'Contour Direction'
+        baseFeature.startEdit()
+        planeInput.targetBaseOrFormFeature = baseFeature
+    planeInput.setByPlane(axis.plane(0.0))
+    plane = planes.add(planeInput)
+    plane.name = 'Contour Direction'
+    if baseFeature:
+        baseFeature.finishEdit()
+        return plane, [baseFeature]
+    return plane, [plane]
+
+
+def slice_positions(bodies, axis: slicing.SliceAxis, start_coord: float, end_coord: float, divisions: int,
+                    adaptive: spacing.AdaptiveSpacing = None) -> list:
+    """Slice positions from start to end: uniform by divisions, or adaptive."""
+    if not adaptive:
+        return spacing.uniform_positions(start_coord, end_coord, divisions)
+    with futil.phase('adaptive spacing'):
+        positions = adaptive.positions(bodies, axis, start_coord, end_coord)
+    futil.add_profile_metadata(adaptive_positions=len(positions))
+    return positions
+
+
+def begin_slice_run(streaming: bool = False):
+    """Start a run on the slice cache, streaming when the user asked for it.
+
+    A streaming run keeps its working set flat for thousands of slices: new
+    intersections are released once their slice is written instead of
+    filling the slice cache, the disk cache flushes in small batches and
+    the profile keeps phase totals only. The plane, intersection,
+    post-processing and output stages already hand slices on one at a time
+    with bounded queues (workers.MAX_PENDING, SketchWriter batches,
+    MeshSections batches); what still grows is a number per position.
+    """
+    slice_cache.begin_run(streaming)
+    if streaming:
+        futil.record_slices(False)
+        futil.log('Streaming slices (intersections are not cached, no per-slice profile)')
+
+
+def simplify_section(polylines: list, section: list, simplify_tolerance: float) -> tuple:
+    """Fitted loops of stroked BRep edges and of a mesh section. Pure Python, so it can run on the post-processing worker."""
+    return loops.polylines_to_loops(polylines, simplify_tolerance), mesh_slicing.to_loops(section, simplify_tolerance)
+
+
+def log_unique_bodies(bodies):
+    """Log how many distinct native bodies the slice cache intersects for the selection."""
+    breps = mesh_slicing.partition_bodies(bodies)[0]
+    unique = slice_cache.unique_bodies(breps)
+    futil.add_profile_metadata(unique_bodies=unique)
+    if unique < len(breps):
+        futil.log(f'Occurrences: {len(breps)} bodies share {unique} native bodies; intersections are reused in local frames')
+
+
+def group_timeline(design: adsk.fusion.Design, marker: int, count: int, name: str):
+    """Collapse the entries added since the timeline had count entries into one named group (two entries or more).
+
+    New features are inserted at the marker, which is not necessarily the
+    end of the timeline, so the group starts at the marker recorded before
+    the run.
+    """
+    timeline = design.timeline
+    added = timeline.count - count
+    if added < 2:
+        return
+    try:
+        group = timeline.timelineGroups.add(marker, marker + added - 1)
+        group.name = name
+        group.isCollapsed = True
+        futil.log(f'Timeline: {added} entries grouped as "{name}"')
+    except Exception as e:
+        futil.warning('Could not group the timeline entries: %s', e)
+
+
+def create_contour_curves(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int, delete_bodies: bool,
+                          engine: str = slicing.ENGINE_TEMPORARY_BREP, adaptive: spacing.AdaptiveSpacing = None,
+                          simplify_tolerance: float = None, output: str = OUTPUT_SKETCH_PER_SECTION, streaming: bool = False):
+    """Create contour curves in one go."""
+    scheduler.run_to_completion(contour_curve_steps(bodies, start_point, end_point, divisions, delete_bodies, engine, adaptive,
+                                                    simplify_tolerance, output, streaming))
+
+
+def contour_curve_steps(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int, delete_bodies: bool,
+                        engine: str = slicing.ENGINE_TEMPORARY_BREP, adaptive: spacing.AdaptiveSpacing = None,
+                        simplify_tolerance: float = None, output: str = OUTPUT_SKETCH_PER_SECTION, streaming: bool = False):
+    """Create contour curves - Step by step implementation.
 
+    With the Temporary BRep engine the plane/body intersections are computed
+    transiently and a construction plane and sketch are only created for
+    positions that actually cut a body. The Construction Planes engine is the
+    original projectCutEdges path, kept as a fallback for comparison. With
+    adaptive spacing the positions follow the section changes and divisions
+    is ignored. With a simplify tolerance the Temporary BRep output is
+    chained into loops, simplified and fitted with lines and arcs before it
+    is written. Mesh bodies are always sliced by the mesh engine, whichever
+    engine is selected for the other bodies. With Single Sketch output (Temporary
+    BRep engine) every section goes into one 'Contours' sketch on the base
+    plane, no plane or sketch is created per position, and in parametric
+    designs the timeline entries left by the run are collapsed into a group.
+    Streaming runs (see begin_slice_run) are meant for Single Sketch output,
+    so that no plane or sketch is kept per position.
 
-def create_contour_curves(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int, delete_bodies: bool):
-    """Create contour curves - Step by step implementation."""
+    Yields (positions done, positions total) before each position. Closing
+    the generator deletes the sketches and planes created so far.
+    """
+    started = time.perf_counter()
     design = adsk.fusion.Design.cast(app.activeProduct)
     rootComp = design.rootComponent
     activeComp = design.activeComponent
     
     futil.log(f'Active component: {activeComp.name}')
     
-    # Get axis info (uses rootComp for base planes - world coordinates)
-    basePlane, axisName, start_coord, end_coord, direction = get_axis_info(start_point, end_point)
+    # Slice axis and positions along it (world coordinates)
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
     
-    if not basePlane:
-        msg = 'Direction must be aligned with X, Y, or Z axis.\n\nPlease select start/end points that are aligned with one of the coordinate axes.'
-        ui.messageBox(msg)
+    if not axis:
+        ui.messageBox('Start and end points must be different.')
         return
     
     futil.log(f'=== Step 1: Create Sketches ===')
-    futil.log(f'Axis: {axisName}')
+    futil.log(f'Axis: {axis}')
     futil.log(f'Range: {start_coord:.4f} to {end_coord:.4f}')
+    futil.log(f'Engine: {engine}')
+    
+    # Calculate positions
+    begin_slice_run(streaming)
+    positions = slice_positions(bodies, axis, start_coord, end_coord, divisions, adaptive)
+    divisions = len(positions) - 1
     futil.log(f'Divisions: {divisions} → {divisions + 1} sketches')
     
-    # Calculate interval
-    axis_interval = (end_coord - start_coord) / divisions
-    futil.log(f'Interval: {axis_interval:.4f}')
+    # Index body extents once so each position only sees bodies that span it
+    body_index = BodyIntervalIndex(bodies, axis)
+    skipped_positions = 0
+    edges_before_simplify = 0
+    
+    # Mesh bodies are sliced from their triangles, a batch of positions at a time
+    mesh_bodies = mesh_slicing.partition_bodies(bodies)[1]
+    mesh_sections = mesh_slicing.MeshSections(mesh_bodies, axis, positions) if mesh_bodies else None
+    if mesh_bodies:
+        futil.log(f'Mesh bodies: {len(mesh_bodies)} ({sum(slicer.triangle_count for slicer in mesh_sections.slicers)} triangles)')
+    if engine == slicing.ENGINE_TEMPORARY_BREP:
+        log_unique_bodies(bodies)
+    if simplify_tolerance and engine != slicing.ENGINE_TEMPORARY_BREP:
+        futil.log('Simplify Output only applies to the Temporary BRep engine')
+    single_sketch = output == OUTPUT_SINGLE_SKETCH and engine == slicing.ENGINE_TEMPORARY_BREP
+    if output == OUTPUT_SINGLE_SKETCH and not single_sketch:
+        futil.log('Single Sketch output only applies to the Temporary BRep engine')
+    isParametric = design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+    timeline_count = design.timeline.count if isParametric else 0
+    timeline_marker = design.timeline.markerPosition if isParametric else 0
     
     # Use rootComp for construction planes (world coordinates)
     # But create sketches in activeComp
     rootPlanes = rootComp.constructionPlanes
+    basePlane, base_helpers = get_base_plane(axis)
     sketches_created = []
     planes_created = []
+    sections_written = 0
+    output_sketch = None
     
-    # Create sketch at each division point (including start and end)
-    # 5 divisions = 6 sketches (positions 0, 1, 2, 3, 4, 5)
-    for i in range(divisions + 1):
-        plane_position = start_coord + (axis_interval * i)
-        
-        futil.log(f'Creating sketch {i + 1}/{divisions + 1} at {axisName}={plane_position:.4f}')
-        
+    # Sketches stay compute-deferred until every curve has been written
+    writer = SketchWriter()
+    
+    # Simplified sections are chained and fitted on a worker thread while the next positions are intersected
+    post = workers.PostProcessor() if simplify_tolerance and engine == slicing.ENGINE_TEMPORARY_BREP else None
+    
+    def write_section(i: int, plane_position: float, candidates: list, wire_bodies: list, slice_loops: list, mesh_loops: list):
+        """Steps 1 and 2 of one position: create its sketch (and plane) and add the section curves."""
+        nonlocal output_sketch, sections_written
         try:
-            # Step 1a: Create construction plane in rootComp (world coordinates)
-            planeInput = rootPlanes.createInput()
-            offsetValue = adsk.core.ValueInput.createByReal(plane_position)
-            planeInput.setByOffset(basePlane, offsetValue)
-            tempPlane = rootPlanes.add(planeInput)
-            tempPlane.name = f'Contour Plane {i + 1}'
-            planes_created.append(tempPlane)
-            futil.log(f'  ✓ Created plane at world {axisName}={plane_position:.4f}')
-            
-            # Step 1b: Create sketch on this plane in activeComp
-            sketch = activeComp.sketches.add(tempPlane)
-            sketch.name = f'Contour {i + 1}'
-            futil.log(f'  ✓ Created sketch: {sketch.name}')
+            if single_sketch:
+                # Step 1: Every section goes into the one output sketch, created on the base plane when first needed
+                if output_sketch is None:
+                    with futil.phase('sketch creation', i):
+                        output_sketch = writer.open(activeComp.sketches.add(basePlane))
+                        output_sketch.name = 'Contours'
+                    sketches_created.append(output_sketch)
+                    futil.count('sketches')
+                sketch = output_sketch
+            else:
+                # Step 1a: Create construction plane in rootComp (world coordinates)
+                with futil.phase('plane creation', i):
+                    planeInput = rootPlanes.createInput()
+                    offsetValue = adsk.core.ValueInput.createByReal(plane_position)
+                    planeInput.setByOffset(basePlane, offsetValue)
+                    tempPlane = rootPlanes.add(planeInput)
+                    tempPlane.name = f'Contour Plane {i + 1}'
+                planes_created.append(tempPlane)
+                futil.count('planes')
+                futil.debug('  ✓ Created plane at world %s=%.4f', axis, plane_position)
+                
+                # Step 1b: Create sketch on this plane in activeComp
+                with futil.phase('sketch creation', i):
+                    sketch = writer.open(activeComp.sketches.add(tempPlane))
+                    sketch.name = f'Contour {i + 1}'
+                futil.count('sketches')
+                futil.debug('  ✓ Created sketch: %s', sketch.name)
             
             # Step 2: Add intersection curves to sketch
             curves_added = 0
-            for body in bodies:
-                try:
-                    # projectCutEdges creates curves where the body intersects the sketch plane
-                    result = sketch.projectCutEdges(body)
-                    if result:
-                        curves_added += result.count
-                        futil.log(f'  ✓ projectCutEdges: {result.count} curves from body')
-                except Exception as e:
-                    futil.log(f'  ✗ projectCutEdges error: {str(e)}')
+            if slice_loops is not None:
+                # Chained, simplified and fitted on the worker; queued like any other curves
+                curves_added = writer.add_loops(sketch, slice_loops)
+            elif engine == slicing.ENGINE_TEMPORARY_BREP:
+                # Queued and written in bulk by the writer
+                curves_added = writer.add(sketch, wire_bodies)
+                futil.count('intersections', len(wire_bodies))
+            else:
+                for body in candidates:
+                    try:
+                        # projectCutEdges creates curves where the body intersects the sketch plane
+                        with futil.phase('projectCutEdges', i):
+                            result = sketch.projectCutEdges(body)
+                        if result:
+                            curves_added += result.count
+                            futil.count('intersections')
+                    except Exception as e:
+                        futil.warning('  ✗ projectCutEdges error: %s', e)
+            
+            if mesh_loops:
+                curves_added += writer.add_loops(sketch, mesh_loops)
+                futil.count('mesh sections')
             
             if curves_added > 0:
-                sketches_created.append(sketch)
-                futil.log(f'  ✓ Total curves in sketch: {curves_added}')
-            else:
+                sections_written += 1
+                if not single_sketch:
+                    sketches_created.append(sketch)
+                futil.count('curves', curves_added)
+                futil.debug('  ✓ Total curves in sketch: %d', curves_added)
+            elif not single_sketch:
                 # No curves - delete empty sketch
-                sketch.deleteMe()
-                futil.log(f'  - No intersection, deleted empty sketch')
+                writer.discard(sketch)
+                with futil.phase('empty sketch deletion', i):
+                    sketch.deleteMe()
+                futil.count('empty sketches deleted')
+                futil.debug('  - No intersection, deleted empty sketch')
             
         except Exception as e:
-            futil.log(f'  ✗ Error: {str(e)}')
+            futil.warning('  ✗ Error: %s', e)
     
-    # Clean up construction planes (keep sketches)
-    futil.log('Cleaning up construction planes...')
-    for plane in planes_created:
-        try:
-            plane.deleteMe()
-        except:
-            pass
+    def write_ready():
+        """Write the sections the worker has finished, in position order."""
+        for (index, position), future in post.ready():
+            try:
+                slice_loops, mesh_loops = future.result()
+            except Exception as e:
+                futil.warning('  ✗ Error: %s', e)
+                continue
+            write_section(index, position, [], [], slice_loops, mesh_loops)
     
-    # Delete original bodies if requested
-    if delete_bodies and len(sketches_created) > 0:
-        futil.log('Deleting original bodies...')
-        for body in bodies:
+    # Create sketch at each division point (including start and end)
+    # 5 divisions = 6 sketches (positions 0, 1, 2, 3, 4, 5)
+    try:
+        for i, plane_position in enumerate(positions):
+            yield i, divisions + 1
+            
+            if post:
+                # Write what the worker has finished; wait for the oldest section while too many are queued
+                write_ready()
+                while post.full():
+                    yield scheduler.Wait(post.head())
+                    write_ready()
+            
+            futil.debug('Creating sketch %d/%d at %s=%.4f', i + 1, divisions + 1, axis, plane_position)
+            
+            candidates = body_index.query(plane_position)
+            if not candidates:
+                skipped_positions += 1
+                futil.debug('  - No body spans this position, skipped')
+                continue
+            
+            candidates, mesh_candidates = mesh_slicing.partition_bodies(candidates)
+            
+            try:
+                # Step 0: Intersect transiently first so empty positions never reach the timeline
+                wire_bodies = []
+                polylines = []
+                section = mesh_sections.section(i) if mesh_candidates else []
+                if engine == slicing.ENGINE_TEMPORARY_BREP or not candidates:
+                    # Unchanged bodies reuse the intersections of previous runs
+                    with futil.phase('planeIntersection', i):
+                        if simplify_tolerance:
+                            # Simplified output only needs stroked edges, which the disk cache keeps between sessions
+                            polylines = slice_cache.polylines(candidates, axis, plane_position, simplify_tolerance / 4)
+                        else:
+                            wire_bodies = slice_cache.intersect(candidates, axis, plane_position)
+                    if not wire_bodies and not polylines and not section:
+                        futil.count('empty positions')
+                        futil.debug('  - No intersection, skipped')
+                        continue
+                
+                mesh_edges = sum(len(points) - (0 if closed else 1) for points, closed in section) if simplify_tolerance else 0
+                edges_before_simplify += len(polylines) + mesh_edges
+                if post:
+                    # Chain edge fragments into loops and simplify them on the worker; written once they come back
+                    futil.count('edges before simplify', len(polylines))
+                    post.submit((i, plane_position), simplify_section, polylines, section, simplify_tolerance)
+                    continue
+                mesh_loops = mesh_slicing.to_loops(section, simplify_tolerance)
+            except Exception as e:
+                futil.warning('  ✗ Error: %s', e)
+                continue
+            
+            write_section(i, plane_position, candidates, wire_bodies, None, mesh_loops)
+        
+        # Sections still on the worker
+        while post and post.pending:
+            yield scheduler.Wait(post.head())
+            write_ready()
+    except GeneratorExit:
+        # Cancelled: remove what this run has created so far
+        futil.log(f'Removing {len(sketches_created)} sketches and {len(planes_created)} planes...')
+        for sketch in sketches_created:
+            writer.discard(sketch)
+            try:
+                sketch.deleteMe()
+            except:
+                pass
+        for plane in planes_created + base_helpers:
+            try:
+                plane.deleteMe()
+            except:
+                pass
+        raise
+    finally:
+        if post:
+            post.close()
+    
+    # Write queued curves and compute each sketch once
+    with futil.phase('sketch write'):
+        writer.close()
+    
+    if engine == slicing.ENGINE_TEMPORARY_BREP:
+        slice_cache.end_run()
+    
+    # Clean up construction planes (keep sketches); the output sketch keeps the base plane it sits on
+    if output_sketch is None:
+        planes_created += base_helpers
+    futil.log('Cleaning up construction planes...')
+    with futil.phase('plane cleanup'):
+        for plane in planes_created:
             try:
-                body.deleteMe()
+                plane.deleteMe()
             except:
                 pass
     
+    # One collapsed timeline group for everything the run left behind
+    if output == OUTPUT_SINGLE_SKETCH and isParametric:
+        group_timeline(design, timeline_marker, timeline_count, 'Contours')
+    
+    # Delete original bodies if requested
+    if delete_bodies and sections_written > 0:
+        futil.log('Deleting original bodies...')
+        with futil.phase('body deletion'):
+            for body in bodies:
+                try:
+                    body.deleteMe()
+                except:
+                    pass
+    
     # Show result
     msg = f'✓ Contour curves created!\n\n'
     msg += f'• {divisions + 1} sections processed\n'
-    msg += f'• {len(sketches_created)} sketches with curves\n'
+    if output_sketch:
+        msg += f'• {sections_written} sections in sketch "{output_sketch.name}"\n'
+    else:
+        msg += f'• {len(sketches_created)} sketches with curves\n'
+    if skipped_positions > 0:
+        msg += f'• {skipped_positions} positions skipped (outside all bodies)\n'
+    if edges_before_simplify > 0:
+        msg += f'• Simplified {edges_before_simplify} edges → {writer.curves_written} curves\n'
     msg += f'• Construction planes cleaned up'
-    if delete_bodies and len(sketches_created) > 0:
+    if delete_bodies and sections_written > 0:
         msg += f'\n• Original bodies deleted'
+    msg += f'\n• Engine: {engine} ({time.perf_counter() - started:.2f} s)'
     
     futil.log(msg)
     ui.messageBox(msg)
 
 
-def copy_curve_to_output_sketch(sourceCurve, outputSketch: adsk.fusion.Sketch, sourceSketch: adsk.fusion.Sketch):
-    """Copy a curve from source sketch to output sketch, preserving 3D position."""
+def live_contour_steps(bodies, start_entity, end_entity, divisions: int, simplify_tolerance: float = None):
+    """Create the contour as a Live Contour custom feature that follows its bodies.
+
+    The curves go into one sketch like Single Sketch output, always with
+    uniform spacing and the Temporary BRep engine. The feature keeps the
+    bodies, the two points and the number of divisions; when any of them
+    changes, Fusion recomputes it and only the slices whose plane or bodies
+    changed are written again (see live.update_steps). Yields (positions
+    done, positions total). Closing the generator deletes the sketch.
+    """
+    started = time.perf_counter()
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    if design.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+        ui.messageBox('Live Feature output needs a parametric design.\n\nTurn on Capture Design History, or use Single Sketch output.')
+        return
+    if not command.live_definition:
+        ui.messageBox('The Live Contour feature is not available in this version of Fusion.')
+        return
+    
+    axis = slicing.SliceAxis.between(slicing.get_point_from_selection(start_entity), slicing.get_point_from_selection(end_entity))[0]
+    if not axis:
+        ui.messageBox('Start and end points must be different.')
+        return
+    
+    futil.log(f'Live contour along {axis}: {divisions + 1} positions, other spacing and engine options do not apply')
+    basePlane, base_helpers = get_base_plane(axis)
+    _, _, written = yield from live.create_steps(command.live_definition, bodies, start_entity, end_entity, divisions,
+                                                 simplify_tolerance, basePlane, base_helpers)
+    
+    msg = f'✓ Live contour created!\n\n'
+    msg += f'• {written} sections written\n'
+    msg += f'• Edit Divisions in Change Parameters or move the bodies and points; only changed sections are rewritten\n'
+    msg += f'• {time.perf_counter() - started:.2f} s'
+    
+    futil.log(msg)
+    ui.messageBox(msg)
+
+
+def export_slice_steps(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int, folder: str,
+                       file_format: str = export.FORMAT_DXF, layout: str = export.LAYOUT_LAYERED,
+                       adaptive: spacing.AdaptiveSpacing = None, simplify_tolerance: float = None, streaming: bool = False):
+    """Export the contour slices to DXF or SVG files without creating sketches.
+
+    Intersections are computed transiently (and shared with the slice cache)
+    and written to the files slice by slice; mesh bodies are sliced by the
+    mesh engine. Yields (positions done,
+    positions total) before each position. Closing the generator deletes
+    the files written so far.
+    """
+    started = time.perf_counter()
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
+    
+    if not axis:
+        ui.messageBox('Start and end points must be different.')
+        return
+    
+    begin_slice_run(streaming)
+    positions = slice_positions(bodies, axis, start_coord, end_coord, divisions, adaptive)
+    divisions = len(positions) - 1
+    body_index = BodyIntervalIndex(bodies, axis)
+    
+    # Shared extents of all slice planes, so every file lines up with the others
+    bounds = axis.plane_bounds(bodies)
+    
+    exporter = export.SliceExporter(folder, design.rootComponent.name, file_format, layout, axis, bounds, simplify_tolerance)
+    mesh_bodies = mesh_slicing.partition_bodies(bodies)[1]
+    mesh_sections = mesh_slicing.MeshSections(mesh_bodies, axis, positions) if mesh_bodies else None
+    log_unique_bodies(bodies)
+    futil.log(f'Exporting {divisions + 1} slices along {axis} as {file_format} ({layout}) to {folder}')
+    
+    # Simplifying, flattening and writing run on a worker thread while the next positions are intersected
+    post = workers.PostProcessor()
+    
+    def count_written():
+        """Count the slices the worker has written."""
+        for index, future in post.ready():
+            written = future.result()
+            futil.count('slices exported')
+            futil.count('polylines', written)
+            futil.debug('  ✓ Slice %d: %d polylines', index + 1, written)
+    
+    try:
+        for i, plane_position in enumerate(positions):
+            yield i, divisions + 1
+            
+            count_written()
+            while post.full():
+                yield scheduler.Wait(post.head())
+                count_written()
+            
+            candidates = body_index.query(plane_position)
+            if not candidates:
+                futil.count('positions skipped')
+                continue
+            candidates, mesh_candidates = mesh_slicing.partition_bodies(candidates)
+            
+            with futil.phase('planeIntersection', i):
+                polylines = slice_cache.polylines(candidates, axis, plane_position, export.EXPORT_TOLERANCE)
+            if mesh_candidates:
+                polylines += mesh_slicing.to_polylines(mesh_sections.section(i))
+            if not polylines:
+                futil.count('empty positions')
+                continue
+            
+            post.submit(i, exporter.write_slice, i, plane_position, polylines)
+        
+        while post.pending:
+            yield scheduler.Wait(post.head())
+            count_written()
+    except:
+        # Cancelled or failed: do not leave partial files behind
+        post.close()
+        exporter.abort()
+        raise
+    
+    post.close()
+    exporter.close()
+    slice_cache.end_run()
+    
+    msg = f'✓ Contour slices exported!\n\n'
+    msg += f'• {exporter.slices_written} of {divisions + 1} sections exported\n'
+    msg += f'• {exporter.polylines_written} polylines in {len(exporter.paths)} {file_format} files\n'
+    if simplify_tolerance:
+        msg += f'• Simplified from {exporter.pieces_before_simplify} edge pieces\n'
+    msg += f'• {folder} ({time.perf_counter() - started:.2f} s)'
+    
+    futil.log(msg)
+    ui.messageBox(msg)
+
+
+def analyze_section_steps(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int, path: str,
+                          adaptive: spacing.AdaptiveSpacing = None, streaming: bool = False):
+    """Measure every section and write a CSV table of its properties without creating sketches.
+
+    Area, perimeter, centroid and bounding box are computed from the stroked
+    section loops (intersections come from the slice cache, mesh bodies from
+    the mesh engine), and the area is integrated along the axis into a
+    volume estimate. Yields (positions done, positions total) before each
+    position. Closing the generator deletes the table.
+    """
+    started = time.perf_counter()
+    
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
+    
+    if not axis:
+        ui.messageBox('Start and end points must be different.')
+        return
+    
+    begin_slice_run(streaming)
+    positions = slice_positions(bodies, axis, start_coord, end_coord, divisions, adaptive)
+    divisions = len(positions) - 1
+    body_index = BodyIntervalIndex(bodies, axis)
+    
+    analyzer = analysis.SectionAnalyzer(path, axis)
+    mesh_bodies = mesh_slicing.partition_bodies(bodies)[1]
+    mesh_sections = mesh_slicing.MeshSections(mesh_bodies, axis, positions) if mesh_bodies else None
+    log_unique_bodies(bodies)
+    futil.log(f'Analyzing {divisions + 1} sections along {axis} to {path}')
+    
+    # Loop assembly, measuring and the table rows run on a worker thread while the next positions are intersected
+    post = workers.PostProcessor()
+    
+    def count_analyzed():
+        """Count the sections the worker has measured."""
+        for index, future in post.ready():
+            properties = future.result()
+            futil.count('sections analyzed')
+            futil.debug('  ✓ Section %d: %d loops, area %.4f', index + 1, properties['loops'], properties['area'])
+    
+    try:
+        for i, plane_position in enumerate(positions):
+            yield i, divisions + 1
+            
+            count_analyzed()
+            while post.full():
+                yield scheduler.Wait(post.head())
+                count_analyzed()
+            
+            # Positions outside all bodies still get a row, so the volume integrates over the whole range
+            polylines = []
+            section = []
+            candidates = body_index.query(plane_position)
+            if candidates:
+                candidates, mesh_candidates = mesh_slicing.partition_bodies(candidates)
+                with futil.phase('planeIntersection', i):
+                    polylines = slice_cache.polylines(candidates, axis, plane_position, analysis.ANALYSIS_TOLERANCE)
+                if mesh_candidates:
+                    section = mesh_sections.section(i)
+            else:
+                futil.count('positions skipped')
+            
+            post.submit(i, analyzer.add_polylines, i, plane_position, polylines, section)
+        
+        while post.pending:
+            yield scheduler.Wait(post.head())
+            count_analyzed()
+    except:
+        # Cancelled or failed: do not leave a partial table behind
+        post.close()
+        analyzer.abort()
+        raise
+    
+    post.close()
+    analyzer.close()
+    slice_cache.end_run()
+    
+    breps = mesh_slicing.partition_bodies(bodies)[0]
+    if breps and not mesh_bodies:
+        futil.log(f'Body volume: {sum(body.volume for body in breps):.4f} cm3, integrated: {analyzer.volume:.4f} cm3')
+    
+    msg = f'✓ Sections analyzed!\n\n'
+    msg += f'• {analyzer.rows_written} sections measured\n'
+    if analyzer.max_area_position is not None:
+        msg += f'• Largest section: {analyzer.max_area:.4f} cm² at {analyzer.max_area_position:.4f} cm\n'
+    msg += f'• Estimated volume: {analyzer.volume:.4f} cm³\n'
+    msg += f'• {path} ({time.perf_counter() - started:.2f} s)'
+    
+    futil.log(msg)
+    ui.messageBox(msg)
+
+
+def copy_curve_to_output_sketch(sourceCurve, outputSketch: adsk.fusion.Sketch, sourceSketch: adsk.fusion.Sketch,
+                                toOutput: list = None, tolerance: float = sampling.DEFAULT_TOLERANCE):
+    """Copy a curve from source sketch to output sketch, preserving 3D position.
+
+    toOutput -- Source-to-output sketch matrix from sampling.sketch_to_sketch_matrix.
+                Pass it when copying many curves between the same two sketches.
+    tolerance -- Chordal tolerance (cm) for curves that are copied as sampled splines.
+    """
+    if toOutput is None:
+        toOutput = sampling.sketch_to_sketch_matrix(sourceSketch, outputSketch)
+    
+    def convert(points):
+        # All points of a curve go through one matrix multiply instead of two API calls each
+        return [adsk.core.Point3D.create(*pt) for pt in sampling.transform_points(toOutput, [(p.x, p.y, p.z) for p in points])]
     
     # Get the 3D geometry of the curve
     if isinstance(sourceCurve, adsk.fusion.SketchLine):
-        # Get 3D points from the sketch line
-        startPt3D = sourceSketch.sketchToModelSpace(sourceCurve.startSketchPoint.geometry)
-        endPt3D = sourceSketch.sketchToModelSpace(sourceCurve.endSketchPoint.geometry)
-        
-        # Convert to output sketch space
-        startPt = outputSketch.modelToSketchSpace(startPt3D)
-        endPt = outputSketch.modelToSketchSpace(endPt3D)
+        startPt, endPt = convert([sourceCurve.startSketchPoint.geometry, sourceCurve.endSketchPoint.geometry])
         
         outputSketch.sketchCurves.sketchLines.addByTwoPoints(startPt, endPt)
         
     elif isinstance(sourceCurve, adsk.fusion.SketchArc):
-        # Get 3D points from the arc
-        startPt3D = sourceSketch.sketchToModelSpace(sourceCurve.startSketchPoint.geometry)
-        endPt3D = sourceSketch.sketchToModelSpace(sourceCurve.endSketchPoint.geometry)
-        
-        # Get midpoint of arc in 3D
+        # Get midpoint of arc
         evaluator = sourceCurve.geometry.evaluator
         _, midParam = evaluator.getParameterAtLength(0, sourceCurve.length / 2)
-        _, midPt3D = evaluator.getPointAtParameter(midParam)
+        _, midPt = evaluator.getPointAtParameter(midParam)
         
-        # Convert to output sketch space
-        startPt = outputSketch.modelToSketchSpace(startPt3D)
-        midPt = outputSketch.modelToSketchSpace(midPt3D)
-        endPt = outputSketch.modelToSketchSpace(endPt3D)
+        startPt, midPt, endPt = convert([sourceCurve.startSketchPoint.geometry, midPt, sourceCurve.endSketchPoint.geometry])
         
         outputSketch.sketchCurves.sketchArcs.addByThreePoints(startPt, midPt, endPt)
         
     elif isinstance(sourceCurve, adsk.fusion.SketchCircle):
-        # Get center in 3D
-        centerPt3D = sourceSketch.sketchToModelSpace(sourceCurve.centerSketchPoint.geometry)
-        centerPt = outputSketch.modelToSketchSpace(centerPt3D)
+        centerPt, = convert([sourceCurve.centerSketchPoint.geometry])
         
         outputSketch.sketchCurves.sketchCircles.addByCenterRadius(centerPt, sourceCurve.radius)
         
     elif isinstance(sourceCurve, adsk.fusion.SketchEllipse):
-        # Get center in 3D
-        centerPt3D = sourceSketch.sketchToModelSpace(sourceCurve.centerSketchPoint.geometry)
-        centerPt = outputSketch.modelToSketchSpace(centerPt3D)
-        
         # Get major axis endpoint for direction
-        majorAxisPt3D = adsk.core.Point3D.create(
-            centerPt3D.x + sourceCurve.majorAxis.x * sourceCurve.majorRadius,
-            centerPt3D.y + sourceCurve.majorAxis.y * sourceCurve.majorRadius,
-            centerPt3D.z + sourceCurve.majorAxis.z * sourceCurve.majorRadius
+        center = sourceCurve.centerSketchPoint.geometry
+        majorAxisPt = adsk.core.Point3D.create(
+            center.x + sourceCurve.majorAxis.x * sourceCurve.majorRadius,
+            center.y + sourceCurve.majorAxis.y * sourceCurve.majorRadius,
+            center.z + sourceCurve.majorAxis.z * sourceCurve.majorRadius
         )
-        majorAxisPt = outputSketch.modelToSketchSpace(majorAxisPt3D)
+        centerPt, majorAxisPt = convert([center, majorAxisPt])
         
         outputSketch.sketchCurves.sketchEllipses.add(centerPt, majorAxisPt, sourceCurve.minorRadius)
         
     elif isinstance(sourceCurve, adsk.fusion.SketchFittedSpline):
-        # Sample points along the spline and create fitted spline
-        points = adsk.core.ObjectCollection.create()
-        
-        # Get fit points in 3D and convert
-        for fitPoint in sourceCurve.fitPoints:
-            pt3D = sourceSketch.sketchToModelSpace(fitPoint.geometry)
-            pt = outputSketch.modelToSketchSpace(pt3D)
-            points.add(pt)
+        # Fit points are converted together
+        fitPoints = [fitPoint.geometry for fitPoint in sourceCurve.fitPoints]
+        points = sampling.to_point_collection(sampling.transform_points(toOutput, [(p.x, p.y, p.z) for p in fitPoints]))
         
         if points.count >= 2:
             outputSketch.sketchCurves.sketchFittedSplines.add(points)
@@ -392,20 +990,10 @@ def copy_curve_to_output_sketch(sourceCurve, outputSketch: adsk.fusion.Sketch, s
     else:
         # For other curve types, sample points and create fitted spline
         try:
-            geom = sourceCurve.geometry
-            evaluator = geom.evaluator
-            _, startParam, endParam = evaluator.getParameterExtents()
-            
-            # Sample points along the curve
-            points = adsk.core.ObjectCollection.create()
-            numSamples = 30
-            
-            for k in range(numSamples + 1):
-                param = startParam + (endParam - startParam) * k / numSamples
-                _, pt3D = evaluator.getPointAtParameter(param)
-                pt3D_world = sourceSketch.sketchToModelSpace(pt3D)
-                pt = outputSketch.modelToSketchSpace(pt3D_world)
-                points.add(pt)
+            # Sample count follows the tolerance: few points on small or flat curves, more on long curvy ones
+            samples = sampling.sample_curve(sourceCurve.geometry, tolerance)
+            points = sampling.to_point_collection(sampling.transform_points(toOutput, samples))
+            futil.count('sampled points', points.count)
             
             if points.count >= 2:
                 outputSketch.sketchCurves.sketchFittedSplines.add(points)
@@ -414,104 +1002,188 @@ def copy_curve_to_output_sketch(sourceCurve, outputSketch: adsk.fusion.Sketch, s
             futil.log(f'    Could not copy curve type {type(sourceCurve)}: {str(e)}')
 
 
-def split_bodies_with_planes(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int):
-    """Split bodies with parallel construction planes between start and end points."""
+def split_bodies_with_planes(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int,
+                             split_method: str = split.SPLIT_METHOD_SINGLE_FEATURE, adaptive: spacing.AdaptiveSpacing = None):
+    """Split bodies with parallel planes in one go."""
+    scheduler.run_to_completion(split_body_steps(bodies, start_point, end_point, divisions, split_method, adaptive))
+
+
+def split_body_steps(bodies, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D, divisions: int,
+                     split_method: str = split.SPLIT_METHOD_SINGLE_FEATURE, adaptive: spacing.AdaptiveSpacing = None):
+    """Split bodies with parallel planes between start and end points.
+
+    Single Feature per Body cuts each body once with a combined multi-sheet
+    tool. Plane by Plane uses construction planes and the bisection scheduler.
+    Yields (steps done, steps total) as the split progresses.
+    """
+    started = time.perf_counter()
     design = adsk.fusion.Design.cast(app.activeProduct)
-    rootComp = design.rootComponent
     
     # Get axis info
-    basePlane, axisName, start_coord, end_coord, direction = get_axis_info(start_point, end_point)
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
     
-    if not basePlane:
-        msg = 'Direction must be aligned with X, Y, or Z axis.\n\nPlease select start/end points that are aligned with one of the coordinate axes.'
-        ui.messageBox(msg)
+    if not axis:
+        ui.messageBox('Start and end points must be different.')
         return
     
-    futil.log(f'Using {axisName}-axis alignment')
+    futil.log(f'Using {axis} axis')
     futil.log(f'Axis range: {start_coord} to {end_coord}')
     
-    # Calculate interval
-    axis_interval = (end_coord - start_coord) / divisions
+    # Split features only take BRep bodies
+    bodies, mesh_bodies = mesh_slicing.partition_bodies(bodies)
+    if mesh_bodies:
+        futil.log(f'Skipping {len(mesh_bodies)} mesh bodies (mesh bodies cannot be split)')
+    if not bodies:
+        ui.messageBox('Mesh bodies cannot be split.\n\nUse Contour Curves or Export Files to slice meshes.')
+        return
     
-    # Create planes in rootComponent
-    planes = rootComp.constructionPlanes
-    planes_created = []
+    # Calculate positions; adaptive spacing probes sections through the slice cache
+    if adaptive:
+        slice_cache.begin_run()
+    positions = slice_positions(bodies, axis, start_coord, end_coord, divisions, adaptive)
+    divisions = len(positions) - 1
+    if adaptive:
+        slice_cache.end_run()
     
-    futil.log(f'Creating {divisions - 1} construction planes')
+    # Index body extents once so planes that miss every body are never created
+    body_index = BodyIntervalIndex(bodies, axis)
     
-    # Create construction planes at intermediate positions
-    for i in range(1, divisions):
-        plane_position = start_coord + (axis_interval * i)
-        
-        try:
-            planeInput = planes.createInput()
-            offsetValue = adsk.core.ValueInput.createByReal(plane_position)
-            planeInput.setByOffset(basePlane, offsetValue)
-            plane = planes.add(planeInput)
-            plane.name = f'Split Plane {i}'
-            planes_created.append(plane)
-            futil.log(f'Created plane {i} at position {plane_position} ({axisName}-axis)')
-        except Exception as e:
-            futil.log(f'Error creating plane {i}: {str(e)}')
+    # Intermediate positions that cut at least one body, sorted along the axis
+    plane_positions = []
+    for i, plane_position in enumerate(positions[1:-1], 1):
+        if body_index.query(plane_position, strict=True):
+            plane_positions.append(plane_position)
+        else:
+            futil.count('planes skipped')
+            futil.debug('Skipped plane %d at position %s (no body spans it)', i, plane_position)
+    plane_positions.sort()
     
-    # Split the bodies with these planes
-    futil.log(f'Starting to split {len(bodies)} bodies with {len(planes_created)} planes')
+    isParametric = design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+    timeline_count = design.timeline.count if isParametric else 0
     
-    # Get the parent component of the first body for split operations
-    firstBody = bodies[0]
-    parentComp = firstBody.parentComponent
-    futil.log(f'Bodies are in component: {parentComp.name}')
+    if split_method == split.SPLIT_METHOD_SINGLE_FEATURE:
+        futil.log(f'Splitting {len(bodies)} bodies with combined tools of up to {len(plane_positions)} sheets')
+        final_body_count, total_splits, failed_splits = yield from split.split_bodies_single_feature_steps(bodies, plane_positions, axis)
+        cleanup_note = '(Split tool bodies removed)'
+    else:
+        final_body_count, total_splits, failed_splits = yield from split_bodies_by_bisection_steps(bodies, axis, plane_positions)
+        cleanup_note = '(Construction planes cleaned up)'
     
-    splitFeatures = parentComp.features.splitBodyFeatures
-    total_splits = 0
+    msg = f'✓ Successfully split bodies!\n\n• {divisions} divisions → {final_body_count} bodies\n• {total_splits} split operations completed'
+    if failed_splits > 0:
+        msg += f'\n• {failed_splits} split operations failed'
+    if isParametric:
+        msg += f'\n• {design.timeline.count - timeline_count} timeline features added'
+    msg += f'\n• {split_method} ({time.perf_counter() - started:.2f} s)'
+    msg += f'\n\n{cleanup_note}'
     
-    # Split each plane with all relevant bodies
-    for planeIndex, plane in enumerate(planes_created):
-        futil.log(f'Splitting with plane {planeIndex + 1}/{len(planes_created)}: {plane.name}')
-        
-        # Get current solid bodies in the parent component
-        current_bodies = []
-        for body in parentComp.bRepBodies:
-            if body.isSolid:
-                current_bodies.append(body)
-        
-        futil.log(f'  Found {len(current_bodies)} solid bodies')
-        
-        # Try to split each body with this plane
-        for body in current_bodies:
-            try:
-                splitInput = splitFeatures.createInput(body, plane, True)
-                splitFeature = splitFeatures.add(splitInput)
-                
-                if splitFeature:
-                    total_splits += 1
-                    futil.log(f'    ✓ Split body successfully')
-                    
-            except Exception as e:
-                futil.log(f'    - Skipped (no intersection)')
+    futil.log(msg)
+    ui.messageBox(msg)
+
+
+def split_bodies_by_bisection_steps(bodies, axis: slicing.SliceAxis, plane_positions: list):
+    """Split bodies with construction planes using the bisection scheduler.
+
+    Yields (split operations done, split operations expected) after every
+    split and returns (fragment count, split operations, failed operations).
+    Closing the generator deletes the planes created so far.
+    """
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    rootComp = design.rootComponent
     
-    # Count final bodies
+    # Create planes in rootComponent, only when the scheduler first needs them
+    planes = rootComp.constructionPlanes
+    basePlane, base_helpers = get_base_plane(axis)
+    
+    @futil.profiled('plane creation')
+    def create_split_plane(index: int):
+        plane_position = plane_positions[index]
+        planeInput = planes.createInput()
+        offsetValue = adsk.core.ValueInput.createByReal(plane_position)
+        planeInput.setByOffset(basePlane, offsetValue)
+        plane = planes.add(planeInput)
+        plane.name = f'Split Plane {index + 1}'
+        futil.count('planes')
+        futil.debug('Created plane %d at position %s (%s axis)', index + 1, plane_position, axis)
+        return plane
+    
+    scheduler = split.SplitScheduler(plane_positions, axis, create_split_plane)
+    bodies = split.unique_native_bodies(bodies)
+    
+    # Split each selected body in its own component; unselected bodies are never touched
+    futil.log(f'Starting to split {len(bodies)} bodies with up to {len(plane_positions)} planes')
     final_body_count = 0
-    for body in parentComp.bRepBodies:
-        if body.isSolid:
-            final_body_count += 1
+    done = 0
+    total = sum(scheduler.count_splits(body) for body in bodies)
+    try:
+        for bodyIndex, body in enumerate(bodies):
+            futil.debug('Splitting body %d/%d: %s', bodyIndex + 1, len(bodies), body.name)
+            steps = scheduler.iter_split(body)
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    fragments = stop.value
+                    break
+                done += 1
+                yield done, max(total, done)
+            final_body_count += len(fragments)
+            futil.debug('  ✓ %d fragments', len(fragments))
+    except GeneratorExit:
+        # Cancelled: the planes are not needed any more
+        for plane in list(scheduler.planes.values()) + base_helpers:
+            try:
+                plane.deleteMe()
+            except:
+                pass
+        raise
     
     # Delete construction planes after split
+    planes_created = list(scheduler.planes.values()) + base_helpers
     futil.log(f'Cleaning up {len(planes_created)} construction planes...')
-    for plane in planes_created:
-        try:
-            plane.deleteMe()
-        except:
-            pass
-    
-    msg = f'✓ Successfully split bodies!\n\n• {divisions} divisions → {final_body_count} bodies\n• {total_splits} split operations completed\n\n(Construction planes cleaned up)'
+    with futil.phase('plane cleanup'):
+        for plane in planes_created:
+            try:
+                plane.deleteMe()
+            except:
+                pass
     
-    futil.log(msg)
-    ui.messageBox(msg)
+    return final_body_count, scheduler.total_splits, scheduler.failed_splits
 
 
 def command_preview(args: adsk.core.CommandEventArgs):
-    pass
+    inputs = args.command.commandInputs
+
+    mode_input: adsk.core.DropDownCommandInput = inputs.itemById('mode')
+    body_select: adsk.core.SelectionCommandInput = inputs.itemById('body_select')
+    start_point_input: adsk.core.SelectionCommandInput = inputs.itemById('start_point')
+    end_point_input: adsk.core.SelectionCommandInput = inputs.itemById('end_point')
+    divisions_input: adsk.core.IntegerSpinnerCommandInput = inputs.itemById('divisions')
+
+    bodies = []
+    for i in range(body_select.selectionCount):
+        bodies.append(body_select.selection(i).entity)
+
+    start_point = slicing.get_point_from_selection(start_point_input.selection(0).entity)
+    end_point = slicing.get_point_from_selection(end_point_input.selection(0).entity)
+    divisions = divisions_input.value
+
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
+    if not axis:
+        preview.clear_graphics()
+        return
+
+    # Same positions the command will use: all sections for contours and export, intermediate planes for split
+    adaptive = get_adaptive_spacing(inputs)
+    if adaptive:
+        # Bodies may have been edited since the last run; drop its fingerprints and frames
+        slice_cache.begin_run()
+    positions = slice_positions(bodies, axis, start_coord, end_coord, divisions, adaptive)
+    if mode_input.selectedItem.name == MODE_SPLIT_BODY:
+        positions = positions[1:-1]
+
+    # Transient custom graphics only - the preview never writes timeline features
+    preview.show_slices(bodies, axis, start_coord, end_coord, positions)
 
 
 def command_input_changed(args: adsk.core.InputChangedEventArgs):
@@ -522,12 +1194,34 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     if changed_input.id == 'mode':
         mode_input: adsk.core.DropDownCommandInput = inputs.itemById('mode')
         delete_bodies_input: adsk.core.BoolValueCommandInput = inputs.itemById('delete_bodies')
+        engine_input: adsk.core.DropDownCommandInput = inputs.itemById('engine')
+        split_method_input: adsk.core.DropDownCommandInput = inputs.itemById('split_method')
+        export_format_input: adsk.core.DropDownCommandInput = inputs.itemById('export_format')
+        export_layout_input: adsk.core.DropDownCommandInput = inputs.itemById('export_layout')
         
-        # Show/hide delete bodies option based on mode
-        if mode_input.selectedItem.name == MODE_CONTOUR_CURVES:
-            delete_bodies_input.isVisible = True
-        else:
-            delete_bodies_input.isVisible = False
+        # Show/hide mode-specific options
+        mode = mode_input.selectedItem.name
+        delete_bodies_input.isVisible = mode == MODE_CONTOUR_CURVES
+        engine_input.isVisible = mode == MODE_CONTOUR_CURVES
+        inputs.itemById('output').isVisible = mode == MODE_CONTOUR_CURVES
+        split_method_input.isVisible = mode == MODE_SPLIT_BODY
+        export_format_input.isVisible = mode == MODE_EXPORT_FILES
+        export_layout_input.isVisible = mode == MODE_EXPORT_FILES
+        inputs.itemById('simplify').isVisible = mode in (MODE_CONTOUR_CURVES, MODE_EXPORT_FILES)
+        inputs.itemById('stream').isVisible = mode != MODE_SPLIT_BODY
+    
+    # The tolerance is only shown while simplification is on
+    if changed_input.id in ('mode', 'simplify'):
+        simplify_input: adsk.core.BoolValueCommandInput = inputs.itemById('simplify')
+        inputs.itemById('simplify_tolerance').isVisible = simplify_input.isVisible and simplify_input.value
+    
+    # Adaptive spacing replaces the number of divisions
+    if changed_input.id == 'spacing':
+        spacing_input: adsk.core.DropDownCommandInput = inputs.itemById('spacing')
+        adaptive = spacing_input.selectedItem.name == spacing.SPACING_ADAPTIVE
+        inputs.itemById('divisions').isVisible = not adaptive
+        for input_id in ('max_deviation', 'min_spacing', 'max_spacing'):
+            inputs.itemById(input_id).isVisible = adaptive
 
 
 def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
@@ -546,8 +1240,21 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
         args.areInputsValid = True
     else:
         args.areInputsValid = False
+    
+    # Streaming contours go into one sketch; a plane and sketch per position (or a live feature) is not bounded
+    stream_input: adsk.core.BoolValueCommandInput = inputs.itemById('stream')
+    if (stream_input.isVisible and stream_input.value and inputs.itemById('mode').selectedItem.name == MODE_CONTOUR_CURVES and
+            (inputs.itemById('output').selectedItem.name != OUTPUT_SINGLE_SKETCH or
+             inputs.itemById('engine').selectedItem.name != slicing.ENGINE_TEMPORARY_BREP)):
+        args.areInputsValid = False
+    
+    # Adaptive spacing needs a positive deviation and a valid spacing range
+    adaptive = get_adaptive_spacing(inputs)
+    if adaptive and not (adaptive.max_deviation > 0 and 0 < adaptive.min_spacing <= inputs.itemById('max_spacing').value):
+        args.areInputsValid = False
 
 
 def command_destroy(args: adsk.core.CommandEventArgs):
     global local_handlers
     local_handlers = []
+    preview.reset()
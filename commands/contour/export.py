@@ -0,0 +1,209 @@
+import os
+import shutil
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+from . import loops
+
+# Export formats
+FORMAT_DXF = 'DXF'
+FORMAT_SVG = 'SVG'
+
+# Export layouts
+LAYOUT_LAYERED = 'Layered File'
+LAYOUT_PER_SLICE = 'One File per Slice'
+
+# Stroke tolerance (cm) for exported profiles
+EXPORT_TOLERANCE = 0.001
+
+# Fusion works in cm, exported files are in mm
+MM_PER_CM = 10.0
+
+# Stroke width (mm) of the SVG profiles
+SVG_STROKE_WIDTH = 0.1
+
+
+def flatten_polylines(polylines: list, axis: slicing.SliceAxis) -> list:
+    """Map 3D polylines to the (u, v) coordinates of their slice plane and convert them to mm."""
+    flat = []
+    for polyline in polylines:
+        flat.append([(u * MM_PER_CM, v * MM_PER_CM) for u, v in map(axis.flatten, polyline)])
+    return flat
+
+
+def is_closed(polyline: list) -> bool:
+    first, last = polyline[0], polyline[-1]
+    return len(polyline) > 2 and abs(first[0] - last[0]) < 1e-6 and abs(first[1] - last[1]) < 1e-6
+
+
+class DxfWriter:
+    """Minimal AutoCAD R12 (AC1009) DXF writer. Every slice is a layer of 2D polylines, in mm.
+
+    R12 has no units header variable. Every layer the entities use has to be
+    in the LAYER table, which comes before them, so entities stream to a
+    side file and are copied behind the header and tables on close.
+    """
+
+    extension = 'dxf'
+
+    def __init__(self, path: str, bounds: tuple):
+        self.path = path
+        self.bounds = bounds
+        self.layers = []
+        self.entities_path = f'{path}.entities'
+        self.file = open(self.entities_path, 'w', encoding='ascii', errors='replace')
+
+    def _write(self, *pairs):
+        self.file.write(''.join(f'{pairs[k]}\n{pairs[k + 1]}\n' for k in range(0, len(pairs), 2)))
+
+    def add_slice(self, name: str, label: str, polylines: list):
+        self.layers.append(name)
+        for polyline in polylines:
+            closed = is_closed(polyline)
+            points = polyline[:-1] if closed else polyline
+            self._write(0, 'POLYLINE', 8, name, 66, 1, 70, 1 if closed else 0, 10, 0.0, 20, 0.0, 30, 0.0)
+            for x, y in points:
+                self._write(0, 'VERTEX', 8, name, 10, f'{x:.6f}', 20, f'{y:.6f}', 30, 0.0)
+            self._write(0, 'SEQEND', 8, name)
+
+    def close(self):
+        self.file.close()
+        self.file = open(self.path, 'w', encoding='ascii', errors='replace')
+        try:
+            min_x, min_y, max_x, max_y = self.bounds
+            self._write(0, 'SECTION', 2, 'HEADER', 9, '$ACADVER', 1, 'AC1009',
+                        9, '$EXTMIN', 10, f'{min_x:.6f}', 20, f'{min_y:.6f}', 30, 0.0,
+                        9, '$EXTMAX', 10, f'{max_x:.6f}', 20, f'{max_y:.6f}', 30, 0.0, 0, 'ENDSEC')
+            self._write(0, 'SECTION', 2, 'TABLES',
+                        0, 'TABLE', 2, 'LTYPE', 70, 1,
+                        0, 'LTYPE', 2, 'CONTINUOUS', 70, 0, 3, 'Solid line', 72, 65, 73, 0, 40, 0.0,
+                        0, 'ENDTAB', 0, 'TABLE', 2, 'LAYER', 70, len(self.layers) + 1)
+            for name in ['0'] + self.layers:
+                self._write(0, 'LAYER', 2, name, 70, 0, 62, 7, 6, 'CONTINUOUS')
+            self._write(0, 'ENDTAB', 0, 'ENDSEC', 0, 'SECTION', 2, 'ENTITIES')
+            with open(self.entities_path, 'r', encoding='ascii') as entities:
+                shutil.copyfileobj(entities, self.file)
+            self._write(0, 'ENDSEC', 0, 'EOF')
+        finally:
+            self.file.close()
+            os.remove(self.entities_path)
+
+
+class SvgWriter:
+    """SVG writer in mm. Every slice is an Inkscape layer; Y points up as in the design."""
+
+    extension = 'svg'
+
+    def __init__(self, path: str, bounds: tuple):
+        self.path = path
+        self.min_x, self.min_y, max_x, self.max_y = bounds
+        width = max_x - self.min_x
+        height = self.max_y - self.min_y
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        f'<svg xmlns="http://www.w3.org/2000/svg" '
+                        f'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+                        f'width="{width:.4f}mm" height="{height:.4f}mm" viewBox="0 0 {width:.4f} {height:.4f}">\n')
+
+    def add_slice(self, name: str, label: str, polylines: list):
+        self.file.write(f'<g id="{name}" inkscape:groupmode="layer" inkscape:label="{label}" '
+                        f'fill="none" stroke="black" stroke-width="{SVG_STROKE_WIDTH}">\n')
+        for polyline in polylines:
+            closed = is_closed(polyline)
+            points = polyline[:-1] if closed else polyline
+            coords = ' '.join(f'{x - self.min_x:.4f},{self.max_y - y:.4f}' for x, y in points)
+            self.file.write(f'<{"polygon" if closed else "polyline"} points="{coords}"/>\n')
+        self.file.write('</g>\n')
+
+    def close(self):
+        self.file.write('</svg>\n')
+        self.file.close()
+
+
+WRITERS = {
+    FORMAT_DXF: DxfWriter,
+    FORMAT_SVG: SvgWriter,
+}
+
+
+class SliceExporter:
+    """Stream slice profiles to DXF or SVG files without creating sketches.
+
+    Each slice is stroked, flattened to its plane and written as soon as it
+    is computed, so memory use does not grow with the number of slices. The
+    layered layout keeps one file open with a layer per slice; the per-slice
+    layout writes and closes a file for every slice. All files share the
+    same extents so the profiles stay aligned.
+    """
+
+    def __init__(self, folder: str, base_name: str, file_format: str, layout: str, axis: slicing.SliceAxis, bounds: tuple,
+                 simplify_tolerance: float = None):
+        """
+        bounds -- (min u, min v, max u, max v) of the slice planes in cm.
+        simplify_tolerance -- When set, edge pieces are chained into loops and
+                              simplified with this tolerance (cm) before writing.
+        """
+        self.folder = folder
+        self.base_name = base_name
+        self.writer_type = WRITERS[file_format]
+        self.layout = layout
+        self.axis = axis
+        self.bounds = tuple(value * MM_PER_CM for value in bounds)
+        self.paths = []
+        self.slices_written = 0
+        self.polylines_written = 0
+        self.simplify_tolerance = simplify_tolerance
+        self.pieces_before_simplify = 0
+        self.writer = None
+        if layout == LAYOUT_LAYERED:
+            self.writer = self._open(f'{base_name}_slices')
+
+    def _open(self, name: str):
+        path = os.path.join(self.folder, f'{name}.{self.writer_type.extension}')
+        writer = self.writer_type(path, self.bounds)
+        self.paths.append(path)
+        return writer
+
+    def write_slice(self, index: int, position: float, polylines: list) -> int:
+        """Write the profiles of one slice. Returns the number of polylines written.
+
+        polylines -- Profiles in world space, stroked at EXPORT_TOLERANCE
+                     (see SliceCache.polylines) or from mesh sections.
+        """
+        if self.simplify_tolerance:
+            self.pieces_before_simplify += len(polylines)
+            polylines = [points + points[:1] if closed else points
+                         for points, closed in loops.simplify_polylines(polylines, self.simplify_tolerance)]
+        polylines = flatten_polylines(polylines, self.axis)
+        name = f'SLICE_{index + 1:03d}'
+        label = f'Slice {index + 1} ({self.axis}={position * MM_PER_CM:.3f} mm)'
+
+        if self.writer:
+            self.writer.add_slice(name, label, polylines)
+        else:
+            writer = self._open(f'{self.base_name}_{name.lower()}')
+            try:
+                writer.add_slice(name, label, polylines)
+            finally:
+                writer.close()
+
+        self.slices_written += 1
+        self.polylines_written += len(polylines)
+        return len(polylines)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    def abort(self):
+        """Close and delete every file written so far."""
+        try:
+            self.close()
+        except:
+            pass
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError as e:
+                futil.warning('Could not remove %s: %s', path, e)
+        self.paths = []
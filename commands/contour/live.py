@@ -0,0 +1,202 @@
+import contextlib
+import json
+import uuid
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+from . import spacing
+from . import loops
+from . import mesh_slicing
+from . import scheduler
+from .body_index import BodyIntervalIndex
+from .cache import slice_cache, body_fingerprint
+from .disk_cache import entry_key
+from .command import LIVE_FEATURE_NAME
+
+# Attribute group of the feature state; the curves of each slice carry the
+# slice signature in the same group, named after the feature's tag
+ATTRIBUTE_GROUP = 'ContourLive'
+STATE_ATTRIBUTE = 'state'
+
+# Custom parameter of the feature
+DIVISIONS_PARAMETER = 'divisions'
+
+
+def slice_signature(axis: slicing.SliceAxis, position: float, candidates: list, simplify_tolerance: float) -> str:
+    """Key of everything a slice's curves depend on: plane, output settings and the geometry of the bodies it cuts."""
+    bodies = sorted((body.entityToken, body_fingerprint(body)) for body in candidates)
+    return entry_key((axis.key(), round(position, 9), simplify_tolerance or 0.0, tuple(bodies)))
+
+
+def tagged_curves(design: adsk.fusion.Design, tag: str) -> dict:
+    """Curves written by a live contour, by slice signature."""
+    curves = {}
+    for attribute in design.findAttributes(ATTRIBUTE_GROUP, tag):
+        curve = attribute.parent
+        if curve:
+            curves.setdefault(attribute.value, []).append(curve)
+    return curves
+
+
+def delete_curves(curves: list):
+    """Delete sketch curves together with the sketch points they leave unconnected."""
+    points = []
+    for curve in curves:
+        try:
+            if isinstance(curve, adsk.fusion.SketchCircle):
+                points.append(curve.centerSketchPoint)
+            else:
+                points.extend((curve.startSketchPoint, curve.endSketchPoint))
+            curve.deleteMe()
+        except Exception as e:
+            futil.warning('  ✗ Could not delete curve: %s', e)
+    for point in points:
+        try:
+            if point.isValid and (point.connectedEntities is None or point.connectedEntities.count == 0):
+                point.deleteMe()
+        except:
+            pass
+
+
+def write_slice(sketch: adsk.fusion.Sketch, candidates: list, axis: slicing.SliceAxis, position: float, simplify_tolerance: float,
+                tag: str, signature: str) -> int:
+    """Intersect one position and write its curves, each tagged with the slice signature. Returns the number of curves."""
+    created = []
+    if simplify_tolerance:
+        polylines = slice_cache.polylines(candidates, axis, position, simplify_tolerance / 4)
+        slicing.add_loops_to_sketch(loops.polylines_to_loops(polylines, simplify_tolerance), sketch, created)
+    else:
+        for wire_body in slice_cache.intersect(candidates, axis, position):
+            slicing.add_wire_body_to_sketch(wire_body, sketch, created)
+    for curve in created:
+        curve.attributes.add(ATTRIBUTE_GROUP, tag, signature)
+    return len(created)
+
+
+def update_steps(sketch: adsk.fusion.Sketch, bodies: list, start_point: adsk.core.Point3D, end_point: adsk.core.Point3D,
+                 divisions: int, simplify_tolerance: float, tag: str):
+    """Bring the curves of a live contour sketch up to date, slice by slice.
+
+    Every position gets a signature from the plane and the fingerprints of
+    the bodies that span it. Curves whose signature is still wanted stay as
+    they are; the curves of slices that moved or whose bodies changed are
+    deleted, and only the new signatures are intersected (through the slice
+    caches) and written. Yields (positions done, positions total); returns
+    (slices kept, slices removed, slices written).
+    """
+    axis, start_coord, end_coord = slicing.SliceAxis.between(start_point, end_point)
+    if not axis:
+        raise ValueError('Start and end points must be different.')
+
+    bodies, mesh_bodies = mesh_slicing.partition_bodies(bodies)
+    if mesh_bodies:
+        futil.log(f'Skipping {len(mesh_bodies)} mesh bodies (live contours follow BRep bodies only)')
+
+    slice_cache.begin_run()
+    positions = spacing.uniform_positions(start_coord, end_coord, divisions)
+    body_index = BodyIntervalIndex(bodies, axis)
+
+    wanted = {}
+    for position in positions:
+        candidates = body_index.query(position)
+        if candidates:
+            wanted[slice_signature(axis, position, candidates, simplify_tolerance)] = (position, candidates)
+
+    existing = tagged_curves(adsk.fusion.Design.cast(sketch.parentComponent.parentDesign), tag)
+    stale = [signature for signature in existing if signature not in wanted]
+    with futil.phase('stale slice deletion'):
+        for signature in stale:
+            delete_curves(existing[signature])
+    kept = len(existing) - len(stale)
+
+    missing = [signature for signature in wanted if signature not in existing]
+    sketch.isComputeDeferred = True
+    try:
+        for k, signature in enumerate(missing):
+            yield k, len(missing)
+            position, candidates = wanted[signature]
+            with futil.phase('slice write', k):
+                curves = write_slice(sketch, candidates, axis, position, simplify_tolerance, tag, signature)
+            futil.count('curves', curves)
+    finally:
+        sketch.isComputeDeferred = False
+    slice_cache.end_run()
+
+    futil.log(f'Live contour: {kept} slices kept, {len(stale)} removed, {len(missing)} written')
+    return kept, len(stale), len(missing)
+
+
+def create_steps(definition: adsk.fusion.CustomFeatureDefinition, bodies: list, start_entity, end_entity, divisions: int,
+                 simplify_tolerance: float, base_plane, base_helpers: list):
+    """Write a live contour into one sketch and wrap it (and its base plane helpers) in a custom feature.
+
+    The feature depends on the bodies and the two points and exposes the
+    number of divisions as a parameter, so Fusion recomputes it (see
+    compute) whenever any of them changes. Yields like update_steps;
+    closing the generator deletes what was created.
+    """
+    design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    activeComp = design.activeComponent
+    tag = uuid.uuid4().hex
+    bodies = mesh_slicing.partition_bodies(bodies)[0]
+
+    sketch = activeComp.sketches.add(base_plane)
+    sketch.name = LIVE_FEATURE_NAME
+    try:
+        result = yield from update_steps(sketch, bodies, slicing.get_point_from_selection(start_entity),
+                                         slicing.get_point_from_selection(end_entity), divisions, simplify_tolerance, tag)
+    except GeneratorExit:
+        for entity in [sketch] + base_helpers:
+            try:
+                entity.deleteMe()
+            except:
+                pass
+        raise
+
+    featureInput = activeComp.features.customFeatures.createInput(definition)
+    for k, body in enumerate(bodies):
+        featureInput.addDependency(f'body{k}', body)
+    featureInput.addDependency('start', start_entity)
+    featureInput.addDependency('end', end_entity)
+    featureInput.addCustomParameter(DIVISIONS_PARAMETER, 'Divisions', adsk.core.ValueInput.createByReal(divisions), '', True)
+    featureInput.setStartAndEndFeatures(base_helpers[0] if base_helpers else sketch, sketch)
+    with futil.phase('custom feature'):
+        feature = activeComp.features.customFeatures.add(featureInput)
+    feature.attributes.add(ATTRIBUTE_GROUP, STATE_ATTRIBUTE, json.dumps({
+        'tag': tag,
+        'sketch': sketch.entityToken,
+        'simplify_tolerance': simplify_tolerance,
+    }))
+    return result
+
+
+def compute(args: adsk.fusion.CustomFeatureEventArgs):
+    """Recompute a live contour after its bodies, points or divisions changed."""
+    feature = args.customFeature
+    attribute = feature.attributes.itemByName(ATTRIBUTE_GROUP, STATE_ATTRIBUTE)
+    if not attribute:
+        # Still being created; create_steps writes the state once the feature exists
+        return
+    state = json.loads(attribute.value)
+    design = adsk.fusion.Design.cast(feature.parentComponent.parentDesign)
+    found = design.findEntityByToken(state['sketch'])
+    if not found:
+        futil.warning('Live contour %s: its sketch no longer exists', feature.name)
+        return
+
+    dependencies = feature.dependencies
+    bodies = []
+    for k in range(dependencies.count):
+        dependency = dependencies.item(k)
+        if dependency.id.startswith('body') and dependency.entity:
+            bodies.append(dependency.entity)
+    start_point = slicing.get_point_from_selection(dependencies.itemById('start').entity)
+    end_point = slicing.get_point_from_selection(dependencies.itemById('end').entity)
+    divisions = max(1, int(round(feature.parameters.itemById(DIVISIONS_PARAMETER).value)))
+
+    # A recompute can fire in the middle of a buffered command run; it then logs into that run
+    run = contextlib.nullcontext() if futil.is_buffering() else futil.log_run(f'{LIVE_FEATURE_NAME} recompute')
+    with run:
+        scheduler.run_to_completion(update_steps(found[0], bodies, start_point, end_point, divisions,
+                                                 state['simplify_tolerance'], state['tag']))
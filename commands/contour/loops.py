@@ -0,0 +1,224 @@
+import math
+
+# Default tolerance (cm) for joining, simplifying and fitting slice output
+DEFAULT_TOLERANCE = 0.005
+
+# Fewest points a run needs before it is replaced by an arc
+MIN_ARC_POINTS = 4
+
+
+def _distance(a: tuple, b: tuple) -> float:
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+
+class EndpointHash:
+    """Spatial hash of polyline end points on a grid of tolerance-sized cells."""
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.cells = {}
+
+    def _cell(self, point: tuple) -> tuple:
+        return tuple(int(math.floor(value / self.tolerance)) for value in point)
+
+    def add(self, point: tuple, item):
+        self.cells.setdefault(self._cell(point), []).append((point, item))
+
+    def near(self, point: tuple):
+        """Items whose end point lies within the tolerance of the point."""
+        cx, cy, cz = self._cell(point)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for other, item in self.cells.get((cx + dx, cy + dy, cz + dz), ()):
+                        if _distance(point, other) <= self.tolerance:
+                            yield item
+
+
+def assemble_loops(polylines: list, tolerance: float) -> list:
+    """Chain polylines whose end points meet into loops.
+
+    Every end point goes into a spatial hash once, so each join is a
+    constant-time lookup and assembly stays near-linear in the number of
+    pieces. Returns a list of (points, closed); closed loops do not repeat
+    their first point.
+    """
+    endpoints = EndpointHash(tolerance)
+    for index, polyline in enumerate(polylines):
+        endpoints.add(polyline[0], (index, False))
+        endpoints.add(polyline[-1], (index, True))
+
+    used = [False] * len(polylines)
+
+    def take_next(point):
+        """Consume an unused polyline starting at the point (reversed if it ends there)."""
+        for index, at_end in endpoints.near(point):
+            if not used[index]:
+                used[index] = True
+                polyline = polylines[index]
+                return list(reversed(polyline)) if at_end else list(polyline)
+        return None
+
+    loops = []
+    for index, polyline in enumerate(polylines):
+        if used[index]:
+            continue
+        used[index] = True
+        chain = list(polyline)
+
+        # Grow forward, then backward from the start for chains that began mid-way
+        while _distance(chain[0], chain[-1]) > tolerance or len(chain) < 3:
+            piece = take_next(chain[-1])
+            if piece is None:
+                break
+            chain.extend(piece[1:])
+        closed = len(chain) >= 3 and _distance(chain[0], chain[-1]) <= tolerance
+        while not closed:
+            piece = take_next(chain[0])
+            if piece is None:
+                break
+            chain[:0] = list(reversed(piece))[:-1]
+            closed = len(chain) >= 3 and _distance(chain[0], chain[-1]) <= tolerance
+
+        if closed:
+            chain.pop()
+        loops.append((chain, closed))
+    return loops
+
+
+def douglas_peucker(points: list, tolerance: float) -> list:
+    """Drop points that lie within the tolerance of the simplified polyline (collinear runs merge)."""
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        # Squared distances to the chord, inlined: this loop runs for every point of every section
+        (ax, ay, az), (bx, by, bz) = points[first], points[last]
+        cx, cy, cz = bx - ax, by - ay, bz - az
+        length_sq = cx * cx + cy * cy + cz * cz
+        farthest, index = 0.0, None
+        for k in range(first + 1, last):
+            px, py, pz = points[k]
+            dx, dy, dz = px - ax, py - ay, pz - az
+            if length_sq > 0:
+                t = max(0.0, min(1.0, (dx * cx + dy * cy + dz * cz) / length_sq))
+                dx, dy, dz = dx - t * cx, dy - t * cy, dz - t * cz
+            distance = dx * dx + dy * dy + dz * dz
+            if distance > farthest:
+                farthest, index = distance, k
+        if index is not None and farthest > tolerance_sq:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_loop(points: list, closed: bool, tolerance: float) -> list:
+    """Douglas-Peucker for open chains and loops (a loop is split at its farthest point)."""
+    if not closed or len(points) < 4:
+        return douglas_peucker(points, tolerance)
+    far = max(range(len(points)), key=lambda k: _distance(points[0], points[k]))
+    first = douglas_peucker(points[:far + 1], tolerance)
+    second = douglas_peucker(points[far:] + [points[0]], tolerance)
+    return first[:-1] + second[:-1]
+
+
+def circle_through(a: tuple, b: tuple, c: tuple):
+    """Center and radius of the circle through three points, or None if they are collinear."""
+    ab = [b[k] - a[k] for k in range(3)]
+    ac = [c[k] - a[k] for k in range(3)]
+    normal = (ab[1] * ac[2] - ab[2] * ac[1], ab[2] * ac[0] - ab[0] * ac[2], ab[0] * ac[1] - ab[1] * ac[0])
+    normal_sq = sum(value * value for value in normal)
+    if normal_sq < 1e-18:
+        return None
+    ab_sq = sum(value * value for value in ab)
+    ac_sq = sum(value * value for value in ac)
+    # center = a + (|ab|^2 (ac x n) + |ac|^2 (n x ab)) / (2 |n|^2)
+    ac_x_n = (ac[1] * normal[2] - ac[2] * normal[1], ac[2] * normal[0] - ac[0] * normal[2], ac[0] * normal[1] - ac[1] * normal[0])
+    n_x_ab = (normal[1] * ab[2] - normal[2] * ab[1], normal[2] * ab[0] - normal[0] * ab[2], normal[0] * ab[1] - normal[1] * ab[0])
+    center = tuple(a[k] + (ab_sq * ac_x_n[k] + ac_sq * n_x_ab[k]) / (2 * normal_sq) for k in range(3))
+    return center, _distance(center, a)
+
+
+def _on_circle(points: list, center: tuple, radius: float, tolerance: float) -> bool:
+    """Every point lies on the circle and no chord between neighbours bulges more than the tolerance.
+
+    The chord check keeps coarse polygons (whose corners are co-circular too)
+    from being turned into arcs.
+    """
+    for k, point in enumerate(points):
+        if abs(_distance(point, center) - radius) > tolerance:
+            return False
+        if k > 0:
+            half_chord = _distance(points[k - 1], point) / 2
+            if half_chord > radius or radius - math.sqrt(radius * radius - half_chord * half_chord) > tolerance:
+                return False
+    return True
+
+
+def _fits_arc(points: list, tolerance: float):
+    """The circle through the first, middle and last point, if the run lies on it."""
+    circle = circle_through(points[0], points[len(points) // 2], points[-1])
+    if circle is None or not _on_circle(points, circle[0], circle[1], tolerance):
+        return None
+    return circle
+
+
+def fit_segments(points: list, closed: bool, tolerance: float) -> list:
+    """Turn a simplified loop into lines, arcs and circles.
+
+    Runs of at least MIN_ARC_POINTS points that lie on a common circle become
+    one arc; a closed loop entirely on a circle becomes a circle. Returns
+    ('line', start, end), ('arc', start, middle, end) and ('circle', center,
+    radius) tuples in order along the loop.
+    """
+    if closed and len(points) >= MIN_ARC_POINTS + 2:
+        third = len(points) // 3
+        circle = circle_through(points[0], points[third], points[2 * third])
+        if circle and _on_circle(points + [points[0]], circle[0], circle[1], tolerance):
+            return [('circle', circle[0], circle[1])]
+
+    path = points + [points[0]] if closed else points
+    segments = []
+    start = 0
+    while start < len(path) - 1:
+        # Longest co-circular run from here: grow by doubling, then narrow down by bisection
+        best = None
+        end = start + MIN_ARC_POINTS - 1
+        while end < len(path) and _fits_arc(path[start:end + 1], tolerance):
+            best = end
+            end = start + 2 * (end - start)
+        if best is not None:
+            low, high = best, min(end, len(path)) - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if _fits_arc(path[start:middle + 1], tolerance):
+                    low = middle
+                else:
+                    high = middle - 1
+            best = low
+            segments.append(('arc', path[start], path[(start + best) // 2], path[best]))
+            start = best
+        else:
+            segments.append(('line', path[start], path[start + 1]))
+            start += 1
+    return segments
+
+
+def simplify_polylines(polylines: list, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Assemble loops and simplify them. Returns (points, closed) tuples."""
+    return [(simplify_loop(points, closed, tolerance), closed) for points, closed in assemble_loops(polylines, tolerance)]
+
+
+def polylines_to_loops(polylines: list, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Chain, simplify and fit edges stroked at a quarter of the tolerance.
+
+    Returns one list of fit_segments primitives per loop, in world space.
+    """
+    # Simplify at half the tolerance so the chords of true arcs still pass the arc fit
+    return [fit_segments(points, closed, tolerance) for points, closed in simplify_polylines(polylines, tolerance / 2)
+            if len(points) >= 2]
@@ -0,0 +1,322 @@
+import bisect
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import loops
+from . import slicing
+
+# NumPy is not guaranteed inside Fusion; fall back to plain Python without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Planes sliced together in one vectorized pass (bounds the memory of a pass)
+PLANE_BATCH = 64
+
+# Triangle edges as pairs of corner indices
+TRIANGLE_EDGES = ((0, 1), (1, 2), (2, 0))
+
+# Section points closer than this (cm) are one point
+REPEAT_TOLERANCE = 1e-9
+
+
+def is_mesh_body(body) -> bool:
+    return isinstance(body, adsk.fusion.MeshBody)
+
+
+def partition_bodies(bodies) -> tuple:
+    """Split a selection into (BRep bodies, mesh bodies)."""
+    breps = [body for body in bodies if not is_mesh_body(body)]
+    meshes = [body for body in bodies if is_mesh_body(body)]
+    return breps, meshes
+
+
+def _partners(keys) -> list:
+    """For every segment end, the index of the other segment end on the same mesh edge, or -1.
+
+    On a manifold mesh every cut edge is shared by exactly two segments; ends
+    on a boundary edge (a hole in the mesh) stay unpaired.
+    """
+    if len(keys) == 0:
+        return []
+    if numpy is None:
+        partner = [-1] * len(keys)
+        waiting = {}
+        for end, key in enumerate(keys):
+            other = waiting.pop(key, None)
+            if other is None:
+                waiting[key] = end
+            else:
+                partner[end], partner[other] = other, end
+        return partner
+
+    keys = numpy.asarray(keys)
+    order = numpy.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    index = numpy.arange(len(keys))
+    # Pair neighbours in sorted order, first with second, third with fourth, ... of every equal run
+    run_start = numpy.maximum.accumulate(numpy.where(numpy.r_[True, sorted_keys[1:] != sorted_keys[:-1]], index, 0))
+    pairs = numpy.nonzero((sorted_keys[1:] == sorted_keys[:-1]) & ((index[:-1] - run_start[:-1]) % 2 == 0))[0]
+    partner = numpy.full(len(keys), -1, dtype=numpy.int64)
+    partner[order[pairs]] = order[pairs + 1]
+    partner[order[pairs + 1]] = order[pairs]
+    return partner.tolist()
+
+
+def chain_segments(keys, points) -> list:
+    """Join section segments that share a mesh edge into polylines.
+
+    keys and points describe the segment ends: the start of every segment
+    first, then the end of every segment (segment k has ends k and k + n).
+    Each end is keyed by the mesh edge it lies on, so neighbouring segments
+    are joined by exact key matches instead of distance tests. Returns
+    (points, closed) tuples; closed loops do not repeat their first point.
+    """
+    count = len(keys) // 2
+    partner = _partners(keys)
+    used = bytearray(count)
+
+    def walk(end: int, chain: list) -> bool:
+        """Follow segments from an end, appending the far ends. Returns True when the chain closes."""
+        while True:
+            segment = end % count
+            if used[segment]:
+                return True
+            used[segment] = 1
+            end = end + count if end < count else end - count
+            chain.append(end)
+            end = partner[end]
+            if end < 0:
+                return False
+
+    chains = []
+    for segment in range(count):
+        if used[segment]:
+            continue
+        chain = [segment]
+        closed = walk(segment, chain)
+        if closed:
+            # The last far end lies on the same edge as the first end
+            chain.pop()
+        elif partner[segment] >= 0:
+            # Open chain (a hole in the mesh): grow backward from the first end too
+            backward = []
+            walk(partner[segment], backward)
+            chain = backward[::-1] + chain
+        chains.append((chain, closed))
+
+    if numpy is not None and chains:
+        points = numpy.asarray(points)
+        # Columns to tuples through zip is much faster than converting row by row
+        return [(list(zip(*points[chain].T.tolist())), closed) for chain, closed in chains]
+    return [([points[end] for end in chain], closed) for chain, closed in chains]
+
+
+def drop_repeats(points: list, closed: bool) -> list:
+    """Drop points that repeat the one before (and, in a loop, the last point if it repeats the first).
+
+    A plane through a mesh vertex reaches the vertex along both triangle
+    edges that end there, so the chain visits it twice in a row.
+    """
+    kept = []
+    for point in points:
+        if not kept or max(abs(point[k] - kept[-1][k]) for k in range(3)) > REPEAT_TOLERANCE:
+            kept.append(point)
+    if closed and len(kept) > 1 and max(abs(kept[-1][k] - kept[0][k]) for k in range(3)) <= REPEAT_TOLERANCE:
+        kept.pop()
+    return kept
+
+
+class MeshSlicer:
+    """Slice a mesh body with many parallel planes, without converting it to BRep.
+
+    The node and triangle arrays are pulled from the display mesh once and
+    the triangles are sorted by their lowest point along the slice axis
+    (node heights are dot products with the axis normal, so any direction
+    works the same way). A
+    batch of planes then only looks at the triangles whose extent reaches
+    into the batch, and all segments of all planes in the batch are computed
+    in one vectorized pass (or a plain Python loop without NumPy).
+    """
+
+    def __init__(self, body, axis: slicing.SliceAxis):
+        self.body = body
+        self.axis = axis
+
+        with futil.phase('mesh arrays'):
+            mesh = body.displayMesh
+            coordinates = mesh.nodeCoordinatesAsDouble
+            indices = mesh.nodeIndices
+        self.node_count = len(coordinates) // 3
+        self.triangle_count = len(indices) // 3
+        futil.count('mesh triangles', self.triangle_count)
+
+        if numpy is not None:
+            self.nodes = numpy.asarray(coordinates, dtype=float).reshape(-1, 3)
+            self.heights = self.nodes @ numpy.asarray(axis.normal, dtype=float)
+            triangles = numpy.asarray(indices, dtype=numpy.int64).reshape(-1, 3)
+            heights = self.heights[triangles]
+            order = numpy.argsort(heights.min(axis=1), kind='stable')
+            self.triangles = triangles[order]
+            self.lows = heights.min(axis=1)[order]
+            self.highs = heights.max(axis=1)[order]
+        else:
+            self.nodes = [tuple(coordinates[k:k + 3]) for k in range(0, len(coordinates), 3)]
+            self.heights = [axis.coordinate(node) for node in self.nodes]
+            triangles = [tuple(indices[k:k + 3]) for k in range(0, len(indices), 3)]
+            triangles.sort(key=lambda triangle: min(self.heights[node] for node in triangle))
+            self.triangles = triangles
+            self.lows = [min(self.heights[node] for node in triangle) for triangle in triangles]
+            self.highs = [max(self.heights[node] for node in triangle) for triangle in triangles]
+
+    def slice(self, positions: list) -> list:
+        """Sections at the positions: one list of (points, closed) per position, in order."""
+        sections = []
+        for first in range(0, len(positions), PLANE_BATCH):
+            batch = positions[first:first + PLANE_BATCH]
+            if numpy is not None:
+                segments = self._batch_segments(batch)
+            else:
+                segments = self._batch_segments_python(batch)
+            for plane_segments in segments:
+                futil.count('mesh segments', len(plane_segments[0]) // 2)
+                chains = [(drop_repeats(points, closed), closed) for points, closed in chain_segments(*plane_segments)]
+                sections.append([(points, closed) for points, closed in chains if len(points) >= (3 if closed else 2)])
+        return sections
+
+    def _edge_key(self, a, b):
+        """Key of the mesh edge between two nodes, the same from either triangle."""
+        return min(a, b) * self.node_count + max(a, b)
+
+    def _batch_segments(self, batch: list) -> list:
+        """Segments of every plane in the batch, computed together with NumPy.
+
+        A plane at p cuts a triangle when some corner lies below p and some at
+        or above it, i.e. low < p <= high. Returns (keys, points) of the
+        segment ends per plane, laid out as chain_segments expects.
+        """
+        planes = numpy.asarray(batch, dtype=float)
+        order = numpy.argsort(planes)
+        sorted_planes = planes[order]
+
+        # Sorted lows bound the triangles that start below the batch; highs drop those that end before it
+        end = numpy.searchsorted(self.lows, sorted_planes[-1], side='left')
+        reaching = numpy.nonzero(self.highs[:end] >= sorted_planes[0])[0]
+        lows, highs = self.lows[reaching], self.highs[reaching]
+
+        # Every (triangle, plane) pair that intersects, planes found by binary search per triangle
+        first = numpy.searchsorted(sorted_planes, lows, side='right')
+        last = numpy.searchsorted(sorted_planes, highs, side='right')
+        counts = last - first
+        pair_triangles = numpy.repeat(reaching, counts)
+        offsets = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        pair_planes = numpy.repeat(first, counts) + offsets
+
+        triangles = self.triangles[pair_triangles]
+        corners = self.nodes[triangles]
+        distances = self.heights[triangles] - sorted_planes[pair_planes][:, None]
+        below = distances < 0
+
+        points, keys, crosses = [], [], []
+        for a, b in TRIANGLE_EDGES:
+            crossing = below[:, a] != below[:, b]
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                t = numpy.where(crossing, distances[:, a] / (distances[:, a] - distances[:, b]), 0.0)
+            points.append(corners[:, a] + t[:, None] * (corners[:, b] - corners[:, a]))
+            keys.append(numpy.minimum(triangles[:, a], triangles[:, b]) * self.node_count
+                        + numpy.maximum(triangles[:, a], triangles[:, b]))
+            crosses.append(crossing)
+
+        # Exactly two edges cross: (0, 1), (1, 2) or (2, 0)
+        start_points = numpy.where(crosses[0][:, None], points[0], points[1])
+        end_points = numpy.where(crosses[2][:, None], points[2], points[1])
+        start_keys = numpy.where(crosses[0], keys[0], keys[1])
+        end_keys = numpy.where(crosses[2], keys[2], keys[1])
+
+        # Group the pairs by plane and hand them back in batch order
+        grouped = numpy.argsort(pair_planes, kind='stable')
+        bounds = numpy.searchsorted(pair_planes[grouped], numpy.arange(len(batch) + 1))
+        by_sorted_plane = []
+        for k in range(len(batch)):
+            rows = grouped[bounds[k]:bounds[k + 1]]
+            by_sorted_plane.append((numpy.concatenate((start_keys[rows], end_keys[rows])),
+                                    numpy.concatenate((start_points[rows], end_points[rows]))))
+        segments = [None] * len(batch)
+        for k, index in enumerate(order.tolist()):
+            segments[index] = by_sorted_plane[k]
+        return segments
+
+    def _batch_segments_python(self, batch: list) -> list:
+        """Plain Python version of _batch_segments."""
+        low, high = min(batch), max(batch)
+        end = bisect.bisect_left(self.lows, high)
+        reaching = [k for k in range(end) if self.highs[k] >= low]
+
+        segments = []
+        for position in batch:
+            start_keys, end_keys, start_points, end_points = [], [], [], []
+            for k in reaching:
+                if not self.lows[k] < position <= self.highs[k]:
+                    continue
+                triangle = self.triangles[k]
+                corners = [self.nodes[node] for node in triangle]
+                ends = []
+                for a, b in TRIANGLE_EDGES:
+                    da, db = self.heights[triangle[a]] - position, self.heights[triangle[b]] - position
+                    if (da < 0) != (db < 0):
+                        t = da / (da - db)
+                        point = tuple(corners[a][c] + t * (corners[b][c] - corners[a][c]) for c in range(3))
+                        ends.append((self._edge_key(triangle[a], triangle[b]), point))
+                (start_key, start_point), (end_key, end_point) = ends[0], ends[-1]
+                start_keys.append(start_key)
+                end_keys.append(end_key)
+                start_points.append(start_point)
+                end_points.append(end_point)
+            segments.append((start_keys + end_keys, start_points + end_points))
+        return segments
+
+
+class MeshSections:
+    """Mesh sections of a run, computed PLANE_BATCH positions at a time on demand.
+
+    Only the current batch is kept, so the memory use does not grow with the
+    number of positions.
+    """
+
+    def __init__(self, meshes, axis: slicing.SliceAxis, positions: list):
+        self.slicers = [MeshSlicer(body, axis) for body in meshes]
+        self.positions = positions
+        self.batch_start = None
+        self.batch = []
+
+    def section(self, index: int) -> list:
+        """(points, closed) polylines of all meshes at positions[index]."""
+        start = index - index % PLANE_BATCH
+        if start != self.batch_start:
+            positions = self.positions[start:start + PLANE_BATCH]
+            self.batch = [[] for _ in positions]
+            with futil.phase('mesh slicing'):
+                for slicer in self.slicers:
+                    for k, polylines in enumerate(slicer.slice(positions)):
+                        self.batch[k].extend(polylines)
+            self.batch_start = start
+        return self.batch[index - start]
+
+
+def to_loops(section: list, simplify_tolerance: float = None) -> list:
+    """Loops for SketchWriter.add_loops: fitted with lines and arcs when simplifying, straight lines otherwise."""
+    result = []
+    for points, closed in section:
+        if simplify_tolerance:
+            points = loops.simplify_loop(points, closed, simplify_tolerance / 2)
+            result.append(loops.fit_segments(points, closed, simplify_tolerance))
+        else:
+            path = points + points[:1] if closed else points
+            result.append([('line', a, b) for a, b in zip(path, path[1:])])
+    return result
+
+
+def to_polylines(section: list) -> list:
+    """Plain polylines (closed loops repeat their first point) for export and preview."""
+    return [points + points[:1] if closed else points for points, closed in section]
@@ -0,0 +1,130 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+from . import mesh_slicing
+from .body_index import BodyIntervalIndex
+
+PREVIEW_COLOR = (255, 64, 0)
+
+# Stroke tolerance (cm) for preview curves
+PREVIEW_TOLERANCE = 0.02
+
+# Most positions drawn; longer runs preview an evenly thinned subset
+PREVIEW_MAX_SLICES = 200
+
+
+class PreviewCache:
+    """Slice polylines keyed on the preview inputs.
+
+    The key is (body entity tokens, axis, start, end); slices inside it are
+    stored per plane position, so changing only the division count reuses
+    every position that was already computed and only slices the new ones.
+    Mesh bodies keep their sorted triangle arrays for as long as the key
+    holds and slice all missing positions in one sweep.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.slices = {}
+        self.mesh_slicers = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_slices(self, bodies, axis: slicing.SliceAxis, start_coord: float, end_coord: float, positions: list) -> dict:
+        """Return {position: polylines} for the positions, computing only the missing ones."""
+        key = (tuple(body.entityToken for body in bodies), axis.key(), start_coord, end_coord)
+        if key != self.key:
+            self.key = key
+            self.slices = {}
+            self.mesh_slicers = None
+
+        breps, meshes = mesh_slicing.partition_bodies(bodies)
+        body_index = BodyIntervalIndex(breps, axis)
+        missing = [position for position in positions if round(position, 9) not in self.slices]
+        mesh_polylines = self.slice_meshes(meshes, axis, missing)
+
+        result = {}
+        for position in positions:
+            slot = round(position, 9)
+            polylines = self.slices.get(slot)
+            if polylines is None:
+                self.misses += 1
+                polylines = list(mesh_polylines.get(position, []))
+                candidates = body_index.query(position)
+                if candidates:
+                    plane = axis.plane(position)
+                    for wire_body in slicing.intersect_bodies_with_plane(candidates, plane):
+                        polylines.extend(slicing.wire_body_to_polylines(wire_body, PREVIEW_TOLERANCE))
+                self.slices[slot] = polylines
+            else:
+                self.hits += 1
+            result[position] = polylines
+        return result
+
+    def slice_meshes(self, meshes, axis: slicing.SliceAxis, positions: list) -> dict:
+        """Return {position: polylines} of the mesh bodies at the positions."""
+        if not meshes or not positions:
+            return {}
+        if self.mesh_slicers is None:
+            self.mesh_slicers = [mesh_slicing.MeshSlicer(body, axis) for body in meshes]
+        result = {position: [] for position in positions}
+        for slicer in self.mesh_slicers:
+            for position, section in zip(positions, slicer.slice(positions)):
+                result[position].extend(mesh_slicing.to_polylines(section))
+        return result
+
+    def clear(self):
+        self.key = None
+        self.slices = {}
+        self.mesh_slicers = None
+
+
+_cache = PreviewCache()
+_graphics_group = None
+
+
+def show_slices(bodies, axis: slicing.SliceAxis, start_coord: float, end_coord: float, positions: list):
+    """Draw the slice curves at the positions as custom graphics. Writes no timeline features."""
+    clear_graphics()
+    if len(positions) > PREVIEW_MAX_SLICES:
+        step = -(-len(positions) // PREVIEW_MAX_SLICES)
+        positions = positions[::step]
+    slices = _cache.get_slices(bodies, axis, start_coord, end_coord, positions)
+
+    coordinates = []
+    strip_lengths = []
+    for polylines in slices.values():
+        for polyline in polylines:
+            for point in polyline:
+                coordinates.extend(point)
+            strip_lengths.append(len(polyline))
+    futil.log(f'Preview: {len(strip_lengths)} curves at {len(positions)} positions '
+              f'(cache hits: {_cache.hits}, misses: {_cache.misses})')
+    if not strip_lengths:
+        return
+
+    global _graphics_group
+    design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    _graphics_group = design.rootComponent.customGraphicsGroups.add()
+    graphicsCoords = adsk.fusion.CustomGraphicsCoordinates.create(coordinates)
+    lines = _graphics_group.addLines(graphicsCoords, list(range(len(coordinates) // 3)), True, strip_lengths)
+    lines.weight = 2
+    lines.color = adsk.fusion.CustomGraphicsSolidColorEffect.create(adsk.core.Color.create(*PREVIEW_COLOR, 255))
+
+
+def clear_graphics():
+    """Remove the preview graphics, if any."""
+    global _graphics_group
+    if _graphics_group:
+        try:
+            _graphics_group.deleteMe()
+        except:
+            pass
+        _graphics_group = None
+
+
+def reset():
+    """Drop preview graphics and cached slices when the command ends."""
+    clear_graphics()
+    _cache.clear()
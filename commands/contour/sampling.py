@@ -0,0 +1,109 @@
+import math
+import adsk.core
+import adsk.fusion
+
+# NumPy is not guaranteed inside Fusion; fall back to plain Python without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Maximum distance (cm) between a sampled polyline and the curve
+DEFAULT_TOLERANCE = 0.001
+
+# Segments of the first, coarse sampling used to estimate the deviation
+PILOT_SEGMENTS = 8
+
+# Bounds of the number of segments per curve
+MIN_SEGMENTS = 2
+MAX_SEGMENTS = 256
+
+
+def sketch_to_sketch_matrix(sourceSketch: adsk.fusion.Sketch, outputSketch: adsk.fusion.Sketch) -> list:
+    """Row-major 4x4 cells mapping source sketch space to output sketch space.
+
+    Equivalent to sketchToModelSpace followed by modelToSketchSpace, but
+    computed once per sketch pair instead of twice per point.
+    """
+    matrix = sourceSketch.transform.copy()
+    toOutput = outputSketch.transform.copy()
+    toOutput.invert()
+    matrix.transformBy(toOutput)
+    return list(matrix.asArray())
+
+
+def transform_points(cells: list, points: list) -> list:
+    """Apply a 4x4 affine matrix to a list of (x, y, z) tuples in one pass."""
+    if not points:
+        return []
+    if numpy is not None:
+        matrix = numpy.array(cells, dtype=float).reshape(4, 4)
+        array = numpy.array(points, dtype=float)
+        return [tuple(row) for row in (array @ matrix[:3, :3].T + matrix[:3, 3]).tolist()]
+    m00, m01, m02, m03, m10, m11, m12, m13, m20, m21, m22, m23 = cells[:12]
+    return [(m00 * x + m01 * y + m02 * z + m03,
+             m10 * x + m11 * y + m12 * z + m13,
+             m20 * x + m21 * y + m22 * z + m23) for x, y, z in points]
+
+
+def _max_deviation(points: list) -> float:
+    """Largest distance of the odd points from the chord between their even neighbours."""
+    deviation = 0.0
+    for k in range(1, len(points) - 1, 2):
+        (ax, ay, az), (mx, my, mz), (bx, by, bz) = points[k - 1], points[k], points[k + 1]
+        cx, cy, cz = bx - ax, by - ay, bz - az
+        dx, dy, dz = mx - ax, my - ay, mz - az
+        length_sq = cx * cx + cy * cy + cz * cz
+        if length_sq > 0:
+            # Component of the midpoint offset perpendicular to the chord
+            t = (dx * cx + dy * cy + dz * cz) / length_sq
+            dx, dy, dz = dx - t * cx, dy - t * cy, dz - t * cz
+        deviation = max(deviation, math.sqrt(dx * dx + dy * dy + dz * dz))
+    return deviation
+
+
+def _evaluate(evaluator, parameters: list) -> list:
+    ok, points = evaluator.getPointsAtParameters(parameters)
+    if not ok:
+        raise RuntimeError('getPointsAtParameters failed')
+    return [(pt.x, pt.y, pt.z) for pt in points]
+
+
+def sample_curve(geometry, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Sample a curve into (x, y, z) tuples whose chords stay within the tolerance.
+
+    A coarse pilot pass (one batch call) measures how far the curve bends away
+    from its chords. Chordal deviation shrinks with the square of the segment
+    length, so the segment count is scaled by sqrt(deviation / tolerance) and
+    evaluated in a second batch call. Short or flat curves keep the pilot
+    samples and make only one call.
+    """
+    evaluator = geometry.evaluator
+    _, startParam, endParam = evaluator.getParameterExtents()
+    span = endParam - startParam
+
+    # Pilot: segment end points and midpoints in one call
+    pilot_count = 2 * PILOT_SEGMENTS
+    pilot = _evaluate(evaluator, [startParam + span * k / pilot_count for k in range(pilot_count + 1)])
+    deviation = _max_deviation(pilot)
+    if deviation <= tolerance:
+        # The pilot already satisfies the tolerance; keep only as many points as needed
+        segments = max(MIN_SEGMENTS, int(math.ceil(PILOT_SEGMENTS * math.sqrt(deviation / tolerance))))
+        step = max(1, pilot_count // segments)
+        points = pilot[::step]
+        if points[-1] != pilot[-1]:
+            points.append(pilot[-1])
+        return points
+
+    segments = int(math.ceil(PILOT_SEGMENTS * math.sqrt(deviation / tolerance)))
+    segments = min(MAX_SEGMENTS, max(MIN_SEGMENTS, segments))
+    if segments <= pilot_count:
+        return pilot
+    return _evaluate(evaluator, [startParam + span * k / segments for k in range(segments + 1)])
+
+
+def to_point_collection(points: list) -> adsk.core.ObjectCollection:
+    collection = adsk.core.ObjectCollection.create()
+    for x, y, z in points:
+        collection.add(adsk.core.Point3D.create(x, y, z))
+    return collection
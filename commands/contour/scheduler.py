@@ -0,0 +1,220 @@
+import concurrent.futures
+import time
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ... import config
+
+CUSTOM_EVENT_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_chunked_run'
+
+# Work done inside the execute handler before switching to chunked execution
+SYNC_BUDGET_SECONDS = 0.5
+
+# Chunk length the adaptive chunk size aims for
+TARGET_CHUNK_SECONDS = 0.2
+
+# Handlers of the custom event, released when the run finishes
+local_handlers = []
+
+
+class Wait:
+    """Yielded by a step generator instead of (done, total) to pause until a worker future is done."""
+
+    def __init__(self, future: concurrent.futures.Future):
+        self.future = future
+
+
+def run_to_completion(steps):
+    """Run a step generator synchronously. Returns the generator's return value."""
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if isinstance(step, Wait):
+            concurrent.futures.wait([step.future])
+
+
+class ChunkedRun:
+    """Drive a step generator in chunks through a custom event.
+
+    Each step of the generator yields (done, total). Work starts inside the
+    command's execute handler; anything left after SYNC_BUDGET_SECONDS is
+    continued in chunks fired through app.fireCustomEvent, so Fusion stays
+    responsive in between. The chunk size adapts to the measured cost per
+    step to stay close to TARGET_CHUNK_SECONDS. A progress dialog shows the
+    progress and offers Cancel, which closes the generator and, in
+    parametric designs, deletes the timeline items the run inserted (see
+    rollback). cancel_note tells the user what closing the generator leaves
+    behind in direct designs.
+
+    When the generator yields a Wait, no further chunk is fired; the
+    future's done callback fires the custom event from the worker thread
+    instead, so the result is picked up on the main thread as soon as it
+    is there and Fusion stays idle in between.
+    """
+
+    active = None
+
+    def __init__(self, steps, title: str, on_finish=None, cancel_note: str = 'Completed steps were kept.'):
+        self.steps = steps
+        self.title = title
+        self.on_finish = on_finish
+        self.cancel_note = cancel_note
+        self.chunk_size = 1
+        self.step_seconds = None
+        self.done = 0
+        self.total = 0
+        self.progress = None
+        self.event = None
+        self.waiting = None
+
+        app = adsk.core.Application.get()
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        self.timeline = None
+        self.timeline_count = None
+        self.timeline_marker = None
+        if design and design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+            # New features go in at the marker, which may sit before later features of the user
+            self.timeline = design.timeline
+            self.timeline_count = design.timeline.count
+            self.timeline_marker = design.timeline.markerPosition
+
+    def start(self):
+        """Run the first part synchronously and schedule the rest."""
+        if ChunkedRun.active:
+            ChunkedRun.active.cancel()
+        if self._run_for(SYNC_BUDGET_SECONDS):
+            return
+
+        app = adsk.core.Application.get()
+        ChunkedRun.active = self
+        self.progress = app.userInterface.createProgressDialog()
+        self.progress.isCancelButtonShown = True
+        self.progress.show(self.title, f'{self.title}: %v of %m (%p%)', 0, max(self.total, 1))
+        self.progress.progressValue = self.done
+
+        app.unregisterCustomEvent(CUSTOM_EVENT_ID)
+        self.event = app.registerCustomEvent(CUSTOM_EVENT_ID)
+        futil.add_handler(self.event, self._on_chunk, local_handlers=local_handlers)
+        self._schedule()
+
+    def _schedule(self):
+        """Fire the next chunk now, or once the awaited worker future is done."""
+        if self.waiting is not None:
+            self.waiting.add_done_callback(self._wake)
+        else:
+            adsk.core.Application.get().fireCustomEvent(CUSTOM_EVENT_ID)
+
+    def _wake(self, future: concurrent.futures.Future):
+        # Runs on the worker thread; fireCustomEvent hands the chunk over to the main thread
+        if self.waiting is future and ChunkedRun.active is self:
+            adsk.core.Application.get().fireCustomEvent(CUSTOM_EVENT_ID)
+
+    def _on_chunk(self, args: adsk.core.CustomEventArgs):
+        if ChunkedRun.active is not self:
+            return
+        self.waiting = None
+        if self.progress.wasCancelled:
+            self.cancel()
+            return
+        if self._run_chunk():
+            return
+        self.progress.maximumValue = max(self.total, 1)
+        self.progress.progressValue = self.done
+        self._schedule()
+
+    def _run_for(self, seconds: float) -> bool:
+        """Run steps until the time budget is used. Returns True when the run has finished."""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if self._run_chunk():
+                return True
+            if self.waiting is not None:
+                # Inside the execute handler a short wait is cheaper than switching to chunks
+                if not concurrent.futures.wait([self.waiting], timeout=max(deadline - time.perf_counter(), 0)).done:
+                    return False
+                self.waiting = None
+        return False
+
+    def _run_chunk(self) -> bool:
+        """Run one chunk of steps and adapt the chunk size. Returns True when the run has finished."""
+        started = time.perf_counter()
+        executed = 0
+        try:
+            for _ in range(self.chunk_size):
+                step = next(self.steps)
+                if isinstance(step, Wait):
+                    self.waiting = step.future
+                    break
+                self.done, self.total = step
+                executed += 1
+        except StopIteration:
+            self._finish()
+            return True
+        except Exception as e:
+            error_msg = f'Error: {str(e)}'
+            adsk.core.Application.get().userInterface.messageBox(error_msg)
+            futil.log(error_msg, adsk.core.LogLevels.ErrorLogLevel)
+            futil.handle_error(f'{self.title} Failed')
+            self._finish()
+            return True
+
+        if not executed:
+            return False
+
+        # Exponential average of the cost per step keeps chunks near the target length
+        cost = (time.perf_counter() - started) / executed
+        self.step_seconds = cost if self.step_seconds is None else 0.7 * self.step_seconds + 0.3 * cost
+        self.chunk_size = max(1, int(TARGET_CHUNK_SECONDS / max(self.step_seconds, 1e-6)))
+        futil.count('chunks')
+        return False
+
+    def cancel(self):
+        """Stop the run and roll back what it created."""
+        futil.log(f'{self.title} cancelled after {self.done} of {self.total} steps')
+        self.waiting = None
+        # Closing the generator lets it clean up (GeneratorExit in the step function)
+        self.steps.close()
+        if self.timeline is not None:
+            self.rollback()
+        self._finish()
+        if self.timeline is not None:
+            msg = f'{self.title} cancelled. Changes were rolled back.'
+        else:
+            msg = f'{self.title} cancelled. {self.cancel_note}'
+        adsk.core.Application.get().userInterface.messageBox(msg)
+
+    def rollback(self):
+        """Delete the timeline items inserted since the run started, and nothing else.
+
+        They sit right after the marker position of the start, whether the
+        marker was at the end or rolled back; features after them belong to
+        the user and stay. The marker only moves back if the run moved it.
+        """
+        timeline = self.timeline
+        added = timeline.count - self.timeline_count
+        try:
+            if added == 1:
+                timeline.item(self.timeline_marker).entity.deleteMe()
+            elif added > 1:
+                group = timeline.timelineGroups.add(self.timeline_marker, self.timeline_marker + added - 1)
+                group.deleteMe(True)
+            if timeline.markerPosition != self.timeline_marker:
+                timeline.markerPosition = self.timeline_marker
+            futil.log(f'Timeline: {added} items of the run deleted')
+        except Exception as e:
+            futil.warning('Could not roll back the timeline: %s', e)
+
+    def _finish(self):
+        if self.progress:
+            self.progress.hide()
+            self.progress = None
+        if self.event:
+            adsk.core.Application.get().unregisterCustomEvent(CUSTOM_EVENT_ID)
+            self.event = None
+            local_handlers.clear()
+        if ChunkedRun.active is self:
+            ChunkedRun.active = None
+        if self.on_finish:
+            self.on_finish()
@@ -0,0 +1,82 @@
+import time
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+
+# Number of buffered wire bodies that triggers a flush
+DEFAULT_BATCH_SIZE = 200
+
+
+class SketchWriter:
+    """Batched curve writer for the output sketches of a run.
+
+    Every sketch opened through the writer has compute deferred until the
+    writer is closed, so adding curves does not re-solve the sketch each
+    time. Wire bodies (or simplified loops) are buffered and written to their
+    sketches in bulk.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.sketches = []
+        self.pending = []
+        self.curves_written = 0
+        self.write_time = 0.0
+
+    def open(self, sketch: adsk.fusion.Sketch):
+        """Defer compute on a sketch for the rest of the run."""
+        sketch.isComputeDeferred = True
+        self.sketches.append(sketch)
+        return sketch
+
+    def add(self, sketch: adsk.fusion.Sketch, wire_bodies: list):
+        """Queue wire bodies for a sketch. Returns the number of curves queued."""
+        queued = 0
+        for wire_body in wire_bodies:
+            self.pending.append((sketch, wire_body))
+            queued += wire_body.edges.count
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return queued
+
+    def add_loops(self, sketch: adsk.fusion.Sketch, loops: list):
+        """Queue fitted loops (from loops.polylines_to_loops or mesh_slicing.to_loops) for a sketch. Returns the number of curves queued."""
+        self.pending.append((sketch, loops))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return sum(len(segments) for segments in loops)
+
+    def discard(self, sketch: adsk.fusion.Sketch):
+        """Forget a sketch (and anything queued for it) before it is deleted."""
+        self.pending = [(target, geometry) for target, geometry in self.pending if target != sketch]
+        if sketch in self.sketches:
+            self.sketches.remove(sketch)
+
+    def flush(self):
+        """Write all queued curves."""
+        if not self.pending:
+            return
+        started = time.perf_counter()
+        for sketch, geometry in self.pending:
+            if isinstance(geometry, list):
+                self.curves_written += slicing.add_loops_to_sketch(geometry, sketch)
+            else:
+                self.curves_written += slicing.add_wire_body_to_sketch(geometry, sketch)
+        self.pending = []
+        self.write_time += time.perf_counter() - started
+
+    def close(self):
+        """Flush and let every sketch compute once."""
+        self.flush()
+        started = time.perf_counter()
+        for sketch in self.sketches:
+            try:
+                sketch.isComputeDeferred = False
+            except Exception as e:
+                futil.warning('  ✗ Could not resume compute on %s: %s', sketch.name, e)
+        self.write_time += time.perf_counter() - started
+        self.sketches = []
+
+        rate = self.curves_written / self.write_time if self.write_time > 0 else 0.0
+        futil.log(f'Sketch writer: {self.curves_written} curves in {self.write_time:.2f} s ({rate:.0f} curves/s)')
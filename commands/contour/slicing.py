@@ -0,0 +1,287 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import sampling
+
+# Slicing engines
+ENGINE_TEMPORARY_BREP = 'Temporary BRep'
+ENGINE_CONSTRUCTION_PLANES = 'Construction Planes'
+
+AXIS_VECTORS = {
+    'X': (1.0, 0.0, 0.0),
+    'Y': (0.0, 1.0, 0.0),
+    'Z': (0.0, 0.0, 1.0),
+}
+
+# Directions closer than this (dot product) to a coordinate axis snap to it
+AXIS_SNAP = 0.999
+
+
+def _dot(a, b) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b) -> tuple:
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _unit(vector) -> tuple:
+    length = _dot(vector, vector) ** 0.5
+    return tuple(value / length for value in vector)
+
+
+class SliceAxis:
+    """Direction of the slice planes and the frame they share.
+
+    A position is the signed distance along the unit normal, so the plane at
+    position p passes through normal * p. u and v span the planes: for the
+    coordinate axes they are the other two world axes in XYZ order (as the
+    export always used), for any other direction a fixed orthonormal pair.
+    The frame is computed once here, so a slice only has to offset it.
+    """
+
+    def __init__(self, normal, name: str = None):
+        self.normal = _unit(normal)
+        self.name = name or 'Custom'
+        if name in AXIS_VECTORS:
+            self.u, self.v = [vector for axis, vector in AXIS_VECTORS.items() if axis != name]
+        else:
+            # Cross with the world axis least aligned with the normal for a stable u
+            helper = min(AXIS_VECTORS.values(), key=lambda vector: abs(_dot(vector, self.normal)))
+            self.u = _unit(_cross(helper, self.normal))
+            self.v = _cross(self.normal, self.u)
+
+    @staticmethod
+    def between(start_point: adsk.core.Point3D, end_point: adsk.core.Point3D):
+        """The axis from start to end and the start and end positions along it, or (None, None, None) if they coincide."""
+        direction = start_point.vectorTo(end_point)
+        if direction.length < 1e-9:
+            return None, None, None
+        direction.normalize()
+        # Coordinate axes keep their positive direction, so positions along them stay world coordinates
+        axis = SliceAxis(direction.asArray())
+        for name, vector in AXIS_VECTORS.items():
+            if abs(_dot(vector, direction.asArray())) > AXIS_SNAP:
+                axis = SliceAxis(vector, name)
+                break
+        return axis, axis.coordinate(start_point.asArray()), axis.coordinate(end_point.asArray())
+
+    @property
+    def index(self):
+        """Index of the coordinate axis, or None for other directions."""
+        return 'XYZ'.index(self.name) if self.name in AXIS_VECTORS else None
+
+    def key(self) -> tuple:
+        return tuple(round(value, 9) for value in self.normal)
+
+    def coordinate(self, point) -> float:
+        """Position of an (x, y, z) point along the axis."""
+        return _dot(self.normal, point)
+
+    def flatten(self, point) -> tuple:
+        """(u, v) coordinates of an (x, y, z) point in the slice planes."""
+        return _dot(self.u, point), _dot(self.v, point)
+
+    def point(self, position: float, u: float = 0.0, v: float = 0.0) -> tuple:
+        """The (x, y, z) point at in-plane coordinates (u, v) of the plane at position."""
+        return tuple(self.normal[k] * position + self.u[k] * u + self.v[k] * v for k in range(3))
+
+    def plane(self, position: float) -> adsk.core.Plane:
+        """A transient world-space plane at the position."""
+        return adsk.core.Plane.create(adsk.core.Point3D.create(*self.point(position)), adsk.core.Vector3D.create(*self.normal))
+
+    def corners(self, body) -> list:
+        """(x, y, z) corners of the world bounding box of a body."""
+        box = body.boundingBox
+        low, high = box.minPoint.asArray(), box.maxPoint.asArray()
+        return [(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+
+    def extent(self, body) -> tuple:
+        """(min, max) extent of a body along the axis.
+
+        Exact bounding box extents for the coordinate axes; for other
+        directions the measure manager's box oriented along the axis, or the
+        projected world box (slightly larger) when that is not available.
+        """
+        if self.index is not None:
+            box = body.boundingBox
+            return box.minPoint.asArray()[self.index], box.maxPoint.asArray()[self.index]
+        try:
+            box = adsk.core.Application.get().measureManager.getOrientedBoundingBox(
+                body, adsk.core.Vector3D.create(*self.normal), adsk.core.Vector3D.create(*self.u))
+            center = self.coordinate(box.centerPoint.asArray())
+            return center - box.length / 2, center + box.length / 2
+        except:
+            values = [self.coordinate(corner) for corner in self.corners(body)]
+            return min(values), max(values)
+
+    def plane_bounds(self, bodies) -> tuple:
+        """(min u, min v, max u, max v) of the bodies in the slice planes."""
+        flat = [self.flatten(corner) for body in bodies for corner in self.corners(body)]
+        return (min(u for u, _ in flat), min(v for _, v in flat), max(u for u, _ in flat), max(v for _, v in flat))
+
+    def __str__(self):
+        if self.index is not None:
+            return self.name
+        return f'({self.normal[0]:.4f}, {self.normal[1]:.4f}, {self.normal[2]:.4f})'
+
+
+def intersect_bodies_with_plane(bodies, plane: adsk.core.Plane) -> list:
+    """Intersect bodies with a plane without touching the timeline.
+
+    Returns a list of temporary wire bodies, one per body that the plane cuts.
+    """
+    tempBRep = adsk.fusion.TemporaryBRepManager.get()
+    wire_bodies = []
+    for body in bodies:
+        try:
+            wire_body = tempBRep.planeIntersection(body, plane)
+        except Exception as e:
+            futil.warning('  ✗ planeIntersection error: %s', e)
+            continue
+        if wire_body and wire_body.edges.count > 0:
+            wire_bodies.append(wire_body)
+    return wire_bodies
+
+
+def get_point_from_selection(entity) -> adsk.core.Point3D:
+    """Extract Point3D from various selection types."""
+    if hasattr(entity, 'geometry'):
+        geom = entity.geometry
+        if isinstance(geom, adsk.core.Point3D):
+            return geom.copy()
+    if hasattr(entity, 'worldGeometry'):
+        return entity.worldGeometry.copy()
+    if isinstance(entity, adsk.fusion.BRepVertex):
+        return entity.geometry.copy()
+    if isinstance(entity, adsk.fusion.SketchPoint):
+        return entity.geometry.copy()
+
+    raise ValueError(f'Cannot extract point from {type(entity)}')
+
+
+def add_wire_body_to_sketch(wire_body: adsk.fusion.BRepBody, sketch: adsk.fusion.Sketch, created: list = None) -> int:
+    """Write the edges of a temporary wire body into a sketch. Returns the number of curves added.
+
+    created -- When given, the new sketch curves are appended to it.
+    """
+    # Move the whole wire body into sketch space once instead of converting every point
+    toSketch = sketch.transform.copy()
+    toSketch.invert()
+    adsk.fusion.TemporaryBRepManager.get().transform(wire_body, toSketch)
+
+    curves_added = 0
+    for edge in wire_body.edges:
+        try:
+            curve = add_curve_to_sketch(edge.geometry, sketch)
+            if curve:
+                curves_added += 1
+                if created is not None:
+                    created.append(curve)
+        except Exception as e:
+            futil.warning('  ✗ Could not add %s: %s', type(edge.geometry).__name__, e)
+    return curves_added
+
+
+def _sketch_point_at(curve, point: adsk.core.Point3D):
+    """The end of a sketch curve that lies at the point (arcs may come out reversed)."""
+    start, end = curve.startSketchPoint, curve.endSketchPoint
+    return start if start.geometry.distanceTo(point) <= end.geometry.distanceTo(point) else end
+
+
+def add_loops_to_sketch(loops: list, sketch: adsk.fusion.Sketch, created: list = None) -> int:
+    """Write loops from loops.fit_segments into a sketch as connected curves.
+
+    Consecutive curves share their sketch points, so closed loops come out as
+    profiles. Returns the number of curves added.
+    created -- When given, the new sketch curves are appended to it.
+    """
+    toSketch = sketch.transform.copy()
+    toSketch.invert()
+    cells = toSketch.asArray()
+    sketchCurves = sketch.sketchCurves
+
+    curves_added = 0
+    for segments in loops:
+        try:
+            closed = segments[0][0] != 'circle' and segments[-1][-1] == segments[0][1]
+            first = previous = None
+            for k, segment in enumerate(segments):
+                # Circles carry (center, radius), lines and arcs only points
+                coords = segment[1:2] if segment[0] == 'circle' else segment[1:]
+                points = [adsk.core.Point3D.create(*pt) for pt in sampling.transform_points(cells, coords)]
+                if segment[0] == 'circle':
+                    curve = sketchCurves.sketchCircles.addByCenterRadius(points[0], segment[2])
+                    curves_added += 1
+                    if created is not None:
+                        created.append(curve)
+                    continue
+
+                start = previous or points[0]
+                end = first if (closed and k == len(segments) - 1) else points[-1]
+                if segment[0] == 'line':
+                    curve = sketchCurves.sketchLines.addByTwoPoints(start, end)
+                else:
+                    curve = sketchCurves.sketchArcs.addByThreePoints(start, points[1], end)
+                curves_added += 1
+                if created is not None:
+                    created.append(curve)
+                if first is None:
+                    first = _sketch_point_at(curve, points[0])
+                previous = _sketch_point_at(curve, points[-1])
+        except Exception as e:
+            futil.warning('  ✗ Could not add loop: %s', e)
+    return curves_added
+
+
+def add_curve_to_sketch(curve: adsk.core.Curve3D, sketch: adsk.fusion.Sketch):
+    """Add a sketch-space Curve3D to a sketch using the matching sketch curve type."""
+    sketchCurves = sketch.sketchCurves
+
+    if isinstance(curve, adsk.core.Line3D):
+        return sketchCurves.sketchLines.addByTwoPoints(curve.startPoint, curve.endPoint)
+
+    if isinstance(curve, adsk.core.Arc3D):
+        evaluator = curve.evaluator
+        _, startParam, endParam = evaluator.getParameterExtents()
+        _, midPt = evaluator.getPointAtParameter((startParam + endParam) / 2)
+        return sketchCurves.sketchArcs.addByThreePoints(curve.startPoint, midPt, curve.endPoint)
+
+    if isinstance(curve, adsk.core.Circle3D):
+        return sketchCurves.sketchCircles.addByCenterRadius(curve.center, curve.radius)
+
+    if isinstance(curve, adsk.core.Ellipse3D):
+        majorAxis = curve.majorAxis.copy()
+        majorAxis.normalize()
+        minorAxis = curve.normal.crossProduct(majorAxis)
+        minorAxis.normalize()
+        majorAxisPt = curve.center.copy()
+        majorAxis.scaleBy(curve.majorRadius)
+        majorAxisPt.translateBy(majorAxis)
+        minorAxisPt = curve.center.copy()
+        minorAxis.scaleBy(curve.minorRadius)
+        minorAxisPt.translateBy(minorAxis)
+        return sketchCurves.sketchEllipses.add(curve.center, majorAxisPt, minorAxisPt)
+
+    # Everything else (NURBS, elliptical arcs, ...) goes in as a fixed spline
+    if isinstance(curve, adsk.core.NurbsCurve3D):
+        nurbs = curve
+    else:
+        nurbs = curve.asNurbsCurve
+    return sketchCurves.sketchFixedSplines.addByNurbsCurve(nurbs)
+
+
+def wire_body_to_polylines(wire_body: adsk.fusion.BRepBody, tolerance: float = 0.01) -> list:
+    """Stroke the edges of a wire body into plain polylines.
+
+    Returns one list of (x, y, z) tuples per edge so the data can be cached,
+    drawn or exported without holding on to API objects.
+    """
+    polylines = []
+    for edge in wire_body.edges:
+        evaluator = edge.evaluator
+        _, startParam, endParam = evaluator.getParameterExtents()
+        ok, points = evaluator.getStrokes(startParam, endParam, tolerance)
+        if ok and len(points) >= 2:
+            polylines.append([(pt.x, pt.y, pt.z) for pt in points])
+    return polylines
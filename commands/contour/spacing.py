@@ -0,0 +1,130 @@
+import bisect
+import math
+from ...lib import fusionAddInUtils as futil
+from . import slicing
+from .body_index import TOLERANCE, BodyIntervalIndex
+from .cache import slice_cache
+from . import mesh_slicing
+
+# Slice spacing modes
+SPACING_UNIFORM = 'Uniform'
+SPACING_ADAPTIVE = 'Adaptive'
+
+# Stroke tolerance (cm) for measuring sections
+MEASURE_TOLERANCE = 0.01
+
+
+def uniform_positions(start_coord: float, end_coord: float, divisions: int) -> list:
+    """Evenly spaced positions from start to end (divisions + 1 of them)."""
+    axis_interval = (end_coord - start_coord) / divisions
+    return [start_coord + (axis_interval * i) for i in range(divisions + 1)]
+
+
+def measure_section(wire_bodies: list, axis: slicing.SliceAxis) -> tuple:
+    """Enclosed area, perimeter and loop count of a section.
+
+    The area of every wire is computed with the shoelace formula on its
+    stroked coedges, oriented along the wire, and summed without sign.
+    """
+    area = 0.0
+    perimeter = 0.0
+    loops = 0
+    for wire_body in wire_bodies:
+        for wire in wire_body.wires:
+            signed_area = 0.0
+            for coEdge in wire.coEdges:
+                edge = coEdge.edge
+                perimeter += edge.length
+                evaluator = edge.evaluator
+                _, startParam, endParam = evaluator.getParameterExtents()
+                ok, points = evaluator.getStrokes(startParam, endParam, MEASURE_TOLERANCE)
+                if not ok:
+                    continue
+                coords = [axis.flatten(pt.asArray()) for pt in points]
+                if coEdge.isOpposedToEdge:
+                    coords.reverse()
+                for (au, av), (bu, bv) in zip(coords, coords[1:]):
+                    signed_area += au * bv - bu * av
+            area += abs(signed_area) / 2
+            loops += 1
+    return area, perimeter, loops
+
+
+def section_deviation(first: tuple, second: tuple) -> float:
+    """Estimate how far the surface moves sideways between two sections (cm).
+
+    Offsetting a contour by d changes its area by about perimeter * d and its
+    perimeter by about 2 * pi * d, so both changes are turned into a distance.
+    A change in the number of loops (a feature starts or ends) is infinite.
+    """
+    area_a, perimeter_a, loops_a = first
+    area_b, perimeter_b, loops_b = second
+    if loops_a != loops_b:
+        return math.inf
+    perimeter = max(perimeter_a, perimeter_b)
+    if perimeter <= 0:
+        return 0.0
+    return max(abs(area_a - area_b) / perimeter, abs(perimeter_a - perimeter_b) / (2 * math.pi))
+
+
+class AdaptiveSpacing:
+    """Place slices densely where the section changes and sparsely where it does not.
+
+    Works like adaptive layer height in slicers: starting at the first
+    position, the next step is tried at the current spacing. If the section
+    moves by more than max_deviation the step is halved (down to
+    min_spacing); while it stays well below, the spacing doubles again (up to
+    max_spacing). A step that crosses the start or end of a body counts as a
+    topology change, so bodies between two similar sections are not skipped.
+    Sections come from the slice cache, so the positions that are kept are
+    already intersected when the run slices them.
+    """
+
+    def __init__(self, max_deviation: float, min_spacing: float, max_spacing: float):
+        self.max_deviation = max_deviation
+        self.min_spacing = min_spacing
+        self.max_spacing = max(max_spacing, min_spacing)
+        self.measured = 0
+
+    def measure(self, body_index: BodyIntervalIndex, axis: slicing.SliceAxis, position: float) -> tuple:
+        self.measured += 1
+        # Mesh sections are not measured; their start and end still refine the spacing
+        candidates = mesh_slicing.partition_bodies(body_index.query(position))[0]
+        if not candidates:
+            return 0.0, 0.0, 0
+        return measure_section(slice_cache.intersect(candidates, axis, position), axis)
+
+    def positions(self, bodies, axis: slicing.SliceAxis, start_coord: float, end_coord: float) -> list:
+        """Slice positions from start to end, both included."""
+        body_index = BodyIntervalIndex(bodies, axis)
+        direction = 1.0 if end_coord >= start_coord else -1.0
+        boundaries = sorted(value for body in bodies for value in axis.extent(body))
+
+        position = start_coord
+        section = self.measure(body_index, axis, position)
+        positions = [position]
+        step = self.max_spacing
+        while abs(end_coord - position) > TOLERANCE:
+            step = min(step, abs(end_coord - position))
+            candidate = position + direction * step
+            can_refine = step > self.min_spacing + TOLERANCE
+            low, high = sorted((position, candidate))
+            crosses_body = bisect.bisect_right(boundaries, low + TOLERANCE) < bisect.bisect_left(boundaries, high - TOLERANCE)
+            if crosses_body and can_refine:
+                step = max(self.min_spacing, step / 2)
+                continue
+
+            candidate_section = self.measure(body_index, axis, candidate)
+            deviation = math.inf if crosses_body else section_deviation(section, candidate_section)
+            if deviation > self.max_deviation and can_refine:
+                # Too coarse here: try again closer
+                step = max(self.min_spacing, step / 2)
+                continue
+
+            positions.append(candidate)
+            position, section = candidate, candidate_section
+            if deviation < self.max_deviation / 2:
+                step = min(self.max_spacing, step * 2)
+
+        futil.log(f'Adaptive spacing: {len(positions)} positions from {self.measured} measured sections')
+        return positions
@@ -0,0 +1,236 @@
+import bisect
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from .body_index import TOLERANCE
+from . import slicing
+
+# Split methods
+SPLIT_METHOD_SINGLE_FEATURE = 'Single Feature per Body'
+SPLIT_METHOD_BISECTION = 'Plane by Plane'
+
+
+class SplitScheduler:
+    """Split selected bodies with parallel planes by recursive bisection.
+
+    Only the lineage of the selected bodies is tracked. Every fragment carries
+    the sub-range of plane indices that lie strictly inside its extent and is
+    split at the median plane of that range first, so each fragment only ever
+    sees the planes it actually spans.
+    """
+
+    def __init__(self, positions: list, axis: slicing.SliceAxis, plane_factory):
+        """
+        positions -- Sorted plane positions along the slice axis.
+        plane_factory -- Called with a plane index, returns the splitting tool.
+                         Planes are only requested when a fragment needs them.
+        """
+        self.positions = positions
+        self.axis = axis
+        self.plane_factory = plane_factory
+        self.planes = {}
+        self.total_splits = 0
+        self.failed_splits = 0
+
+    def get_plane(self, index: int):
+        plane = self.planes.get(index)
+        if plane is None:
+            plane = self.plane_factory(index)
+            self.planes[index] = plane
+        return plane
+
+    def planes_inside(self, body, lo: int, hi: int):
+        """Narrow [lo, hi) to the planes strictly inside the body's extent."""
+        low, high = self.axis.extent(body)
+        inner_lo = bisect.bisect_right(self.positions, low + TOLERANCE, lo, hi)
+        inner_hi = bisect.bisect_left(self.positions, high - TOLERANCE, inner_lo, hi)
+        return inner_lo, inner_hi
+
+    def count_splits(self, body) -> int:
+        """Number of split operations a body needs (one per plane it spans, for convex bodies)."""
+        lo, hi = self.planes_inside(body, 0, len(self.positions))
+        return hi - lo
+
+    def iter_split(self, body):
+        """Split one selected body, yielding after every split operation. Returns the resulting fragments."""
+        parentComp = body.parentComponent
+        splitFeatures = parentComp.features.splitBodyFeatures
+        context = body.assemblyContext
+
+        fragments = []
+        pending = [(body, 0, len(self.positions))]
+        while pending:
+            fragment, lo, hi = pending.pop()
+            lo, hi = self.planes_inside(fragment, lo, hi)
+            if lo >= hi:
+                fragments.append(fragment)
+                continue
+
+            median = (lo + hi) // 2
+            try:
+                plane = self.get_plane(median)
+                with futil.phase('splitFeatures.add', median):
+                    splitInput = splitFeatures.createInput(fragment, plane, True)
+                    splitFeature = splitFeatures.add(splitInput)
+            except Exception as e:
+                self.failed_splits += 1
+                futil.warning('    ✗ Split at plane %d failed: %s', median + 1, e)
+                fragments.append(fragment)
+                continue
+
+            self.total_splits += 1
+            pieces = list(splitFeature.bodies)
+            if context:
+                pieces = [piece.createForAssemblyContext(context) for piece in pieces]
+
+            # Each piece continues with the planes on its side of the median
+            for piece in pieces:
+                low, high = self.axis.extent(piece)
+                if (low + high) / 2 < self.positions[median]:
+                    pending.append((piece, lo, median))
+                else:
+                    pending.append((piece, median + 1, hi))
+            yield
+
+        return fragments
+
+
+def unique_native_bodies(bodies) -> list:
+    """The first of the bodies for every native body.
+
+    Occurrences of one component share their geometry, so splitting the body
+    through one occurrence splits it in all of them.
+    """
+    unique = {}
+    for body in bodies:
+        unique.setdefault((body.nativeObject or body).entityToken, body)
+    if len(unique) < len(bodies):
+        futil.log(f'Occurrences: {len(bodies)} bodies share {len(unique)} native bodies; each is split once')
+    return list(unique.values())
+
+
+def create_sheet_tool(body, positions: list, axis: slicing.SliceAxis):
+    """Build one temporary multi-sheet body with a planar sheet at every position.
+
+    Each sheet is a rectangle in the slice plane covering the body's bounding
+    box (plus margin), so the whole plane stack can be used as a single
+    splitting tool.
+    """
+    tempBRep = adsk.fusion.TemporaryBRepManager.get()
+    min_u, min_v, max_u, max_v = axis.plane_bounds([body])
+    margin = max(max_u - min_u, max_v - min_v) * 0.1 + 0.1
+
+    tool = None
+    for position in positions:
+        corners = []
+        for cu, cv in ((min_u - margin, min_v - margin), (max_u + margin, min_v - margin),
+                       (max_u + margin, max_v + margin), (min_u - margin, max_v + margin)):
+            corners.append(adsk.core.Point3D.create(*axis.point(position, cu, cv)))
+        lines = [adsk.core.Line3D.create(corners[k], corners[(k + 1) % 4]) for k in range(4)]
+        wire, _ = tempBRep.createWireFromCurves(lines)
+        sheet = tempBRep.createFaceFromPlanarWires([wire])
+        if tool is None:
+            tool = sheet
+        else:
+            tempBRep.booleanOperation(tool, sheet, adsk.fusion.BooleanTypes.UnionBooleanType)
+
+    # Tools live in the component of the body, so bring them into its local frame
+    context = body.assemblyContext
+    if tool and context:
+        toLocal = context.transform2.copy()
+        toLocal.invert()
+        tempBRep.transform(tool, toLocal)
+    return tool
+
+
+def split_bodies_single_feature_steps(bodies, positions: list, axis: slicing.SliceAxis):
+    """Split each body once with a combined sheet tool holding all of its planes.
+
+    The sheets of a component's bodies share one tool body, added through a
+    base feature and removed by a single Remove feature once the splits are
+    done (one per occurrence when bodies of one component are selected
+    through several). Yields (steps done, steps total) after every tool and
+    every split; the total is refined once it is known which bodies need
+    splitting. Returns (fragment count, split operations, failed operations).
+    """
+    design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    isParametric = design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+
+    # Group the bodies that need splitting by the component that owns them. The sheets of all bodies
+    # seen through the same occurrence are merged into one tool, so a single Remove feature clears them
+    tempBRep = adsk.fusion.TemporaryBRepManager.get()
+    bodies = unique_native_bodies(bodies)
+    groups = {}
+    fragment_count = 0
+    done = 0
+    total = 2 * len(bodies)
+    for body in bodies:
+        done += 1
+        low, high = axis.extent(body)
+        inside = [p for p in positions if low + TOLERANCE < p < high - TOLERANCE]
+        if not inside:
+            fragment_count += 1
+            total -= 1
+            yield done, total
+            continue
+        nativeBody = body.nativeObject or body
+        comp, jobs, tools = groups.setdefault(nativeBody.parentComponent.id, (nativeBody.parentComponent, [], {}))
+        context = body.assemblyContext.fullPathName if body.assemblyContext else ''
+        with futil.phase('split tool creation'):
+            tool = create_sheet_tool(body, inside, axis)
+            if context in tools:
+                tempBRep.booleanOperation(tools[context], tool, adsk.fusion.BooleanTypes.UnionBooleanType)
+            else:
+                tools[context] = tool
+        jobs.append((nativeBody, context))
+        yield done, total
+
+    total_splits = 0
+    failed_splits = 0
+    for comp, jobs, tools in groups.values():
+        # Step 1: Materialize the tools of this component in a single base feature
+        with futil.phase('split tool materialization'):
+            baseFeature = None
+            if isParametric:
+                baseFeature = comp.features.baseFeatures.add()
+                baseFeature.name = 'Split Tools'
+                baseFeature.startEdit()
+            toolBodies = {}
+            for context, tool in tools.items():
+                toolBody = comp.bRepBodies.add(tool, baseFeature) if baseFeature else comp.bRepBodies.add(tool)
+                toolBody.name = 'Split Tool'
+                toolBodies[context] = toolBody
+            if baseFeature:
+                baseFeature.finishEdit()
+
+        # Step 2: One SplitBody feature per body
+        splitFeatures = comp.features.splitBodyFeatures
+        for nativeBody, context in jobs:
+            toolBody = toolBodies[context]
+            try:
+                with futil.phase('splitFeatures.add'):
+                    splitInput = splitFeatures.createInput(nativeBody, toolBody, False)
+                    splitFeature = splitFeatures.add(splitInput)
+                total_splits += 1
+                fragment_count += splitFeature.bodies.count
+                futil.debug('    ✓ Split %s into %d bodies', nativeBody.name, splitFeature.bodies.count)
+            except Exception as e:
+                failed_splits += 1
+                fragment_count += 1
+                futil.warning('    ✗ Split of %s failed: %s', nativeBody.name, e)
+            done += 1
+            yield done, total
+
+        # Step 3: The tools are only needed by the splits; remove them so the browser only shows the fragments
+        with futil.phase('split tool removal'):
+            for toolBody in toolBodies.values():
+                try:
+                    if isParametric:
+                        comp.features.removeFeatures.add(toolBody)
+                    else:
+                        toolBody.deleteMe()
+                except Exception as e:
+                    toolBody.isLightBulbOn = False
+                    futil.warning('    ✗ Could not remove split tool, hidden instead: %s', e)
+
+    return fragment_count, total_splits, failed_splits
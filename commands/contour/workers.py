@@ -0,0 +1,64 @@
+import collections
+import concurrent.futures
+from ... import config
+
+# Most jobs in flight at once; the main thread waits for the oldest beyond this,
+# which bounds the memory held by sections that are extracted but not written yet
+MAX_PENDING = 32
+
+
+class PostProcessor:
+    """Run pure-Python post-processing of slices off the main thread, in slice order.
+
+    The main thread extracts plain geometry (tuples and lists, never API
+    objects) and submits a function of it; a single worker thread runs the
+    jobs one after another in submission order, so jobs may append to the
+    same file or table. Results come back to the main thread through
+    ready(), oldest first, for the API writes. Step generators yield
+    scheduler.Wait(head()) while the oldest job is still running.
+
+    With config.POST_PROCESS_IN_THREAD off the jobs run inline at submit.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self.pool = None
+        if config.POST_PROCESS_IN_THREAD:
+            self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='contour-post')
+        self.pending = collections.deque()
+
+    def submit(self, key, function, *args):
+        """Queue function(*args); it comes back from ready() under the key."""
+        if self.pool is not None:
+            future = self.pool.submit(function, *args)
+        else:
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+        self.pending.append((key, future))
+
+    def full(self) -> bool:
+        return len(self.pending) >= self.max_pending
+
+    def head(self):
+        """Future of the oldest job, or None when nothing is pending."""
+        return self.pending[0][1] if self.pending else None
+
+    def ready(self):
+        """(key, future) of the finished jobs at the front of the queue, in submission order.
+
+        future.result() returns the job's result, or re-raises its error on the main thread.
+        """
+        while self.pending and self.pending[0][1].done():
+            yield self.pending.popleft()
+
+    def close(self):
+        """Drop jobs that have not started and wait for the running one."""
+        for _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
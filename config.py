@@ -17,5 +17,25 @@ DEBUG = True
 ADDIN_NAME = os.path.basename(os.path.dirname(__file__))
 COMPANY_NAME = 'ACME'
 
+# Upper bound (in MB) for the in-memory slice cache that lets re-running
+# Contour reuse intersections of bodies and planes that have not changed.
+SLICE_CACHE_MAX_MB = 256
+
+# Folder and size cap (in MB) of the on-disk slice cache, which keeps stroked
+# sections of unchanged bodies between sessions. Set the folder to None to
+# turn it off.
+SLICE_DISK_CACHE_FOLDER = os.path.join(os.path.dirname(__file__), 'cache')
+SLICE_DISK_CACHE_MAX_MB = 512
+
+# Simplify loops, measure sections and write export files on a worker thread
+# while the main thread keeps intersecting. Set to False to run them inline.
+POST_PROCESS_IN_THREAD = True
+
+# Folder that receives a JSON and a CSV timing report (per phase and per
+# slice) for every Contour run, e.g. os.path.join(os.path.dirname(__file__),
+# 'reports'). Reports are never deleted, so this is off (None) by default and
+# only the phase summary is logged.
+PROFILE_REPORT_FOLDER = None
+
 # Palettes
 sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
\ No newline at end of file
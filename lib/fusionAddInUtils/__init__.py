@@ -1,2 +1,4 @@
+from .log_utils import *
+from .profile_utils import *
 from .general_utils import *
 from .event_utils import *
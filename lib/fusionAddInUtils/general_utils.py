@@ -12,9 +12,7 @@
 import os
 import traceback
 import adsk.core
-
-app = adsk.core.Application.get()
-ui = app.userInterface
+from .log_utils import is_buffering, buffer_message, flush_log, INFO_LEVEL, WARNING_LEVEL
 
 # Attempt to read DEBUG flag from parent config.
 try:
@@ -31,19 +29,30 @@ def log(message: str, level: adsk.core.LogLevels = adsk.core.LogLevels.InfoLogLe
     message -- The message to log.
     level -- The logging severity level.
     force_console -- Forces the message to be written to the Text Command window. 
+
+    While a run is active (see log_run) messages are collected in a ring buffer
+    and written out once at the end. Errors flush the buffer and are written
+    immediately.
     """    
+    if is_buffering() and not force_console and level != adsk.core.LogLevels.ErrorLogLevel:
+        buffer_message(message, WARNING_LEVEL if level == adsk.core.LogLevels.WarningLogLevel else INFO_LEVEL)
+        return
+
+    # Keep anything buffered ahead of this message.
+    flush_log()
+
     # Always print to console, only seen through IDE.
     print(message)  
 
     # Log all errors to Fusion log file.
     if level == adsk.core.LogLevels.ErrorLogLevel:
         log_type = adsk.core.LogTypes.FileLogType
-        app.log(message, level, log_type)
+        adsk.core.Application.get().log(message, level, log_type)
 
     # If config.DEBUG is True write all log messages to the console.
     if DEBUG or force_console:
         log_type = adsk.core.LogTypes.ConsoleLogType
-        app.log(message, level, log_type)
+        adsk.core.Application.get().log(message, level, log_type)
 
 
 def handle_error(name: str, show_message_box: bool = False):
@@ -61,4 +70,4 @@ def handle_error(name: str, show_message_box: bool = False):
 
     # If desired you could show an error as a message box.
     if show_message_box:
-        ui.messageBox(f'{name}\n{traceback.format_exc()}')
+        adsk.core.Application.get().userInterface.messageBox(f'{name}\n{traceback.format_exc()}')
@@ -0,0 +1,141 @@
+import collections
+import contextlib
+import time
+import adsk.core
+
+# Attempt to read DEBUG flag from parent config.
+try:
+    from ... import config
+    DEBUG = config.DEBUG
+except:
+    DEBUG = False
+
+# Severity levels, lowest to highest. DEBUG messages are dropped before they
+# are formatted unless the add-in runs in Debug mode.
+DEBUG_LEVEL = 10
+INFO_LEVEL = 20
+WARNING_LEVEL = 30
+ERROR_LEVEL = 40
+
+# Maximum number of messages kept in the ring buffer during a run
+BUFFER_SIZE = 5000
+
+_FUSION_LEVELS = {
+    DEBUG_LEVEL: adsk.core.LogLevels.InfoLogLevel,
+    INFO_LEVEL: adsk.core.LogLevels.InfoLogLevel,
+    WARNING_LEVEL: adsk.core.LogLevels.WarningLogLevel,
+    ERROR_LEVEL: adsk.core.LogLevels.ErrorLogLevel,
+}
+
+_threshold = DEBUG_LEVEL if DEBUG else INFO_LEVEL
+_buffer = collections.deque(maxlen=BUFFER_SIZE)
+_run = None
+
+
+def set_log_level(level: int):
+    """Sets the lowest level that is recorded."""
+    global _threshold
+    _threshold = level
+
+
+def is_enabled(level: int) -> bool:
+    """Returns True if messages of the given level are recorded."""
+    return level >= _threshold
+
+
+def debug(message: str, *args):
+    """Logs a debug message. The arguments are only formatted (message % args) if it is recorded."""
+    if DEBUG_LEVEL >= _threshold:
+        _record(DEBUG_LEVEL, message, args)
+
+
+def info(message: str, *args):
+    """Logs an info message. The arguments are only formatted (message % args) if it is recorded."""
+    if INFO_LEVEL >= _threshold:
+        _record(INFO_LEVEL, message, args)
+
+
+def warning(message: str, *args):
+    """Logs a warning message. The arguments are only formatted (message % args) if it is recorded."""
+    if WARNING_LEVEL >= _threshold:
+        _record(WARNING_LEVEL, message, args)
+
+
+def count(name: str, amount: int = 1):
+    """Adds to a named counter of the current run. Counters are reported once in the run summary
+    instead of logging a line per item."""
+    if _run is not None:
+        _run['counters'][name] += amount
+
+
+def is_buffering() -> bool:
+    """Returns True while a run is active and messages go to the ring buffer."""
+    return _run is not None
+
+
+def buffer_message(message: str, level: int = INFO_LEVEL):
+    """Adds an already formatted message to the ring buffer of the current run."""
+    _record(level, message, ())
+
+
+def begin_run(name: str):
+    """Starts buffering messages for a command run."""
+    global _run
+    flush_log()
+    _run = {'name': name, 'started': time.perf_counter(), 'counters': collections.Counter(), 'dropped': 0}
+
+
+def end_run():
+    """Appends the run summary and flushes the buffer."""
+    global _run
+    if _run is None:
+        return
+    summary = f'--- {_run["name"]}: {time.perf_counter() - _run["started"]:.2f} s'
+    for name, value in sorted(_run['counters'].items()):
+        summary += f', {name}: {value}'
+    if _run['dropped']:
+        summary += f' ({_run["dropped"]} older messages dropped)'
+    _buffer.append((INFO_LEVEL, summary, ()))
+    _run = None
+    flush_log()
+
+
+@contextlib.contextmanager
+def log_run(name: str):
+    """Buffers all messages logged inside the block and writes them out once at the end,
+    followed by a one line summary of the run's counters."""
+    begin_run(name)
+    try:
+        yield
+    finally:
+        end_run()
+
+
+def flush_log():
+    """Writes all buffered messages in one block."""
+    if not _buffer:
+        return
+    level = max(entry[0] for entry in _buffer)
+    lines = []
+    for _, message, args in _buffer:
+        lines.append(message % args if args else message)
+    _buffer.clear()
+    _emit('\n'.join(lines), level)
+
+
+def _record(level: int, message: str, args: tuple):
+    if _run is None:
+        _emit(message % args if args else message, level)
+        return
+    if len(_buffer) == _buffer.maxlen:
+        _run['dropped'] += 1
+    _buffer.append((level, message, args))
+
+
+def _emit(text: str, level: int):
+    # Always print to console, only seen through IDE.
+    print(text)
+
+    # If config.DEBUG is True write the block to the Text Command window.
+    if DEBUG:
+        adsk.core.Application.get().log(text, _FUSION_LEVELS[level], adsk.core.LogTypes.ConsoleLogType)
@@ -0,0 +1,136 @@
+import contextlib
+import csv
+import functools
+import json
+import os
+import time
+from datetime import datetime
+import adsk.core
+
+from .log_utils import info, warning
+
+
+class RunProfile:
+    """Wall time and call counts of the phases of one command run, in total and per slice."""
+
+    def __init__(self, name: str, metadata: dict):
+        self.name = name
+        self.metadata = dict(metadata)
+        self.started = time.perf_counter()
+        self.timestamp = datetime.now()
+        self.phases = {}
+        self.slices = {}
+        self.per_slice = True
+
+    def record(self, phase_name: str, seconds: float, slice_index: int = None):
+        totals = self.phases.setdefault(phase_name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        if slice_index is not None and self.per_slice:
+            per_slice = self.slices.setdefault(slice_index, {}).setdefault(phase_name, [0, 0.0])
+            per_slice[0] += 1
+            per_slice[1] += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'timestamp': self.timestamp.isoformat(timespec='seconds'),
+            'total_seconds': time.perf_counter() - self.started,
+            'metadata': self.metadata,
+            'phases': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in self.phases.items()},
+            'slices': {str(index): {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in phases.items()}
+                       for index, phases in sorted(self.slices.items())},
+        }
+
+
+_profile = None
+
+
+def begin_profile(name: str, **metadata):
+    """Starts recording phases for a run. Metadata (mode, divisions, ...) goes into the report."""
+    global _profile
+    metadata.setdefault('fusion_version', adsk.core.Application.get().version)
+    _profile = RunProfile(name, metadata)
+
+
+def add_profile_metadata(**metadata):
+    """Adds metadata to the report of the current run."""
+    if _profile is not None:
+        _profile.metadata.update(metadata)
+
+
+def record_slices(enabled: bool):
+    """Turns the per-slice records of the current run on or off; phase totals are always kept.
+    Runs with thousands of slices turn them off so the profile does not grow with the slice count."""
+    if _profile is not None:
+        _profile.per_slice = enabled
+        _profile.metadata['per_slice'] = enabled
+
+
+@contextlib.contextmanager
+def phase(name: str, slice_index: int = None):
+    """Times the block as one call of the named phase (and of the slice, if given).
+    Does nothing when no run is being profiled."""
+    if _profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _profile.record(name, time.perf_counter() - started, slice_index)
+
+
+def profiled(name: str = None):
+    """Decorator that times every call of the function as a phase (defaults to the function name)."""
+    def decorator(func):
+        phase_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(phase_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def end_profile(folder: str = None):
+    """Stops recording, logs a per-phase summary and writes the JSON and CSV reports to the folder.
+
+    :returns:
+        The path of the JSON report, or None if nothing was written.
+    """
+    global _profile
+    if _profile is None:
+        return None
+    profile, _profile = _profile, None
+    report = profile.as_dict()
+
+    summary = f'Profile {profile.name}: {report["total_seconds"]:.2f} s'
+    for name, (calls, seconds) in sorted(profile.phases.items(), key=lambda item: -item[1][1]):
+        summary += f'\n  {name}: {seconds:.3f} s / {calls} calls'
+    info(summary)
+
+    if not folder:
+        return None
+    try:
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, f'{profile.timestamp:%Y%m%d-%H%M%S}_{profile.name.replace(" ", "_")}')
+
+        with open(f'{base}.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        with open(f'{base}.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['slice', 'phase', 'calls', 'seconds'])
+            for name, (calls, seconds) in profile.phases.items():
+                writer.writerow(['all', name, calls, f'{seconds:.6f}'])
+            for index, phases in sorted(profile.slices.items()):
+                for name, (calls, seconds) in phases.items():
+                    writer.writerow([index, name, calls, f'{seconds:.6f}'])
+    except OSError as e:
+        warning('Could not write profile report: %s', e)
+        return None
+
+    info('Profile report written to %s.json', base)
+    return f'{base}.json'
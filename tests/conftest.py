@@ -0,0 +1,33 @@
+"""Run the pure-Python parts of the add-in outside Fusion.
+
+The add-in modules import adsk at the top, so the tests put the simulated
+adsk package of the offline benchmarks on the path (as run_benchmarks.py
+does) and import the add-in as a package named after its folder.
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADDIN_DIR = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ADDIN_DIR, 'benchmarks', 'offline', 'fake_adsk'))
+sys.path.insert(0, os.path.dirname(ADDIN_DIR))
+
+ADDIN_PACKAGE = os.path.basename(ADDIN_DIR)
+
+
+def contour_module(name: str):
+    """Import a module of the contour command, e.g. contour_module('loops')."""
+    return importlib.import_module(f'{ADDIN_PACKAGE}.commands.contour.{name}')
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_or_python(request, monkeypatch):
+    """Run a test with NumPy and again with the plain Python fallback of the modules that have one."""
+    if request.param == 'python':
+        for name in ('analysis', 'mesh_slicing', 'disk_cache'):
+            monkeypatch.setattr(contour_module(name), 'numpy', None)
+    return request.param
@@ -0,0 +1,103 @@
+import csv
+
+import pytest
+
+from conftest import contour_module
+
+analysis = contour_module('analysis')
+slicing = contour_module('slicing')
+
+Z = slicing.SliceAxis((0.0, 0.0, 1.0), 'Z')
+
+
+def rectangle(low: float, high: float, z: float = 0.0, reverse: bool = False) -> list:
+    points = [(low, low, z), (high, low, z), (high, high, z), (low, high, z)]
+    return points[::-1] if reverse else points
+
+
+@pytest.mark.parametrize('hole_reversed', [False, True])
+def test_square_with_a_hole_has_area_84_whichever_way_the_hole_runs(numpy_or_python, hole_reversed):
+    # 10 x 10 square with a 4 x 4 hole: 100 - 16 = 84, perimeter 40 + 16
+    section = [(rectangle(0.0, 10.0, 2.0), True), (rectangle(3.0, 7.0, 2.0, hole_reversed), True)]
+
+    properties = analysis.section_properties(section, Z, 2.0)
+
+    assert properties['loops'] == 2
+    assert properties['area'] == pytest.approx(84.0)
+    assert properties['perimeter'] == pytest.approx(56.0)
+    assert properties['centroid'] == pytest.approx((5.0, 5.0, 2.0))
+    assert properties['bounds'] == pytest.approx((0.0, 0.0, 10.0, 10.0))
+
+
+def test_clockwise_outer_loop_still_has_positive_area(numpy_or_python):
+    properties = analysis.section_properties([(rectangle(0.0, 10.0, reverse=True), True)], Z, 0.0)
+
+    assert properties['area'] == pytest.approx(100.0)
+
+
+def test_off_center_hole_moves_the_centroid(numpy_or_python):
+    # Square 0..10 minus the square 0..2 in its corner: centroid (100 * 5 - 4 * 1) / 96
+    section = [(rectangle(0.0, 10.0), True), (rectangle(0.0, 2.0), True)]
+    section[1] = ([(0.5, 0.5, 0.0), (2.0, 0.5, 0.0), (2.0, 2.0, 0.0), (0.5, 2.0, 0.0)], True)
+
+    properties = analysis.section_properties(section, Z, 0.0)
+
+    expected = (100 * 5 - 2.25 * 1.25) / (100 - 2.25)
+    assert properties['area'] == pytest.approx(97.75)
+    assert properties['centroid'] == pytest.approx((expected, expected, 0.0))
+
+
+def test_island_inside_a_hole_adds_its_area(numpy_or_python):
+    section = [(rectangle(0.0, 10.0), True), (rectangle(2.0, 8.0), True), (rectangle(4.0, 6.0), True)]
+
+    assert analysis.section_properties(section, Z, 0.0)['area'] == pytest.approx(100 - 36 + 4)
+
+
+def test_open_chains_only_add_to_the_perimeter(numpy_or_python):
+    section = [(rectangle(0.0, 10.0), True), ([(20.0, 0.0, 0.0), (23.0, 4.0, 0.0)], False)]
+
+    properties = analysis.section_properties(section, Z, 0.0)
+
+    assert properties['loops'] == 1
+    assert properties['area'] == pytest.approx(100.0)
+    assert properties['perimeter'] == pytest.approx(45.0)
+
+
+def test_empty_section_has_no_centroid(numpy_or_python):
+    properties = analysis.section_properties([], Z, 0.0)
+
+    assert properties['area'] == 0.0
+    assert properties['centroid'] is None
+    assert properties['bounds'] is None
+
+
+def test_analyzer_writes_a_row_per_slice_and_integrates_volume_in_mm(tmp_path, numpy_or_python):
+    path = str(tmp_path / 'sections.csv')
+    analyzer = analysis.SectionAnalyzer(path, Z)
+
+    # A 2 x 2 cm prism from z = 0 to z = 3 cm, sliced every cm, and one slice past its end
+    for index, position in enumerate([0.0, 1.0, 2.0, 3.0]):
+        analyzer.add_slice(index, position, [(rectangle(0.0, 2.0, position), True)])
+    analyzer.add_slice(4, 4.0, [])
+    analyzer.close()
+
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['slice'] for row in rows] == ['1', '2', '3', '4', '5']
+    assert float(rows[1]['position_mm']) == pytest.approx(10.0)
+    assert float(rows[0]['area_mm2']) == pytest.approx(400.0)
+    assert float(rows[0]['perimeter_mm']) == pytest.approx(80.0)
+    # 4 cm2 over 3 cm = 12 cm3 = 12000 mm3; the last cm tapers to zero area in the trapezoid rule
+    assert float(rows[3]['volume_mm3']) == pytest.approx(12000.0)
+    assert float(rows[4]['volume_mm3']) == pytest.approx(14000.0)
+    assert rows[4]['centroid_x_mm'] == ''
+    assert analyzer.max_area == pytest.approx(4.0)
+
+
+def test_analyzer_abort_deletes_the_table(tmp_path):
+    path = tmp_path / 'sections.csv'
+    analyzer = analysis.SectionAnalyzer(str(path), Z)
+
+    analyzer.abort()
+
+    assert not path.exists()
@@ -0,0 +1,41 @@
+import adsk.fusion
+
+from conftest import contour_module
+
+body_index = contour_module('body_index')
+slicing = contour_module('slicing')
+
+Z = slicing.SliceAxis((0.0, 0.0, 1.0), 'Z')
+
+
+def box(low: float, high: float) -> adsk.fusion.BRepBody:
+    return adsk.fusion.BRepBody((0.0, 0.0, low), (1.0, 1.0, high))
+
+
+def test_query_returns_the_bodies_spanning_a_position():
+    short, long, high = box(0.0, 1.0), box(-5.0, 20.0), box(10.0, 12.0)
+    index = body_index.BodyIntervalIndex([high, short, long], Z)
+
+    assert len(index) == 3
+    assert index.query(0.5) == [long, short]
+    assert index.query(11.0) == [long, high]
+    assert index.query(15.0) == [long]
+    assert index.query(25.0) == []
+    assert index.query(-6.0) == []
+
+
+def test_strict_query_excludes_bodies_that_only_touch_the_position():
+    lower, upper = box(0.0, 1.0), box(1.0, 2.0)
+    index = body_index.BodyIntervalIndex([lower, upper], Z)
+
+    assert index.query(1.0) == [lower, upper]
+    assert index.query(1.0, strict=True) == []
+    assert index.query(1.0 + 1e-7) == [lower, upper]
+    assert index.query(0.5, strict=True) == [lower]
+
+
+def test_empty_index_finds_nothing():
+    index = body_index.BodyIntervalIndex([], Z)
+
+    assert len(index) == 0
+    assert index.query(0.0) == []
@@ -0,0 +1,119 @@
+import os
+import time
+
+import pytest
+
+from conftest import contour_module
+
+disk_cache = contour_module('disk_cache')
+
+POLYLINES = [[(0.0, 0.0, 1.5), (1.0, 0.0, 1.5), (1.0, 2.0, 1.5)], [(5.0, 5.0, 1.5), (6.0, 5.0, 1.5)]]
+
+
+def line(count: int, z: float = 0.0) -> list:
+    return [[(float(k), 0.0, z) for k in range(count)]]
+
+
+def test_entries_survive_a_new_instance(tmp_path, numpy_or_python):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.put('a', POLYLINES)
+    cache.put('empty', [])
+    assert cache.get('a') == POLYLINES
+    cache.save()
+
+    reopened = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+
+    assert reopened.get('a') == POLYLINES
+    assert reopened.get('empty') == []
+    assert reopened.get('missing') is None
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+def test_entry_key_is_stable_and_short():
+    key = ('body-1', 'fingerprint', (0.0, 0.0, 1.0), 2.5, 0.001)
+
+    assert disk_cache.entry_key(key) == disk_cache.entry_key(tuple(key))
+    assert disk_cache.entry_key(key) != disk_cache.entry_key(key[:-1] + (0.01,))
+    assert len(disk_cache.entry_key(key)) == 32
+
+
+def test_truncated_data_file_is_a_miss(tmp_path, numpy_or_python):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.put('a', POLYLINES)
+    cache.save()
+    data_path = os.path.join(str(tmp_path), disk_cache.DATA_FILE)
+    with open(data_path, 'r+b') as file:
+        file.truncate(disk_cache.POINT_BYTES * 2)
+
+    reopened = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+
+    assert reopened.get('a') is None
+    assert 'a' not in reopened.entries
+
+
+def test_flush_appends_data_but_only_save_writes_the_index(tmp_path):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.pending_limit = 5
+    index_path = os.path.join(str(tmp_path), disk_cache.INDEX_FILE)
+    data_path = os.path.join(str(tmp_path), disk_cache.DATA_FILE)
+
+    cache.put('a', line(3))
+    assert cache.pending_points == 3
+    cache.put('b', line(4, 1.0))
+
+    # Seven points reached the limit of five: both entries went to the data file
+    assert cache.pending == {}
+    assert os.path.getsize(data_path) == 7 * disk_cache.POINT_BYTES
+    assert not os.path.exists(index_path)
+    assert cache.get('b') == line(4, 1.0)
+
+    cache.save()
+    assert disk_cache.DiskSliceCache(str(tmp_path), 1 << 20).get('a') == line(3)
+
+
+def test_compaction_keeps_the_most_recently_used_entries(tmp_path, numpy_or_python):
+    # 100 points are 2400 bytes; a cap of 4000 bytes compacts down to 3000, room for one entry
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 4000)
+    cache.put('old', line(100))
+    cache.save()
+    cache.entries['old'][2] = 0.0
+    cache.put('new', line(100, 1.0))
+    cache.save()
+
+    reopened = disk_cache.DiskSliceCache(str(tmp_path), 4000)
+
+    assert reopened.get('old') is None
+    assert reopened.get('new') == line(100, 1.0)
+    assert os.path.getsize(os.path.join(str(tmp_path), disk_cache.DATA_FILE)) == 100 * disk_cache.POINT_BYTES
+
+
+def test_get_refreshes_the_entry_time(tmp_path):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.put('a', POLYLINES)
+    cache.save()
+    cache.entries['a'][2] = 0.0
+
+    cache.get('a')
+
+    assert cache.entries['a'][2] == pytest.approx(time.time(), abs=60)
+    assert cache.touched
+
+
+def test_cache_of_another_format_version_is_ignored(tmp_path, monkeypatch):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.put('a', POLYLINES)
+    cache.save()
+    monkeypatch.setattr(disk_cache, 'FORMAT_VERSION', disk_cache.FORMAT_VERSION + 1)
+
+    assert disk_cache.DiskSliceCache(str(tmp_path), 1 << 20).get('a') is None
+
+
+def test_clear_deletes_the_files(tmp_path):
+    cache = disk_cache.DiskSliceCache(str(tmp_path), 1 << 20)
+    cache.put('a', POLYLINES)
+    cache.save()
+
+    cache.clear()
+
+    assert os.listdir(str(tmp_path)) == []
+    assert cache.get('a') is None
@@ -0,0 +1,123 @@
+import math
+import random
+
+import pytest
+
+from conftest import contour_module
+
+loops = contour_module('loops')
+
+
+def square(size: float, z: float = 0.0) -> list:
+    return [(0.0, 0.0, z), (size, 0.0, z), (size, size, z), (0.0, size, z)]
+
+
+def circle_points(radius: float, count: int, start: float = 0.0, sweep: float = 2 * math.pi) -> list:
+    return [(radius * math.cos(start + sweep * k / count), radius * math.sin(start + sweep * k / count), 0.0)
+            for k in range(count)]
+
+
+def test_assemble_loops_chains_shuffled_and_reversed_edges_into_one_closed_loop():
+    corners = square(10.0)
+    edges = [[corners[k], corners[(k + 1) % 4]] for k in range(4)]
+    edges[1].reverse()
+    edges[3].reverse()
+    random.Random(4).shuffle(edges)
+
+    result = loops.assemble_loops(edges, 1e-6)
+
+    assert len(result) == 1
+    points, closed = result[0]
+    assert closed
+    assert sorted(points) == sorted(corners)
+
+
+def test_assemble_loops_joins_ends_within_tolerance_only():
+    gap = 1e-4
+    edges = [[(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)], [(1.0 + gap, 0.0, 0.0), (2.0, 0.0, 0.0)]]
+
+    assert len(loops.assemble_loops(edges, gap * 2)) == 1
+    assert len(loops.assemble_loops(edges, gap / 2)) == 2
+
+
+def test_assemble_loops_grows_open_chains_both_ways():
+    # Start in the middle: the chain has to grow backward as well
+    edges = [[(1.0, 0.0, 0.0), (2.0, 0.0, 0.0)], [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)], [(2.0, 0.0, 0.0), (3.0, 0.0, 0.0)]]
+
+    (points, closed), = loops.assemble_loops(edges, 1e-6)
+
+    assert not closed
+    assert [point[0] for point in points] == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_douglas_peucker_merges_collinear_runs_and_keeps_corners():
+    points = [(float(k), 0.0, 0.0) for k in range(11)] + [(10.0, float(k), 0.0) for k in range(1, 11)]
+
+    assert loops.douglas_peucker(points, 1e-6) == [(0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (10.0, 10.0, 0.0)]
+
+
+def test_douglas_peucker_keeps_points_outside_the_tolerance():
+    points = [(0.0, 0.0, 0.0), (1.0, 0.02, 0.0), (2.0, 0.0, 0.0)]
+
+    assert loops.douglas_peucker(points, 0.05) == [points[0], points[2]]
+    assert loops.douglas_peucker(points, 0.01) == points
+
+
+def test_simplify_loop_reduces_a_dense_square_to_its_corners():
+    corners = square(4.0)
+    dense = []
+    for k in range(4):
+        a, b = corners[k], corners[(k + 1) % 4]
+        dense.extend(tuple(a[c] + (b[c] - a[c]) * t / 8 for c in range(3)) for t in range(8))
+
+    assert sorted(loops.simplify_loop(dense, True, 1e-6)) == sorted(corners)
+
+
+def test_circle_through_three_points():
+    center, radius = loops.circle_through((3.0, 1.0, 0.0), (1.0, 3.0, 0.0), (-1.0, 1.0, 0.0))
+
+    assert center == pytest.approx((1.0, 1.0, 0.0))
+    assert radius == pytest.approx(2.0)
+    assert loops.circle_through((0.0, 0.0, 0.0), (1.0, 1.0, 1.0), (2.0, 2.0, 2.0)) is None
+
+
+def test_fit_segments_turns_a_closed_polygon_on_a_circle_into_one_circle():
+    segments = loops.fit_segments(circle_points(5.0, 64), True, 0.01)
+
+    assert len(segments) == 1
+    kind, center, radius = segments[0]
+    assert kind == 'circle'
+    assert center == pytest.approx((0.0, 0.0, 0.0), abs=1e-9)
+    assert radius == pytest.approx(5.0)
+
+
+def test_fit_segments_keeps_a_coarse_polygon_as_lines():
+    # The corners of a square are co-circular, but its sides bulge far from the circle
+    segments = loops.fit_segments(square(10.0), True, 0.01)
+
+    assert [segment[0] for segment in segments] == ['line'] * 4
+
+
+def test_fit_segments_finds_an_arc_between_lines():
+    arc = circle_points(2.0, 16, 0.0, math.pi / 2) + [(0.0, 2.0, 0.0)]
+    points = [(2.0, -3.0, 0.0)] + arc + [(-3.0, 2.0, 0.0)]
+
+    segments = loops.fit_segments(points, False, 0.01)
+
+    assert [segment[0] for segment in segments] == ['line', 'arc', 'line']
+    _, start, middle, end = segments[1]
+    assert start == pytest.approx((2.0, 0.0, 0.0))
+    assert end == pytest.approx((0.0, 2.0, 0.0))
+    assert math.hypot(middle[0], middle[1]) == pytest.approx(2.0)
+
+
+def test_polylines_to_loops_simplifies_stroked_circle_edges_into_a_circle():
+    points = circle_points(3.0, 200)
+    # Edge pieces as the slice cache strokes them: short polylines sharing their end points
+    pieces = [points[k:k + 11] for k in range(0, 200, 10)]
+    pieces[-1] = pieces[-1] + [points[0]]
+
+    result = loops.polylines_to_loops(pieces, 0.01)
+
+    assert len(result) == 1
+    assert [segment[0] for segment in result[0]] == ['circle']
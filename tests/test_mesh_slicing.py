@@ -0,0 +1,120 @@
+import math
+
+import adsk.fusion
+import pytest
+
+from conftest import contour_module
+
+mesh_slicing = contour_module('mesh_slicing')
+slicing = contour_module('slicing')
+analysis = contour_module('analysis')
+
+Z = slicing.SliceAxis((0.0, 0.0, 1.0), 'Z')
+
+
+def sphere(triangles: int = 400) -> adsk.fusion.MeshBody:
+    """UV sphere of radius 1 around the origin; its equator ring lies exactly in the plane z = 0."""
+    return adsk.fusion.MeshBody((-1.0, -1.0, -1.0), (1.0, 1.0, 1.0), triangles)
+
+
+def regular_polygon_area(count: int, radius: float = 1.0) -> float:
+    return count * radius * radius * math.sin(2 * math.pi / count) / 2
+
+
+def test_plane_through_mesh_vertices_gives_one_closed_loop(numpy_or_python):
+    body = sphere()
+    slicer = mesh_slicing.MeshSlicer(body, Z)
+    ring = len({round(math.atan2(y, x), 9) for x, y, z in zip(*[iter(body._mesh.nodeCoordinatesAsDouble)] * 3)
+                if abs(z) < 1e-12})
+
+    (section,) = slicer.slice([0.0])
+
+    assert len(section) == 1
+    points, closed = section[0]
+    assert closed
+    assert len(points) == ring
+    assert all(abs(z) < 1e-12 and math.hypot(x, y) == pytest.approx(1.0) for x, y, z in points)
+    assert analysis.section_properties(section, Z, 0.0)['area'] == pytest.approx(regular_polygon_area(ring))
+
+
+def test_plane_between_vertices_gives_one_closed_loop(numpy_or_python):
+    (section,) = mesh_slicing.MeshSlicer(sphere(), Z).slice([0.3])
+
+    assert len(section) == 1
+    points, closed = section[0]
+    assert closed
+    # Interpolated on the chords, so slightly inside the exact circle of radius sqrt(1 - 0.3^2)
+    assert all(abs(z - 0.3) < 1e-12 and math.hypot(x, y) <= math.sqrt(1 - 0.09) + 1e-9 for x, y, z in points)
+
+
+def test_planes_outside_the_mesh_give_empty_sections(numpy_or_python):
+    assert mesh_slicing.MeshSlicer(sphere(), Z).slice([-2.0, 1.5]) == [[], []]
+
+
+def test_numpy_and_python_engines_agree(monkeypatch):
+    positions = [-0.95, -0.5, 0.0, 0.25, 0.7]
+    with_numpy = mesh_slicing.MeshSlicer(sphere(), Z).slice(positions)
+    monkeypatch.setattr(mesh_slicing, 'numpy', None)
+    without_numpy = mesh_slicing.MeshSlicer(sphere(), Z).slice(positions)
+
+    for first, second in zip(with_numpy, without_numpy):
+        assert len(first) == len(second) == 1
+        assert sorted(first[0][0]) == pytest.approx(sorted(second[0][0]))
+
+
+def test_positions_in_any_order_come_back_in_order(numpy_or_python):
+    slicer = mesh_slicing.MeshSlicer(sphere(), Z)
+
+    sections = slicer.slice([0.5, -0.5, 0.0])
+
+    assert [round(section[0][0][0][2], 9) for section in sections] == [0.5, -0.5, 0.0]
+
+
+def test_mesh_sections_batches_match_a_single_pass(monkeypatch):
+    monkeypatch.setattr(mesh_slicing, 'PLANE_BATCH', 4)
+    positions = [-0.9 + 0.1 * k for k in range(19)]
+    body = sphere()
+
+    sections = mesh_slicing.MeshSections([body], Z, positions)
+    expected = mesh_slicing.MeshSlicer(body, Z).slice(positions)
+
+    for index in (0, 5, 18, 3, 17):
+        assert sections.section(index) == expected[index]
+
+
+def test_chain_segments_joins_segments_on_shared_edges(numpy_or_python):
+    # Three segments of a triangle fan, ends keyed by the mesh edge they lie on: 10 -> 11 -> 12 -> 10
+    points = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 0.0)]
+    keys = [10, 11, 12, 11, 12, 10]
+
+    (chain, closed), = mesh_slicing.chain_segments(keys, points)
+
+    assert closed
+    assert len(chain) == 3
+
+
+def test_chain_segments_leaves_a_mesh_hole_open(numpy_or_python):
+    # Two segments sharing edge 11; edges 10 and 12 are boundary edges
+    points = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0)]
+    keys = [10, 11, 11, 12]
+
+    (chain, closed), = mesh_slicing.chain_segments(keys, points)
+
+    assert not closed
+    assert [point[0] for point in chain] in ([0.0, 1.0, 2.0], [2.0, 1.0, 0.0])
+
+
+def test_to_loops_without_simplifying_closes_loops_with_lines():
+    section = [([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)], True)]
+
+    (segments,) = mesh_slicing.to_loops(section)
+
+    assert segments == [('line', (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)), ('line', (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)),
+                        ('line', (1.0, 1.0, 0.0), (0.0, 0.0, 0.0))]
+
+
+def test_drop_repeats_removes_points_met_twice_at_a_vertex():
+    points = [(1.0, 0.0, 0.0), (1.0, 5e-17, 0.0), (0.0, 1.0, 0.0), (-1.0, 0.0, 0.0), (1.0, 1e-12, 0.0)]
+
+    assert mesh_slicing.drop_repeats(points, True) == [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (-1.0, 0.0, 0.0)]
+    assert mesh_slicing.drop_repeats(points, False) == points[:1] + points[2:]
@@ -0,0 +1,86 @@
+import math
+
+import adsk.fusion
+import pytest
+
+from conftest import contour_module
+
+spacing = contour_module('spacing')
+slicing = contour_module('slicing')
+
+Z = slicing.SliceAxis((0.0, 0.0, 1.0), 'Z')
+
+
+class ProfileSpacing(spacing.AdaptiveSpacing):
+    """Adaptive spacing over a round section whose radius is given by a function of z."""
+
+    def __init__(self, radius, *args):
+        super().__init__(*args)
+        self.radius = radius
+
+    def measure(self, body_index, axis, position):
+        self.measured += 1
+        if not body_index.query(position):
+            return 0.0, 0.0, 0
+        radius = self.radius(position)
+        return math.pi * radius * radius, 2 * math.pi * radius, 1
+
+
+def box(low: float, high: float) -> adsk.fusion.BRepBody:
+    return adsk.fusion.BRepBody((-5.0, -5.0, low), (5.0, 5.0, high))
+
+
+def test_uniform_positions_include_both_ends():
+    assert spacing.uniform_positions(2.0, 4.0, 4) == pytest.approx([2.0, 2.5, 3.0, 3.5, 4.0])
+    assert spacing.uniform_positions(4.0, 2.0, 2) == pytest.approx([4.0, 3.0, 2.0])
+
+
+def test_section_deviation_turns_area_and_perimeter_changes_into_a_distance():
+    # Circles of radius 1 and 1.1: the perimeter term gives the radius change exactly (the area term 0.21 / 2.2)
+    first = (math.pi, 2 * math.pi, 1)
+    second = (math.pi * 1.21, 2 * math.pi * 1.1, 1)
+
+    assert spacing.section_deviation(first, second) == pytest.approx(0.1)
+    assert spacing.section_deviation(first, first) == 0.0
+    assert spacing.section_deviation(first, (math.pi, 2 * math.pi, 2)) == math.inf
+    assert spacing.section_deviation((0.0, 0.0, 0), (0.0, 0.0, 0)) == 0.0
+
+
+def test_adaptive_positions_are_dense_where_the_section_changes():
+    # A cylinder of radius 1 that widens to radius 3 between z = 4 and z = 6
+    def radius(z):
+        return 1.0 + min(max(z - 4.0, 0.0), 2.0)
+
+    planner = ProfileSpacing(radius, 0.05, 0.1, 2.0)
+
+    positions = planner.positions([box(0.0, 10.0)], Z, 0.0, 10.0)
+
+    assert positions[0] == 0.0
+    assert positions[-1] == pytest.approx(10.0)
+    assert positions == sorted(positions)
+    gaps = [((a + b) / 2, b - a) for a, b in zip(positions, positions[1:])]
+    steep = [gap for middle, gap in gaps if 4.0 < middle < 6.0]
+    flat = [gap for middle, gap in gaps if middle < 3.0 or middle > 7.5]
+    assert max(steep) <= 0.1 + 1e-9
+    assert max(flat) == pytest.approx(2.0)
+    assert len(positions) < len(spacing.uniform_positions(0.0, 10.0, 100))
+
+
+def test_adaptive_positions_refine_at_the_ends_of_bodies():
+    planner = ProfileSpacing(lambda z: 1.0, 0.05, 0.25, 4.0)
+
+    positions = planner.positions([box(0.0, 3.0), box(5.0, 6.0)], Z, 0.0, 12.0)
+
+    # Steps across the start or end of a body are halved until they stop on it, then grow again
+    assert positions == pytest.approx([0.0, 2.0, 3.0, 5.0, 6.0, 6.25, 6.5, 7.0, 8.0, 10.0, 12.0])
+    assert positions[-1] == pytest.approx(12.0)
+
+
+def test_adaptive_positions_run_backwards_too():
+    planner = ProfileSpacing(lambda z: 1.0, 0.05, 0.5, 2.0)
+
+    positions = planner.positions([box(0.0, 10.0)], Z, 10.0, 0.0)
+
+    assert positions[0] == 10.0
+    assert positions[-1] == pytest.approx(0.0)
+    assert positions == sorted(positions, reverse=True)